@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Backend settings, read from environment variables or backend/.env"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # TTS
+    default_voice: str = "en-US-JennyNeural"
+    # Synthesis backend: "edge" (online) or "fake" (offline, for load tests)
+    tts_backend: Literal["edge", "fake"] = "edge"
+    fake_ttfb_ms: float = 300
+    fake_bytes_per_second: float = 240000
+    fake_error_rate: float = 0.0
+    # Concurrent upstream synthesis calls: whole process, and per request
+    tts_max_concurrency: int = 8
+    tts_request_concurrency: int = 4
+    # Queued synthesis moves up one priority class (interactive, next,
+    # prefetch, batch) per this many seconds of waiting for a slot
+    tts_priority_aging_seconds: float = 2.0
+    # Identical concurrent requests share one upstream synthesis
+    tts_coalesce: bool = True
+    # Chunk sizes (chars): the first chunk is small so audio starts quickly,
+    # and each chunk grows by chunk_growth up to chunk_max_chars. Requests can
+    # override these with first_chunk_chars, chunk_growth and target_chars
+    chunk_first_chars: int = 150
+    chunk_growth: float = 2.0
+    chunk_max_chars: int = 800
+    # Chunks synthesized ahead of the one being written by /stream
+    stream_lookahead_chunks: int = Field(2, ge=1)
+    # Speculative synthesis of next_chunk_indices after /chunks/generate
+    prefetch_enabled: bool = True
+    prefetch_concurrency: int = 2
+    prefetch_max_documents: int = 64
+
+    # Audio cache: in-memory LRU tier plus a disk tier (empty dir disables it)
+    audio_cache_memory_mb: int = 64
+    audio_cache_dir: str = ".cache/audio"
+    audio_cache_disk_mb: int = 1024
+    audio_cache_ttl_hours: float = 24
+
+    # Page fetching for /v1/content/extract: one pooled client per process
+    fetch_max_connections: int = 100
+    fetch_max_keepalive_connections: int = 20
+    fetch_max_per_host: int = 6
+    fetch_keepalive_seconds: float = 30
+    fetch_timeout_seconds: float = 30
+    # Needs the h2 package (pip install "httpx[http2]")
+    fetch_http2: bool = False
+
+    # Extracted articles by URL: served as-is while fresh, then revalidated
+    # with a conditional GET; dropped after the TTL
+    extract_cache_memory_mb: int = 32
+    extract_cache_fresh_minutes: float = 10
+    extract_cache_ttl_hours: float = 24
+    # /v1/content/extract/batch: URLs per request, URLs in flight per batch
+    # (each host is also held to fetch_max_per_host), and a per-URL budget
+    extract_batch_max_urls: int = 500
+    extract_batch_concurrency: int = 16
+    extract_batch_url_timeout_seconds: float = 20
+
+    # Extraction, cleaning and formatting run off the event loop, in worker
+    # processes ("process") or threads ("thread"); 0 workers means one per CPU
+    worker_mode: Literal["process", "thread"] = "process"
+    worker_count: int = 0
+    worker_task_timeout_seconds: float = 30
+
+    # Load heavy dependencies and start the page fetcher and worker pool at
+    # startup; off for short-lived processes, where they load on first use
+    startup_warmup: bool = True
+
+    # Background synthesis jobs (/v1/tts/jobs): chunk audio written under
+    # jobs_dir, job_workers jobs at a time, at most job_max_pending queued or
+    # running before new jobs get 503; finished jobs kept for job_ttl_hours.
+    # A chunk that fails is retried job_chunk_retries times before its job fails
+    jobs_dir: str = ".cache/jobs"
+    job_workers: int = 2
+    job_max_pending: int = 32
+    job_ttl_hours: float = 24
+    job_chunk_retries: int = 2
+
+    # Document sessions: formatted chunk plans kept for /chunks/generate
+    document_store_memory_mb: int = 64
+    document_ttl_minutes: float = 30
+
+
+settings = Settings()
@@ -1,17 +1,42 @@
+# First, so the import time of everything below is measured
+from api import startup
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 
+from api.config import settings
 from api.routes import tts, content
+from api.metrics import InFlightMiddleware
+from api.workers import worker_pool
+from services.metrics import CONTENT_TYPE, registry
+
+startup.mark_imports()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting TTS Assistant API...")
+    # Without warm-up, the page fetcher, worker pool and heavy dependencies
+    # start on first use, for a faster cold start
+    if settings.startup_warmup:
+        await startup.warm_up()
+    tts.job_queue.start()
+    startup.mark_ready()
+    print(
+        f"Ready {startup.report.ready_seconds:.2f}s after import started "
+        f"(imports {startup.report.import_seconds:.2f}s)"
+    )
     yield
     # Shutdown
     print("Shutting down TTS Assistant API...")
+    await tts.job_queue.close()
+    tts.prefetcher.close()
+    tts.audio_cache.flush()
+    await content.fetcher.close()
+    await worker_pool.close()
 
 
 app = FastAPI(
@@ -33,6 +58,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(InFlightMiddleware)
+app.add_middleware(startup.FirstRequestMiddleware)
 
 # Include routers
 app.include_router(tts.router, prefix="/v1/tts", tags=["TTS"])
@@ -45,6 +72,24 @@ async def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage timings, synthesis latency, in-flight requests, cache hit ratios"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/startup/stats")
+async def startup_stats():
+    """Cold start timings: imports, warm-up, ready, first request"""
+    return startup.snapshot()
+
+
+@app.get("/workers/stats")
+async def worker_stats():
+    """CPU worker pool queue depth, timeouts and restarts"""
+    return worker_pool.snapshot()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+from api import startup
+from api.routes import content, tts
+from api.workers import worker_pool
+from services.metrics import REQUESTS_IN_FLIGHT, registry
+
+# Path prefix -> value of the "area" label
+_AREAS = (("/v1/tts", "tts"), ("/v1/content", "content"))
+
+
+class InFlightMiddleware:
+    """ASGI middleware counting HTTP requests in flight per API area"""
+
+    def __init__(self, app: Callable[..., Any]):
+        self.app = app
+        self._areas = tuple((prefix, REQUESTS_IN_FLIGHT.labels(area)) for prefix, area in _AREAS)
+        self._other = REQUESTS_IN_FLIGHT.labels("other")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        gauge = self._other
+        path = scope["path"]
+        for prefix, area in self._areas:
+            if path.startswith(prefix):
+                gauge = area
+                break
+        # A streamed response stays in flight until its last byte is sent
+        gauge.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gauge.dec()
+
+
+def _or_nan(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+# Ratios kept by the caches and pools themselves, read at scrape time. The
+# lambdas look up the module attributes so that replaced instances are seen
+registry.gauge_callback(
+    "tts_audio_cache_hit_ratio",
+    "Audio cache lookups served from memory or disk",
+    lambda: tts.audio_cache.stats.hit_ratio,
+)
+registry.gauge_callback(
+    "tts_extract_cache_hit_ratio",
+    "Article lookups served without re-extracting the page",
+    lambda: content.extraction_cache.stats.hit_ratio,
+)
+registry.gauge_callback(
+    "tts_prefetch_hit_ratio",
+    "Prefetched chunks later used by a request",
+    lambda: tts.prefetcher.stats.hit_ratio,
+)
+registry.gauge_callback(
+    "tts_fetch_connection_reuse_ratio",
+    "Page fetches served on a pooled keep-alive connection",
+    lambda: content.fetcher.stats.reuse_ratio,
+)
+registry.gauge_callback(
+    "tts_startup_import_seconds",
+    "Time to import the API and its dependencies",
+    lambda: _or_nan(startup.report.import_seconds),
+)
+registry.gauge_callback(
+    "tts_startup_ready_seconds",
+    "Time from import until the app was ready to serve, including warm-up",
+    lambda: _or_nan(startup.report.ready_seconds),
+)
+registry.gauge_callback(
+    "tts_startup_first_request_seconds",
+    "Time from import until the first response was sent (NaN until then)",
+    lambda: _or_nan(startup.report.first_request_seconds),
+)
+registry.gauge_callback(
+    "tts_worker_tasks_queued",
+    "CPU tasks waiting for a worker",
+    lambda: worker_pool.snapshot()["queued"],
+)
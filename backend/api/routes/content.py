@@ -2,24 +2,55 @@ from __future__ import annotations
 
 from __future__ import annotations
 
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
 
-from services.content.extractor import ContentExtractor
+from api.config import settings
+from api.workers import worker_pool
+from services.content.cache import ExtractedArticle, ExtractionCache
+from services.content.extractor import ContentExtractor, extract_article
 from services.content.cleaner import ContentCleaner
+from services.content.fetcher import PageFetcher, httpx
+from services.metrics import CLEAN_SECONDS, EXTRACT_SECONDS, timed
+from services.processing.workers import WorkerTimeout
 
 
 router = APIRouter()
 
-extractor = ContentExtractor()
+# One pooled client for every page fetch; closed by the app lifespan
+fetcher = PageFetcher(
+    max_connections=settings.fetch_max_connections,
+    max_keepalive_connections=settings.fetch_max_keepalive_connections,
+    max_per_host=settings.fetch_max_per_host,
+    keepalive_expiry=settings.fetch_keepalive_seconds,
+    timeout=settings.fetch_timeout_seconds,
+    http2=settings.fetch_http2,
+)
+extractor = ContentExtractor(fetcher=fetcher)
 cleaner = ContentCleaner()
+extraction_cache = ExtractionCache(
+    memory_bytes=settings.extract_cache_memory_mb * 1024 * 1024,
+    fresh_seconds=settings.extract_cache_fresh_minutes * 60,
+    ttl_seconds=settings.extract_cache_ttl_hours * 3600,
+)
+_extract_seconds = EXTRACT_SECONDS.labels()
+_clean_seconds = CLEAN_SECONDS.labels()
 
 
 class ExtractRequest(BaseModel):
     url: HttpUrl
 
 
+class BatchExtractRequest(BaseModel):
+    urls: List[HttpUrl] = Field(..., min_length=1)
+
+
 class CleanRequest(BaseModel):
     html: str
     source_url: Optional[str] = None
@@ -32,38 +63,162 @@ class ContentResponse(BaseModel):
     estimated_listen_time: int  # in minutes
 
 
-@router.post("/extract", response_model=ContentResponse)
-async def extract_content(request: ExtractRequest):
-    """Extract readable content from a URL"""
-    try:
-        result = await extractor.extract_from_url(str(request.url))
-
-        if not result:
-            raise HTTPException(status_code=400, detail="Could not extract content from URL")
+def _content_response(article: ExtractedArticle) -> ContentResponse:
+    return ContentResponse(
+        title=article.title,
+        content=article.content,
+        word_count=article.word_count,
+        estimated_listen_time=max(1, article.word_count // 150),  # ~150 wpm for TTS
+    )
 
-        # Clean the extracted content
-        cleaned_content = cleaner.clean(result["content"])
 
-        word_count = len(cleaned_content.split())
-        estimated_listen_time = max(1, word_count // 150)  # ~150 wpm for TTS
+async def _extract(url: str) -> ExtractedArticle:
+    """
+    Article for a URL, from the cache or a (conditional) fetch and
+    extraction; raises HTTPException on failure
+    """
+    cached = extraction_cache.get(url)
+    if cached and extraction_cache.is_fresh(cached):
+        extraction_cache.stats.hits += 1
+        return cached
 
-        return ContentResponse(
-            title=result["title"],
-            content=cleaned_content,
-            word_count=word_count,
-            estimated_listen_time=estimated_listen_time,
+    # Stale or missing: a conditional GET lets an unchanged page skip
+    # extraction and cleaning entirely
+    try:
+        page = await fetcher.fetch_page(
+            url,
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None,
         )
+    except httpx.HTTPError as e:
+        print(f"HTTP error fetching {url}: {e}")
+        if cached:
+            return cached
+        raise HTTPException(status_code=400, detail="Could not extract content from URL")
+
+    if page.not_modified and cached:
+        extraction_cache.mark_validated(cached)
+        extraction_cache.stats.revalidated += 1
+        return cached
+
+    # Extract and clean in the worker pool, off the event loop
+    try:
+        result = await worker_pool.run(extract_article, page.text, url)
+    except WorkerTimeout:
+        raise HTTPException(status_code=504, detail="Extraction timed out")
+    if not result:
+        raise HTTPException(status_code=400, detail="Could not extract content from URL")
+    if "extract_seconds" in result:
+        _extract_seconds.observe(result["extract_seconds"])
+        _clean_seconds.observe(result["clean_seconds"])
+
+    article = ExtractedArticle(
+        title=result["title"],
+        content=result["content"],
+        word_count=len(result["content"].split()),
+        etag=page.etag,
+        last_modified=page.last_modified,
+    )
+    if cached:
+        extraction_cache.stats.refetched += 1
+    else:
+        extraction_cache.stats.misses += 1
+    extraction_cache.put(url, article)
+    return article
+
+
+@router.post("/extract", response_model=ContentResponse)
+async def extract_content(request: ExtractRequest):
+    """Extract readable content from a URL"""
+    try:
+        return _content_response(await _extract(str(request.url)))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _batch_item(
+    index: int,
+    url: str,
+    host_slots: asyncio.Semaphore,
+    slots: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    """One NDJSON result line for a batch URL; never raises"""
+    line: Dict[str, Any] = {"index": index, "url": url}
+    try:
+        # Host slot first: URLs queued behind a slow host must not hold
+        # batch-wide slots that other hosts could use
+        async with host_slots, slots:
+            article = await asyncio.wait_for(
+                _extract(url), settings.extract_batch_url_timeout_seconds
+            )
+    except HTTPException as e:
+        return {**line, "ok": False, "status": e.status_code, "error": e.detail}
+    except asyncio.TimeoutError:
+        return {**line, "ok": False, "status": 504, "error": "Extraction timed out"}
+    except Exception as e:
+        return {**line, "ok": False, "status": 500, "error": str(e)}
+    return {**line, "ok": True, **_content_response(article).model_dump()}
+
+
+@router.post("/extract/batch")
+async def extract_batch(request: BatchExtractRequest):
+    """
+    Extract many URLs concurrently, streaming one NDJSON line per URL in
+    completion order
+    """
+    if len(request.urls) > settings.extract_batch_max_urls:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.extract_batch_max_urls} URLs per batch",
+        )
+    urls = [str(url) for url in request.urls]
+    slots = asyncio.Semaphore(settings.extract_batch_concurrency)
+    host_slots: Dict[str, asyncio.Semaphore] = {}
+    for url in urls:
+        host = urlsplit(url).netloc.lower()
+        if host not in host_slots:
+            host_slots[host] = asyncio.Semaphore(fetcher.max_per_host)
+
+    async def lines():
+        tasks = [
+            asyncio.create_task(
+                _batch_item(i, url, host_slots[urlsplit(url).netloc.lower()], slots)
+            )
+            for i, url in enumerate(urls)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Client went away: stop fetching the rest
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/cache/stats")
+async def extraction_cache_stats():
+    """Extraction cache hit, revalidation and eviction counters"""
+    return extraction_cache.snapshot()
+
+
+@router.get("/fetch/stats")
+async def fetch_stats():
+    """Page fetch connection reuse and latency"""
+    return fetcher.snapshot()
+
+
 @router.post("/clean", response_model=ContentResponse)
 async def clean_content(request: CleanRequest):
     """Clean provided HTML content"""
     try:
-        cleaned_content = cleaner.clean(request.html, request.source_url)
+        cleaned_content, seconds = await worker_pool.run(
+            timed, cleaner.clean, request.html, request.source_url
+        )
+        _clean_seconds.observe(seconds)
 
         word_count = len(cleaned_content.split())
         estimated_listen_time = max(1, word_count // 150)
@@ -74,5 +229,7 @@ async def clean_content(request: CleanRequest):
             word_count=word_count,
             estimated_listen_time=estimated_listen_time,
         )
+    except WorkerTimeout:
+        raise HTTPException(status_code=504, detail="Cleaning timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,34 +1,121 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Literal, Optional, List
+from typing import AsyncGenerator, AsyncIterator, Dict, Literal, Optional, List, Tuple, Union
+import asyncio
 import base64
+import re
 
+from api.config import settings
+from api.workers import worker_pool
+from services.audio import frames
+from services.audio.backends import EdgeBackend, FakeBackend
+from services.audio.cache import AudioCache
 from services.audio.edge_tts import EdgeTTSService, AVAILABLE_VOICES
+from services.audio.jobs import JobQueue, QueueFull
+from services.audio.pipeline import StreamKeys, stream_chunks
+from services.audio.prefetch import Prefetcher
+from services.audio.scheduler import Priority, SynthesisScheduler
+from services.metrics import CHUNKS, FORMAT_SECONDS, RESPONSE_BYTES, timed
+from services.processing.chunking import ChunkSchedule
 from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentSession, DocumentStore
+from services.processing.workers import WorkerTimeout
 
 
 router = APIRouter()
 
-tts_service = EdgeTTSService()
+audio_cache = AudioCache(
+    memory_bytes=settings.audio_cache_memory_mb * 1024 * 1024,
+    cache_dir=settings.audio_cache_dir or None,
+    disk_bytes=settings.audio_cache_disk_mb * 1024 * 1024,
+    ttl_seconds=settings.audio_cache_ttl_hours * 3600,
+)
+if settings.tts_backend == "fake":
+    backend = FakeBackend(
+        ttfb_ms=settings.fake_ttfb_ms,
+        bytes_per_second=settings.fake_bytes_per_second,
+        error_rate=settings.fake_error_rate,
+    )
+else:
+    backend = EdgeBackend()
+tts_service = EdgeTTSService(
+    default_voice=settings.default_voice,
+    cache=audio_cache,
+    backend=backend,
+    coalesce=settings.tts_coalesce,
+    scheduler=SynthesisScheduler(
+        max_concurrency=settings.tts_max_concurrency,
+        aging_seconds=settings.tts_priority_aging_seconds,
+    ),
+)
+prefetcher = Prefetcher(
+    tts_service,
+    max_concurrency=settings.prefetch_concurrency,
+    max_documents=settings.prefetch_max_documents,
+)
+job_queue = JobQueue(
+    tts_service,
+    jobs_dir=settings.jobs_dir,
+    max_workers=settings.job_workers,
+    max_pending=settings.job_max_pending,
+    ttl_seconds=settings.job_ttl_hours * 3600,
+    chunk_retries=settings.job_chunk_retries,
+)
+stream_keys = StreamKeys()
 formatter = ProsodyFormatter()
-
-
-class TTSRequest(BaseModel):
+document_store = DocumentStore(
+    chunker=formatter.chunk_table,
+    memory_bytes=settings.document_store_memory_mb * 1024 * 1024,
+    ttl_seconds=settings.document_ttl_minutes * 60,
+    on_remove=prefetcher.cancel,
+)
+
+# Metric series bound once, so recording is a plain update per request
+_format_seconds = FORMAT_SECONDS.labels()
+_document_chunks = CHUNKS.labels()
+_generate_bytes = RESPONSE_BYTES.labels("generate")
+_chunks_bytes = RESPONSE_BYTES.labels("chunks")
+_stream_bytes = RESPONSE_BYTES.labels("stream")
+
+
+class ChunkingOptions(BaseModel):
+    # Chunk sizes ramp up from first_chunk_chars, growing by chunk_growth per
+    # chunk up to target_chars; unset fields use the server's defaults
+    target_chars: Optional[int] = None
+    first_chunk_chars: Optional[int] = None
+    chunk_growth: Optional[float] = None
+
+
+class TTSRequest(ChunkingOptions):
     text: str
     voice: str = "en-US-JennyNeural"
     speed: float = 1.0
     summary_mode: Literal["verbatim", "tldr", "executive", "condensed"] = "verbatim"
     format_text: bool = True  # Apply prosody formatting
+    pipelined: bool = True  # /stream: synthesize chunk by chunk with lookahead
 
 
-class ChunkedTTSRequest(BaseModel):
+class DocumentRequest(ChunkingOptions):
     text: str
+
+
+class ChunkedTTSRequest(ChunkingOptions):
+    text: Optional[str] = None  # Full text, or
+    document_id: Optional[str] = None  # a document registered via /documents
     voice: str = "en-US-JennyNeural"
     speed: float = 1.0
     chunk_indices: List[int] = [0, 1]  # Which chunks to generate
+    response_format: Literal["json", "frames"] = "json"
+
+
+class JobRequest(ChunkingOptions):
+    text: Optional[str] = None  # Full text, or
+    document_id: Optional[str] = None  # a document registered via /documents
+    voice: str = "en-US-JennyNeural"
+    speed: float = 1.0
 
 
 class ChunkInfo(BaseModel):
@@ -50,9 +137,152 @@ async def list_voices():
     return {"voices": AVAILABLE_VOICES}
 
 
+@router.get("/cache/stats")
+async def cache_stats():
+    """Audio cache hit, miss and eviction counters"""
+    return audio_cache.snapshot()
+
+
+_AUDIO_KEY = re.compile(r"[0-9a-f]{64}")
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (first, last) byte of a single-range Range header, or None to
+    send the whole body; raises 416 if the range lies outside it
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE.fullmatch(header.strip())
+    if not match or match.groups() == ("", ""):
+        # Multiple ranges or another unit: serving the whole body is allowed
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _audio_response(
+    audio: bytes,
+    range_header: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """MP3 response honouring a Range header, so players can seek in it"""
+    headers = {**(headers or {}), "Accept-Ranges": "bytes"}
+    byte_range = _byte_range(range_header, len(audio))
+    if byte_range is None:
+        return Response(audio, media_type="audio/mpeg", headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(audio)}"
+    return Response(audio[start:end + 1], status_code=206, media_type="audio/mpeg", headers=headers)
+
+
+@router.get("/audio/{key}")
+async def get_audio(key: str, range: Optional[str] = Header(None)):
+    """
+    Cached audio by key (X-Audio-Key of /generate and unpipelined /stream,
+    audio_key of each chunk, or /stream/{id}/keys), with Range support:
+    seeking needs no new synthesis
+    """
+    audio = None
+    if tts_service.cache and _AUDIO_KEY.fullmatch(key):
+        audio = await tts_service.cache.get(key)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Audio is not cached; generate it first")
+    return _audio_response(audio, range)
+
+
+@router.get("/audio/{key}/words")
+async def get_audio_words(key: str):
+    """
+    Start time, duration and byte offset of every word in cached audio. To
+    play from a word, request the audio with "Range: bytes=<byte>-".
+    """
+    words = None
+    if tts_service.cache and _AUDIO_KEY.fullmatch(key):
+        words = await tts_service.cache.get_words(key)
+    if words is None:
+        raise HTTPException(status_code=404, detail="No word index for this audio")
+    return {"key": key, **words.snapshot()}
+
+
+@router.get("/coalesce/stats")
+async def coalesce_stats():
+    """Requests that shared an in-flight synthesis instead of starting their own"""
+    if tts_service.flights is None:
+        return {"enabled": False}
+    return {"enabled": True, **tts_service.flights.snapshot()}
+
+
+@router.get("/scheduler/stats")
+async def scheduler_stats():
+    """Upstream slots in use, and grants and queue wait per priority class"""
+    return tts_service.scheduler.snapshot()
+
+
+@router.get("/prefetch/stats")
+async def prefetch_stats():
+    """Speculative chunk synthesis hit and waste counters"""
+    return prefetcher.snapshot()
+
+
+async def _format(text: str) -> str:
+    """Prosody-format text in the worker pool"""
+    try:
+        formatted, seconds = await worker_pool.run(timed, formatter.format, text)
+    except WorkerTimeout:
+        raise HTTPException(status_code=504, detail="Formatting timed out")
+    _format_seconds.observe(seconds)
+    return formatted
+
+
+def _chunk_schedule(options: ChunkingOptions) -> ChunkSchedule:
+    """A request's chunk sizes, with the server's defaults for unset fields"""
+    max_chars = options.target_chars
+    if max_chars is None:
+        max_chars = settings.chunk_max_chars
+    first_chars = options.first_chunk_chars
+    if first_chars is None:
+        first_chars = min(settings.chunk_first_chars, max_chars)
+    growth = options.chunk_growth
+    if growth is None:
+        growth = settings.chunk_growth
+    try:
+        return ChunkSchedule(first_chars=first_chars, growth=growth, max_chars=max_chars)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _register(text: str, schedule: ChunkSchedule) -> DocumentSession:
+    """Register a document, chunking it in the worker pool if it is new"""
+    session = document_store.lookup(text, schedule)
+    if session is not None:
+        return session
+    try:
+        chunks, seconds = await worker_pool.run(timed, document_store.chunker, text, schedule)
+    except WorkerTimeout:
+        raise HTTPException(status_code=504, detail="Formatting timed out")
+    _format_seconds.observe(seconds)
+    _document_chunks.observe(len(chunks))
+    return document_store.add(text, schedule, chunks)
+
+
 @router.post("/generate")
-async def generate_tts(request: TTSRequest):
-    """Generate TTS audio from text with prosody formatting"""
+async def generate_tts(request: TTSRequest, range: Optional[str] = Header(None)):
+    """
+    Generate TTS audio from text with prosody formatting. X-Audio-Key names
+    the audio for GET /audio/{key} and /audio/{key}/words.
+    """
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
@@ -61,7 +291,7 @@ async def generate_tts(request: TTSRequest):
 
     try:
         # Apply prosody formatting if enabled
-        text_to_speak = formatter.format(request.text) if request.format_text else request.text
+        text_to_speak = await _format(request.text) if request.format_text else request.text
 
         audio_data = await tts_service.generate_audio(
             text=text_to_speak,
@@ -71,50 +301,170 @@ async def generate_tts(request: TTSRequest):
 
         word_count = len(request.text.split())
         estimated_duration = (word_count / 150) * 60 / request.speed
+        _generate_bytes.observe(len(audio_data))
 
-        return StreamingResponse(
-            iter([audio_data]),
-            media_type="audio/mpeg",
+        return _audio_response(
+            audio_data,
+            range,
             headers={
                 "X-Word-Count": str(word_count),
                 "X-Estimated-Duration": str(estimated_duration),
+                "X-Audio-Key": tts_service.audio_key(text_to_speak, request.voice, request.speed),
             },
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/chunks/info")
-async def get_chunks_info(request: TTSRequest):
-    """
-    Get information about how text will be chunked for streaming.
-    Use this to plan chunked playback without generating audio.
-    """
-    if not request.text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
-
-    chunks = formatter.chunk_for_streaming(request.text)
-
+def _chunk_plan(session: DocumentSession) -> dict:
+    """Chunk plan for a registered document"""
     chunks_info = []
-    for idx, text in chunks:
+    for idx in range(len(session)):
+        # Read from the chunk table; only the preview is copied out
+        char_count = session.char_count(idx)
+        preview = session.preview(idx, 100)
         chunks_info.append({
             "index": idx,
-            "text_preview": text[:100] + "..." if len(text) > 100 else text,
-            "char_count": len(text),
-            "word_count": len(text.split()),
+            "text_preview": preview + "..." if char_count > 100 else preview,
+            "char_count": char_count,
+            "word_count": session.word_counts[idx],
         })
 
-    total_words = sum(c["word_count"] for c in chunks_info)
+    total_words = sum(session.word_counts)
     estimated_duration = (total_words / 150) * 60
 
     return {
-        "total_chunks": len(chunks),
+        "document_id": session.document_id,
+        "total_chunks": len(session),
         "chunks": chunks_info,
         "total_words": total_words,
         "estimated_duration_seconds": estimated_duration,
+        "expires_in_seconds": document_store.ttl_seconds,
     }
 
 
+def _get_document(document_id: str) -> DocumentSession:
+    session = document_store.get(document_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown or expired document: {document_id}",
+        )
+    return session
+
+
+@router.post("/documents")
+async def register_document(request: DocumentRequest):
+    """
+    Register a document for chunked playback.
+    Formats and chunks the text once; later /chunks/generate requests can
+    refer to the returned document_id instead of sending the text again.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    return _chunk_plan(await _register(request.text, _chunk_schedule(request)))
+
+
+@router.get("/documents/stats")
+async def document_stats():
+    """Document store usage and eviction counters"""
+    return document_store.snapshot()
+
+
+@router.get("/documents/{document_id}")
+async def get_document(document_id: str):
+    """Chunk plan of a registered document"""
+    return _chunk_plan(_get_document(document_id))
+
+
+@router.delete("/documents/{document_id}")
+async def delete_document(document_id: str):
+    """Release a registered document before it expires"""
+    if not document_store.remove(document_id):
+        raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+    return {"deleted": document_id}
+
+
+@router.post("/chunks/info")
+async def get_chunks_info(request: TTSRequest):
+    """
+    Get information about how text will be chunked for streaming.
+    Use this to plan chunked playback without generating audio.
+    The text is registered as a document, so the returned document_id can be
+    passed to /chunks/generate.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+    return _chunk_plan(await _register(request.text, _chunk_schedule(request)))
+
+
+def _chunk_metadata(
+    session: DocumentSession,
+    chunk_idx: int,
+    result: Union[bytes, Exception],
+    request: ChunkedTTSRequest,
+) -> dict:
+    """Per-chunk fields shared by the JSON and framed responses"""
+    chunk = {
+        "index": chunk_idx,
+        "word_count": session.word_counts[chunk_idx],
+        "char_count": session.char_count(chunk_idx),
+    }
+    if isinstance(result, Exception):
+        print(f"Chunk {chunk_idx} synthesis failed: {result}")
+        chunk["error"] = str(result) or type(result).__name__
+    else:
+        chunk["audio_key"] = tts_service.audio_key(
+            session.chunk(chunk_idx), request.voice, request.speed
+        )
+    return chunk
+
+
+def _schedule_prefetch(
+    session: DocumentSession, next_indices: List[int], request: ChunkedTTSRequest
+) -> None:
+    """Start on the predicted next chunks while the client plays these"""
+    if settings.prefetch_enabled:
+        prefetcher.schedule(
+            session.document_id,
+            {i: session.chunk(i) for i in next_indices},
+            request.voice,
+            request.speed,
+        )
+
+
+async def _chunk_frames(
+    session: DocumentSession,
+    indices: List[int],
+    results: AsyncIterator[Union[bytes, Exception]],
+    summary: dict,
+    request: ChunkedTTSRequest,
+) -> AsyncIterator[bytes]:
+    """
+    One frame per chunk, written as soon as it is synthesized, followed by a
+    summary frame with the fields of the JSON response.
+    """
+    failed = []
+    position = 0
+    sent = 0
+    async for result in results:
+        chunk = {"type": "chunk", **_chunk_metadata(session, indices[position], result, request)}
+        position += 1
+        if "error" in chunk:
+            failed.append(chunk["index"])
+            yield frames.encode_frame(chunk)
+        else:
+            sent += len(result)
+            yield frames.encode_frame(chunk, result)
+    _chunks_bytes.observe(sent)
+
+    _schedule_prefetch(session, summary["next_chunk_indices"], request)
+    yield frames.encode_frame({"type": "summary", **summary, "failed_chunks": failed})
+
+
 @router.post("/chunks/generate")
 async def generate_chunks(request: ChunkedTTSRequest):
     """
@@ -122,79 +472,248 @@ async def generate_chunks(request: ChunkedTTSRequest):
     Returns base64 encoded audio for the requested chunk indices.
     Use this for progressive loading - generate first chunks, start playing,
     then request next chunks while playing.
+    Pass document_id from /documents to avoid re-sending the text.
+    With response_format="frames" the audio is streamed as length-prefixed
+    binary frames (see services/audio/frames.py) instead of base64 JSON.
     """
-    if not request.text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    if request.document_id:
+        session = _get_document(request.document_id)
+    elif request.text and request.text.strip():
+        session = None
+    else:
+        raise HTTPException(status_code=400, detail="Text or document_id is required")
 
     if request.voice not in [v["id"] for v in AVAILABLE_VOICES]:
         raise HTTPException(status_code=400, detail=f"Invalid voice: {request.voice}")
 
     try:
-        # Get all chunks
-        all_chunks = formatter.chunk_for_streaming(request.text)
-        total_chunks = len(all_chunks)
+        # Texts sent inline are registered too, so repeated requests for the
+        # same text are only formatted once
+        if session is None:
+            session = await _register(request.text, _chunk_schedule(request))
+        total_chunks = len(session)
 
         # Validate requested indices
         valid_indices = [i for i in request.chunk_indices if 0 <= i < total_chunks]
         if not valid_indices:
             raise HTTPException(status_code=400, detail="No valid chunk indices provided")
 
-        # Generate audio for each requested chunk
-        chunks_audio = []
-        for chunk_idx in valid_indices:
-            _, chunk_text = all_chunks[chunk_idx]
-
-            audio_data = await tts_service.generate_audio(
-                text=chunk_text,
-                voice=request.voice,
-                speed=request.speed,
-            )
-
-            chunks_audio.append({
-                "index": chunk_idx,
-                "audio_base64": base64.b64encode(audio_data).decode("utf-8"),
-                "word_count": len(chunk_text.split()),
-                "char_count": len(chunk_text),
-            })
-
         # Determine next chunks to request
         max_requested = max(valid_indices)
         next_indices = []
         for i in range(max_requested + 1, min(max_requested + 3, total_chunks)):
             next_indices.append(i)
 
-        return {
+        summary = {
+            "document_id": session.document_id,
             "total_chunks": total_chunks,
-            "generated_chunks": chunks_audio,
             "next_chunk_indices": next_indices,
             "is_complete": max_requested >= total_chunks - 1,
         }
+
+        # Generate the requested chunks concurrently; results keep request
+        # order, and chunks prefetched by an earlier request are claimed first
+        async def prefetched(position: int) -> Optional[bytes]:
+            return await prefetcher.take(
+                session.document_id,
+                valid_indices[position],
+                request.voice,
+                request.speed,
+                Priority.INTERACTIVE if position == 0 else Priority.NEXT,
+            )
+
+        results = tts_service.iter_batch(
+            [session.chunk(i) for i in valid_indices],
+            voice=request.voice,
+            speed=request.speed,
+            max_concurrency=settings.tts_request_concurrency,
+            lookup=prefetched,
+        )
+
+        if request.response_format == "frames":
+            return StreamingResponse(
+                _chunk_frames(session, valid_indices, results, summary, request),
+                media_type=frames.MEDIA_TYPE,
+            )
+
+        chunks_audio = []
+        position = 0
+        sent = 0
+        async for result in results:
+            chunk = _chunk_metadata(session, valid_indices[position], result, request)
+            if "error" not in chunk:
+                sent += len(result)
+                chunk["audio_base64"] = base64.b64encode(result).decode("utf-8")
+            chunks_audio.append(chunk)
+            position += 1
+        _chunks_bytes.observe(sent)
+
+        _schedule_prefetch(session, next_indices, request)
+
+        return {
+            **summary,
+            "generated_chunks": chunks_audio,
+            "failed_chunks": [c["index"] for c in chunks_audio if "error" in c],
+        }
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _counted(audio: AsyncGenerator[bytes, None]) -> AsyncIterator[bytes]:
+    """Pass streamed audio through, recording its size once the stream ends"""
+    sent = 0
+    try:
+        async for data in audio:
+            sent += len(data)
+            yield data
+    finally:
+        await audio.aclose()
+        _stream_bytes.observe(sent)
+
+
+async def _tracked(audio: AsyncIterator[bytes], stream_id: str) -> AsyncIterator[bytes]:
+    """Pass a pipelined stream through, marking its key list complete at the end"""
+    async for data in audio:
+        yield data
+    stream_keys.finish(stream_id)
+
+
 @router.post("/stream")
 async def stream_tts(request: TTSRequest):
-    """Stream TTS audio in real-time chunks"""
+    """
+    Stream TTS audio in real-time chunks. Unpipelined, X-Audio-Key names the
+    audio; pipelined, each chunk is cached under its own key, listed at
+    /stream/{X-Stream-Id}/keys
+    """
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
     if request.voice not in [v["id"] for v in AVAILABLE_VOICES]:
         raise HTTPException(status_code=400, detail=f"Invalid voice: {request.voice}")
 
+    if request.pipelined and request.format_text:
+        # Format and chunk incrementally, then overlap synthesis of upcoming
+        # chunks with streaming of the current one
+        schedule = _chunk_schedule(request)
+
+        def chunk_texts():
+            for _, text in formatter.iter_chunks(request.text, schedule):
+                yield text
+
+        stream_id, keys = stream_keys.open()
+        audio = stream_chunks(
+            tts_service,
+            chunk_texts(),
+            voice=request.voice,
+            speed=request.speed,
+            lookahead=settings.stream_lookahead_chunks,
+            keys=keys,
+        )
+        return StreamingResponse(
+            _tracked(_counted(audio), stream_id),
+            media_type="audio/mpeg",
+            headers={"X-Stream-Id": stream_id},
+        )
+
     try:
         # Apply prosody formatting
-        text_to_speak = formatter.format(request.text) if request.format_text else request.text
+        text_to_speak = await _format(request.text) if request.format_text else request.text
 
         return StreamingResponse(
-            tts_service.stream_audio(
-                text=text_to_speak,
-                voice=request.voice,
-                speed=request.speed,
+            _counted(
+                tts_service.stream_audio(
+                    text=text_to_speak,
+                    voice=request.voice,
+                    speed=request.speed,
+                )
             ),
             media_type="audio/mpeg",
+            headers={
+                "X-Audio-Key": tts_service.audio_key(text_to_speak, request.voice, request.speed),
+            },
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stream/{stream_id}/keys")
+async def get_stream_keys(stream_id: str):
+    """
+    Audio keys of a pipelined stream's chunks, in order, for GET /audio/{key};
+    complete once every chunk has been streamed
+    """
+    keys = stream_keys.get(stream_id)
+    if keys is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired stream: {stream_id}")
+    return keys
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Synthesize a long document in the background. Returns a job_id at once;
+    poll GET /jobs/{job_id} and fetch chunks as they finish. 503 when the
+    queue is full.
+    """
+    if request.document_id:
+        session = _get_document(request.document_id)
+    elif request.text and request.text.strip():
+        session = await _register(request.text, _chunk_schedule(request))
+    else:
+        raise HTTPException(status_code=400, detail="Text or document_id is required")
+
+    if request.voice not in [v["id"] for v in AVAILABLE_VOICES]:
+        raise HTTPException(status_code=400, detail=f"Invalid voice: {request.voice}")
+
+    try:
+        job = await job_queue.submit(
+            [session.chunk(i) for i in range(len(session))], request.voice, request.speed
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return job.progress()
+
+
+@router.get("/jobs/stats")
+async def job_stats():
+    """Background job counters and queue occupancy"""
+    return job_queue.snapshot()
+
+
+def _get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job state and which chunks are ready"""
+    return _get_job(job_id).progress()
+
+
+@router.get("/jobs/{job_id}/chunks/{index}")
+async def get_job_chunk(job_id: str, index: int, range: Optional[str] = Header(None)):
+    """Audio of a finished chunk, available while the rest of the job runs"""
+    job = _get_job(job_id)
+    path = job_queue.chunk_path(job, index)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Chunk {index} is not ready")
+    try:
+        audio = await asyncio.to_thread(path.read_bytes)
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"Chunk {index} is not ready")
+    return _audio_response(audio, range)
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Cancel a job and delete its audio"""
+    if not await job_queue.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return {"deleted": True}
@@ -0,0 +1,132 @@
+"""
+Cold start timing and warm-up for the API process.
+
+api.main imports this module first, so the clock starts before its own
+imports; it then marks when those are done and when the lifespan startup
+has finished, and FirstRequestMiddleware times the first response. The
+report is served at /startup/stats and in /metrics, and printed once the
+first request has been answered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from services.lazy import preload
+
+_ORIGIN = time.perf_counter()
+
+# Dependencies deferred until first use (see services/lazy.py) that warm-up
+# loads ahead of the first request: synthesis, page fetching, extraction
+WARM_MODULES = ("edge_tts", "httpx", "trafilatura", "lxml.html")
+# What each worker process needs for extraction and cleaning
+WORKER_MODULES = ("trafilatura", "lxml.html")
+
+
+def _process_age() -> Optional[float]:
+    """Seconds since the process started, where /proc provides it (Linux)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime is field 22; fields after the command name start at 3
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@dataclass
+class StartupReport:
+    """Cold start timings in seconds; None until reached"""
+
+    # Process start to the start of the api.main import (interpreter and
+    # server start-up), where the platform reports it
+    before_import_seconds: Optional[float] = None
+    # Importing api.main and everything it imports
+    import_seconds: Optional[float] = None
+    warmup_enabled: bool = False
+    warmup_seconds: Optional[float] = None
+    # From the start of the api.main import to the end of lifespan startup
+    ready_seconds: Optional[float] = None
+    # From the start of the api.main import to the first response's last byte
+    first_request_seconds: Optional[float] = None
+    first_request_path: Optional[str] = None
+    first_request_duration_seconds: Optional[float] = None
+
+
+report = StartupReport(before_import_seconds=_process_age())
+
+
+def _elapsed() -> float:
+    return time.perf_counter() - _ORIGIN
+
+
+def mark_imports() -> None:
+    report.import_seconds = _elapsed()
+
+
+def mark_ready() -> None:
+    report.ready_seconds = _elapsed()
+
+
+async def warm_up() -> None:
+    """
+    Load the deferred dependencies and start the page fetcher and worker
+    pool now, so the first request does not pay for them. Runs in the
+    lifespan startup, before any request or background job can touch the
+    lazily loaded modules.
+    """
+    from api.routes import content
+    from api.workers import worker_pool
+
+    report.warmup_enabled = True
+    started = time.perf_counter()
+    try:
+        preload(*WARM_MODULES)
+        content.fetcher.start()
+        worker_pool.start()
+        if worker_pool.mode == "process":
+            # Concurrent tasks each take a different idle worker
+            await asyncio.gather(*(
+                worker_pool.run(preload, *WORKER_MODULES)
+                for _ in range(worker_pool.max_workers)
+            ))
+    except Exception as e:
+        print(f"Warm-up failed, continuing without it: {e}")
+    report.warmup_seconds = time.perf_counter() - started
+
+
+def snapshot() -> dict:
+    return asdict(report)
+
+
+class FirstRequestMiddleware:
+    """ASGI middleware timing the first HTTP request the process answers"""
+
+    def __init__(self, app: Callable[..., Any]):
+        self.app = app
+        self._seen = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self._seen or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self._seen = True
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            report.first_request_seconds = _elapsed()
+            report.first_request_path = scope["path"]
+            report.first_request_duration_seconds = time.perf_counter() - started
+            print(
+                f"First request ({scope['path']}) answered {report.first_request_seconds:.2f}s "
+                f"after import started: imports {report.import_seconds or 0:.2f}s, "
+                f"ready at {report.ready_seconds or 0:.2f}s, "
+                f"request {report.first_request_duration_seconds:.2f}s"
+            )
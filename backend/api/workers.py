@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from api.config import settings
+from services.processing.workers import WorkerPool
+
+# CPU-bound extraction, cleaning and formatting for every router; started and
+# closed by the app lifespan
+worker_pool = WorkerPool(
+    mode=settings.worker_mode,
+    max_workers=settings.worker_count or None,
+    task_timeout=settings.worker_task_timeout_seconds,
+)
@@ -0,0 +1,131 @@
+"""
+Benchmark text cleaning on adversarial inputs and check it scales linearly.
+
+Run from the backend directory:
+
+    python -m benchmarks.adversarial                       # 10KB, 100KB, 1MB
+    python -m benchmarks.adversarial --sizes 1KB 10KB 100KB
+
+Inputs are the shapes that made sentence-based regexes backtrack: long
+stretches with no sentence punctuation (run-on prose, minified text, table
+dumps) and text dense with promotional phrases. For each input the report
+gives p50 time per size and the scaling exponent, the slope of log(time)
+against log(size): about 1 for linear time, about 2 for quadratic. The run
+exits non-zero if any exponent exceeds --max-exponent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import SIZES
+from benchmarks.pipeline import RESULTS_DIR, _metadata, _time_calls
+from services.content.cleaner import ContentCleaner
+
+# Repeating units for each adversarial input
+INPUTS: Dict[str, str] = {
+    # Prose with no sentence punctuation at all
+    "run_on": "lorem ipsum dolor sit amet consectetur adipiscing elit ",
+    # No spaces or punctuation, like minified text
+    "minified": "loremipsumdolorsitametconsecteturadipiscingelit",
+    # Tab-separated rows, one promotional word per row
+    "table": "2024-01-01\t1234\tsubscribe\tfollow\tpartner\t0.5\n",
+    # Promotional phrases with no punctuation between them
+    "promo_dense": "click here to read more articles and follow us on twitter ",
+}
+
+
+def make_input(kind: str, size: int) -> str:
+    unit = INPUTS[kind]
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _targets() -> Dict[str, Callable[[str], Any]]:
+    cleaner = ContentCleaner()
+    return {
+        "cleaner.remove_promo": cleaner._remove_promo_content,
+        "cleaner.clean": cleaner.clean,
+    }
+
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """Least-squares slope of log(seconds) against log(size)"""
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+    num = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    den = sum((x - x_mean) ** 2 for x in xs)
+    return num / den if den else 0.0
+
+
+def run(
+    sizes: List[int],
+    targets: List[str] | None = None,
+    kinds: List[str] | None = None,
+    min_rounds: int = 3,
+    min_time: float = 0.5,
+) -> Dict[str, Any]:
+    """Time every (target, input) pair at each size and fit the scaling exponent"""
+    available = _targets()
+    results = []
+    for target in targets or list(available):
+        fn = available[target]
+        for kind in kinds or list(INPUTS):
+            timings = []
+            for size in sizes:
+                text = make_input(kind, size)
+                fn(text)  # warm up
+                timings.append(statistics.median(_time_calls(fn, text, min_rounds, 50, min_time)))
+            exponent = scaling_exponent(sizes, timings)
+            results.append({
+                "target": target,
+                "kind": kind,
+                "sizes": sizes,
+                "p50_ms": [t * 1000 for t in timings],
+                "exponent": exponent,
+            })
+            cells = "  ".join(f"{size // 1024:>5d}KB {t * 1000:9.2f} ms" for size, t in zip(sizes, timings))
+            print(f"{target:22s} {kind:12s} {cells}  exponent {exponent:4.2f}", flush=True)
+    return {"meta": _metadata(), "results": results}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", nargs="+", choices=list(_targets()))
+    parser.add_argument("--kinds", nargs="+", choices=list(INPUTS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["10KB", "100KB", "1MB"])
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="minimum seconds spent timing each size")
+    parser.add_argument("--max-exponent", type=float, default=1.3,
+                        help="fail if any input scales worse than size ** max-exponent")
+    parser.add_argument("--output", type=Path,
+                        help="JSON output path (default: benchmarks/results/adversarial-<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(SIZES[label] for label in args.sizes)
+    report = run(sizes, args.targets, args.kinds, args.min_rounds, args.min_time)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"adversarial-{report['meta']['commit'] or 'local'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    superlinear = [r for r in report["results"] if r["exponent"] > args.max_exponent]
+    for r in superlinear:
+        print(f"{r['target']} on {r['kind']} scales as size ** {r['exponent']:.2f}")
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Load test the /v1/tts API.
+
+Run from the backend directory:
+
+    python -m benchmarks.loadtest                                  # local server, fake backend
+    python -m benchmarks.loadtest --concurrency 1 8 32 --requests 200
+    python -m benchmarks.loadtest --fake-ttfb-ms 0 --fake-bytes-per-second 0   # service overhead only
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000      # an already running server
+
+Without --url a uvicorn server is started on a free local port with the fake
+synthesis backend (TTS_BACKEND=fake), so no network access is needed. Each
+(endpoint, concurrency) case reports requests per second, time to first byte
+and total latency percentiles, and the error count. Every request uses a
+different text so the audio cache never answers; pass --allow-cache to reuse
+one text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.pipeline import RESULTS_DIR, _metadata, _percentile
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+ENDPOINTS = ("generate", "stream", "chunks")
+
+
+def make_text(words: int, request_id: int | None = None) -> str:
+    """Article-like text of about `words` words, unique per request_id"""
+    sentence = "This is a sentence from the load test article, read aloud by the service."
+    per_sentence = len(sentence.split())
+    text = " ".join([sentence] * max(1, words // per_sentence))
+    if request_id is not None:
+        text = f"Request {request_id}. {text}"
+    return text
+
+
+def _request(endpoint: str, text: str) -> Tuple[str, Dict[str, Any]]:
+    if endpoint == "generate":
+        return "/v1/tts/generate", {"text": text}
+    if endpoint == "stream":
+        return "/v1/tts/stream", {"text": text}
+    if endpoint == "chunks":
+        return "/v1/tts/chunks/generate", {"text": text, "chunk_indices": [0, 1]}
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def _one(client: httpx.AsyncClient, endpoint: str, text: str) -> Dict[str, Any]:
+    """Send one request and time its first and last byte"""
+    path, body = _request(endpoint, text)
+    started = time.perf_counter()
+    ttfb = None
+    size = 0
+    try:
+        async with client.stream("POST", path, json=body) as response:
+            async for data in response.aiter_raw():
+                if ttfb is None:
+                    ttfb = time.perf_counter() - started
+                size += len(data)
+            ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    total = time.perf_counter() - started
+    return {"ok": ok, "ttfb": ttfb if ttfb is not None else total, "total": total, "bytes": size}
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    concurrency: int,
+    requests: int,
+    words: int = 200,
+    allow_cache: bool = False,
+) -> Dict[str, Any]:
+    """Send `requests` requests from `concurrency` workers and summarize them"""
+    ids = itertools.count()
+    shared_text = make_text(words)
+    samples: List[Dict[str, Any]] = []
+
+    async def worker() -> None:
+        while True:
+            request_id = next(ids)
+            if request_id >= requests:
+                return
+            text = shared_text if allow_cache else make_text(words, request_id)
+            samples.append(await _one(client, endpoint, text))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = [s for s in samples if s["ok"]]
+    ttfb = sorted(s["ttfb"] for s in succeeded) or [0.0]
+    total = sorted(s["total"] for s in succeeded) or [0.0]
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(samples) - len(succeeded),
+        "elapsed_s": elapsed,
+        "rps": len(succeeded) / elapsed if elapsed else 0.0,
+        "ttfb_p50_ms": _percentile(ttfb, 50) * 1000,
+        "ttfb_p95_ms": _percentile(ttfb, 95) * 1000,
+        "ttfb_p99_ms": _percentile(ttfb, 99) * 1000,
+        "latency_p50_ms": _percentile(total, 50) * 1000,
+        "latency_p95_ms": _percentile(total, 95) * 1000,
+        "latency_p99_ms": _percentile(total, 99) * 1000,
+        "mb_received": sum(s["bytes"] for s in samples) / 1_000_000,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env_overrides: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    """Start uvicorn on a free local port and wait until /health answers"""
+    port = _free_port()
+    env = {**os.environ, **env_overrides}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+async def _run_all(url: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                result = await run_load(
+                    client, endpoint, concurrency, args.requests, args.words, args.allow_cache
+                )
+                results.append(result)
+                print(
+                    f"{endpoint:8s} c={concurrency:<4d} {result['rps']:8.1f} req/s  "
+                    f"ttfb p50 {result['ttfb_p50_ms']:8.1f} p99 {result['ttfb_p99_ms']:8.1f} ms  "
+                    f"total p50 {result['latency_p50_ms']:8.1f} p99 {result['latency_p99_ms']:8.1f} ms  "
+                    f"errors {result['errors']}",
+                    flush=True,
+                )
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="base URL of a running server (default: start one)")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=50, help="requests per case")
+    parser.add_argument("--words", type=int, default=100, help="words of text per request")
+    parser.add_argument("--allow-cache", action="store_true", help="reuse one text for every request")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--fake-ttfb-ms", type=float, default=300)
+    parser.add_argument("--fake-bytes-per-second", type=float, default=240000)
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path,
+                        help="JSON output path (default: benchmarks/results/load-<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_server({
+            "TTS_BACKEND": "fake",
+            "FAKE_TTFB_MS": str(args.fake_ttfb_ms),
+            "FAKE_BYTES_PER_SECOND": str(args.fake_bytes_per_second),
+            "FAKE_ERROR_RATE": str(args.fake_error_rate),
+            "AUDIO_CACHE_DIR": "",
+        })
+    try:
+        results = asyncio.run(_run_all(url, args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "meta": {**_metadata(), "url": args.url or "local fake backend", "words": args.words},
+        "results": results,
+    }
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"load-{report['meta']['commit'] or 'local'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
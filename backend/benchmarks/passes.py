@@ -0,0 +1,148 @@
+"""
+Profile the formatter and cleaner pass by pass over a directory of documents.
+
+Run from the backend directory:
+
+    python -m benchmarks.passes                        # the bundled corpus seeds
+    python -m benchmarks.passes path/to/docs --top 5
+    python -m benchmarks.passes path/to/docs --targets cleaner --output passes.json
+
+Every file under the directory is run through ProsodyFormatter.format and
+ContentCleaner.clean with a PassProfile. The report ranks the passes by their
+total time over all documents, with each pass's share of its target's time
+and the net change in text size it makes. It also ranks the documents by
+time, with the slowest pass for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import CORPUS_DIR
+from benchmarks.pipeline import _metadata
+from services.content.cleaner import ContentCleaner
+from services.processing.formatter import ProsodyFormatter
+from services.processing.profiling import PassProfile
+
+
+def _targets() -> Dict[str, Callable[[str, PassProfile], str]]:
+    formatter = ProsodyFormatter()
+    cleaner = ContentCleaner()
+    return {
+        "formatter": lambda text, profile: formatter.format(text, profile=profile),
+        "cleaner": lambda text, profile: cleaner.clean(text, profile=profile),
+    }
+
+
+def find_documents(directory: Path) -> List[Path]:
+    return sorted(
+        path for path in directory.rglob("*") if path.is_file() and not path.name.startswith(".")
+    )
+
+
+def profile_documents(
+    paths: List[Path],
+    targets: List[str] | None = None,
+    repeat: int = 3,
+    root: Path | None = None,
+) -> Dict[str, Any]:
+    """
+    Profile every document with every target. Times are per run, averaged
+    over repeat runs; documents are named relative to root if given.
+    """
+    available = _targets()
+    passes: Dict[str, Dict[str, Any]] = {}
+    documents = []
+    for path in paths:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        for target in targets or list(available):
+            profile = PassProfile()
+            for _ in range(repeat):
+                available[target](text, profile)
+            total_ms = profile.total_seconds * 1000 / repeat
+            slowest = profile.slowest()[0] if profile.passes else None
+            share = slowest.seconds / profile.total_seconds if slowest and profile.total_seconds else 0.0
+            documents.append({
+                "path": str(path.relative_to(root) if root else path),
+                "target": target,
+                "chars": len(text),
+                "ms": total_ms,
+                "ms_per_kb": total_ms / max(len(text) / 1024, 1e-9),
+                "slowest_pass": slowest.name if slowest else None,
+                "slowest_pass_share": share,
+            })
+            for timing in profile.passes.values():
+                entry = passes.setdefault(f"{target}.{timing.name}", {
+                    "target": target,
+                    "name": timing.name,
+                    "documents": 0,
+                    "ms": 0.0,
+                    "size_delta": 0,
+                })
+                entry["documents"] += 1
+                entry["ms"] += timing.seconds * 1000 / repeat
+                entry["size_delta"] += timing.size_delta // repeat
+
+    target_ms: Dict[str, float] = {}
+    for entry in passes.values():
+        target_ms[entry["target"]] = target_ms.get(entry["target"], 0.0) + entry["ms"]
+    for entry in passes.values():
+        total = target_ms[entry["target"]]
+        entry["share"] = entry["ms"] / total if total else 0.0
+        entry["ms_per_document"] = entry["ms"] / entry["documents"]
+
+    return {
+        "meta": _metadata(),
+        "passes": sorted(passes.values(), key=lambda entry: entry["ms"], reverse=True),
+        "documents": sorted(documents, key=lambda doc: doc["ms"], reverse=True),
+    }
+
+
+def print_report(report: Dict[str, Any], top: int) -> None:
+    print(f"Worst passes ({len(report['passes'])} total)")
+    print(f"{'pass':42s} {'total ms':>10s} {'share':>6s} {'ms/doc':>9s} {'size delta':>11s}")
+    for entry in report["passes"][:top]:
+        print(
+            f"{entry['target'] + '.' + entry['name']:42s} {entry['ms']:10.2f} "
+            f"{entry['share']:6.1%} {entry['ms_per_document']:9.3f} {entry['size_delta']:+11d}"
+        )
+
+    print(f"\nWorst documents ({len(report['documents'])} runs)")
+    print(f"{'document':40s} {'target':10s} {'KB':>8s} {'ms':>9s} {'ms/KB':>7s}  slowest pass")
+    for doc in report["documents"][:top]:
+        name = doc["path"] if len(doc["path"]) <= 40 else "..." + doc["path"][-37:]
+        print(
+            f"{name:40s} {doc['target']:10s} {doc['chars'] / 1024:8.1f} {doc['ms']:9.2f} "
+            f"{doc['ms_per_kb']:7.2f}  {doc['slowest_pass']} ({doc['slowest_pass_share']:.0%})"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", type=Path, nargs="?", default=CORPUS_DIR)
+    parser.add_argument("--targets", nargs="+", choices=list(_targets()))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per document, averaged")
+    parser.add_argument("--top", type=int, default=10, help="rows shown in each ranking")
+    parser.add_argument("--output", type=Path, help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.directory)
+    if not paths:
+        print(f"No documents found in {args.directory}")
+        return 1
+    report = profile_documents(paths, args.targets, max(args.repeat, 1), args.directory)
+    print_report(report, args.top)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
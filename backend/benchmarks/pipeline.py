@@ -0,0 +1,230 @@
+"""
+Benchmark the text pipeline: formatter, chunker, cleaner and extractor.
+
+Run from the backend directory:
+
+    python -m benchmarks.pipeline                      # full corpus, 1KB-5MB
+    python -m benchmarks.pipeline --sizes 1KB 10KB     # quick run
+    python -m benchmarks.pipeline --compare benchmarks/results/<old>.json
+
+Each case reports throughput (MB/s at the median), p50/p99 time per call and
+the peak memory allocated during one call. Results are written as JSON so runs
+from different commits can be compared with --compare.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.corpus import HTML_KINDS, KINDS, SIZES, Document, build_corpus
+from services.content.cleaner import ContentCleaner
+from services.content.extractor import ContentExtractor
+from services.processing.formatter import ProsodyFormatter
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _targets() -> Dict[str, Tuple[Callable[[str], Any], Tuple[str, ...]]]:
+    """Benchmarked callables and the document kinds each one runs on"""
+    formatter = ProsodyFormatter()
+    cleaner = ContentCleaner()
+    extractor = ContentExtractor()
+    all_kinds = tuple(KINDS)
+
+    return {
+        "formatter.format": (formatter.format, all_kinds),
+        "formatter.chunk_for_streaming": (formatter.chunk_for_streaming, all_kinds),
+        "formatter.iter_chunks": (lambda text: list(formatter.iter_chunks(text)), all_kinds),
+        "cleaner.clean": (cleaner.clean, all_kinds),
+        "extractor.extract_from_html": (extractor.extract_from_html, HTML_KINDS),
+    }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _time_calls(
+    fn: Callable[[str], Any],
+    text: str,
+    min_rounds: int,
+    max_rounds: int,
+    min_time: float,
+) -> List[float]:
+    """Time repeated calls until both min_rounds and min_time are reached"""
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds:
+        t0 = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= min_rounds and time.perf_counter() - started >= min_time:
+            break
+    return timings
+
+
+def _peak_memory(fn: Callable[[str], Any], text: str) -> int:
+    """Peak bytes allocated during a single call"""
+    tracemalloc.start()
+    try:
+        fn(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(
+    target: str,
+    fn: Callable[[str], Any],
+    doc: Document,
+    min_rounds: int = 5,
+    max_rounds: int = 200,
+    min_time: float = 1.0,
+) -> Dict[str, Any]:
+    """Benchmark one (target, document) pair"""
+    # Warm up caches (regex compilation, lazy imports) on small inputs only;
+    # for multi-megabyte documents a warm-up call would double the run time
+    if doc.size_bytes <= SIZES["100KB"]:
+        fn(doc.text)
+
+    # Larger documents get fewer rounds so the full corpus finishes in minutes
+    if doc.size_bytes >= SIZES["1MB"]:
+        min_rounds = min(min_rounds, 3)
+
+    timings = sorted(_time_calls(fn, doc.text, min_rounds, max_rounds, min_time))
+    p50 = statistics.median(timings)
+
+    return {
+        "target": target,
+        "kind": doc.kind,
+        "size": doc.size_label,
+        "bytes": doc.size_bytes,
+        "rounds": len(timings),
+        "p50_ms": p50 * 1000,
+        "p99_ms": _percentile(timings, 99) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "throughput_mb_s": doc.size_bytes / p50 / 1_000_000 if p50 else 0.0,
+        "peak_memory_bytes": _peak_memory(fn, doc.text),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata() -> Dict[str, Any]:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run(
+    targets: List[str] | None = None,
+    kinds: List[str] | None = None,
+    sizes: List[str] | None = None,
+    min_rounds: int = 5,
+    min_time: float = 1.0,
+) -> Dict[str, Any]:
+    """Run every selected case and return the JSON-ready report"""
+    available = _targets()
+    selected = targets or list(available)
+    results = []
+
+    for doc in build_corpus(kinds, sizes):
+        for name in selected:
+            fn, target_kinds = available[name]
+            if doc.kind not in target_kinds:
+                continue
+            result = run_case(name, fn, doc, min_rounds=min_rounds, min_time=min_time)
+            results.append(result)
+            print(
+                f"{name:32s} {doc.kind:13s} {doc.size_label:>6s}  "
+                f"{result['throughput_mb_s']:8.2f} MB/s  "
+                f"p50 {result['p50_ms']:9.2f} ms  p99 {result['p99_ms']:9.2f} ms  "
+                f"peak {result['peak_memory_bytes'] / 1_000_000:8.2f} MB",
+                flush=True,
+            )
+
+    return {"meta": _metadata(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print p50 ratios against a baseline report; return the number of regressions"""
+    def key(r: Dict[str, Any]) -> Tuple[str, str, str]:
+        return r["target"], r["kind"], r["size"]
+
+    base = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for result in current["results"]:
+        old = base.get(key(result))
+        if not old or not old["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  improved"
+        print(f"{result['target']:32s} {result['kind']:13s} {result['size']:>6s}  "
+              f"p50 x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", nargs="+", choices=list(_targets()))
+    parser.add_argument("--kinds", nargs="+", choices=list(KINDS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES))
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="minimum seconds spent timing each case")
+    parser.add_argument("--output", type=Path,
+                        help="JSON output path (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative p50 slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(args.targets, args.kinds, args.sizes, args.min_rounds, args.min_time)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{report['meta']['commit'] or 'local'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import random
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
+
+from services.lazy import lazy_import
+
+# Loaded on the first synthesis; importing it pulls in aiohttp
+edge_tts = lazy_import("edge_tts")
+
+# MPEG-2 Layer III, 48 kbit/s, 24 kHz, mono, no CRC: the format Edge TTS
+# returns ("audio-24khz-48kbitrate-mono-mp3")
+MP3_FRAME_HEADER = bytes([0xFF, 0xF3, 0x64, 0xC0])
+MP3_FRAME_BYTES = 144  # 72 * 48000 / 24000
+MP3_FRAME_SECONDS = 576 / 24000
+# 150 words per minute at normal speed
+SECONDS_PER_WORD = 0.4
+# One WordBoundary tick is 100 ns
+TICKS_PER_SECOND = 10_000_000
+
+
+class SynthesisBackend(ABC):
+    """
+    Source of synthesized speech for EdgeTTSService.
+
+    stream() yields events shaped like edge_tts.Communicate.stream():
+    {"type": "audio", "data": bytes} and {"type": "WordBoundary", "offset",
+    "duration", "text"}, with offsets and durations in 100 ns ticks.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[Dict[str, Any]]:
+        """Synthesize text; an async generator of audio and boundary events"""
+
+
+class EdgeBackend(SynthesisBackend):
+    """Microsoft Edge online TTS"""
+
+    name = "edge"
+
+    async def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[Dict[str, Any]]:
+        communicate = edge_tts.Communicate(
+            text, voice, rate=rate, **_word_boundary_kwargs(edge_tts.Communicate)
+        )
+        async for event in communicate.stream():
+            yield event
+
+
+@lru_cache(maxsize=None)
+def _word_boundary_kwargs(communicate: type) -> Dict[str, str]:
+    """
+    Ask for per-word boundaries: edge-tts 7 sends SentenceBoundary events
+    unless told otherwise, while 6.x only sends WordBoundary and has no
+    boundary argument.
+    """
+    params = inspect.signature(communicate).parameters
+    if "boundary" in params or any(p.kind is p.VAR_KEYWORD for p in params.values()):
+        return {"boundary": "WordBoundary"}
+    return {}
+
+
+class FakeBackendError(Exception):
+    """Injected failure from FakeBackend"""
+
+
+class FakeBackend(SynthesisBackend):
+    """
+    Deterministic offline backend for tests and load testing.
+
+    Emits silent but valid MP3 frames, about 0.4 s of audio per word at
+    normal rate, plus a WordBoundary event per word. ttfb_ms delays the first
+    event, bytes_per_second paces the audio (0 sends it all at once), and
+    error_rate is the probability that a request fails before any audio.
+    The same seed gives the same sequence of failures.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        ttfb_ms: float = 0,
+        bytes_per_second: float = 0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        frames_per_event: int = 8,
+    ):
+        self.ttfb_ms = ttfb_ms
+        self.bytes_per_second = bytes_per_second
+        self.error_rate = error_rate
+        self.frames_per_event = frames_per_event
+        self._rng = random.Random(seed)
+
+    @staticmethod
+    def _speed(rate: str) -> float:
+        try:
+            return max(0.1, 1 + int(rate.rstrip("%")) / 100)
+        except ValueError:
+            return 1.0
+
+    @staticmethod
+    def frame(index: int) -> bytes:
+        """One silent MP3 frame; the tail carries the frame index for debugging"""
+        # Header, then 9 bytes of zeroed side info (no main data: silence)
+        body = MP3_FRAME_HEADER + bytes(9)
+        return body + index.to_bytes(4, "big") + bytes(MP3_FRAME_BYTES - len(body) - 4)
+
+    def audio_seconds(self, text: str, rate: str = "+0%") -> float:
+        return max(1, len(text.split())) * SECONDS_PER_WORD / self._speed(rate)
+
+    async def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[Dict[str, Any]]:
+        if self.ttfb_ms:
+            await asyncio.sleep(self.ttfb_ms / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakeBackendError("Injected synthesis failure")
+
+        speed = self._speed(rate)
+        word_ticks = int(SECONDS_PER_WORD / speed * TICKS_PER_SECOND)
+        for i, word in enumerate(text.split()):
+            yield {
+                "type": "WordBoundary",
+                "offset": i * word_ticks,
+                "duration": word_ticks,
+                "text": word,
+            }
+
+        # Vary frame content by text so different texts never produce equal audio
+        seed = int.from_bytes(hashlib.sha256(f"{voice}{rate}{text}".encode()).digest()[:2], "big")
+        total = int(self.audio_seconds(text, rate) / MP3_FRAME_SECONDS) + 1
+        for start in range(0, total, self.frames_per_event):
+            count = min(self.frames_per_event, total - start)
+            data = b"".join(self.frame(seed + start + i) for i in range(count))
+            if self.bytes_per_second:
+                await asyncio.sleep(len(data) / self.bytes_per_second)
+            yield {"type": "audio", "data": data}
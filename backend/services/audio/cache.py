@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from services.audio.words import WordIndex
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache activity since startup"""
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AudioCache:
+    """
+    Content-addressed two-tier cache for synthesized audio.
+
+    Entries are keyed by a hash of (formatted text, voice, rate string). The
+    memory tier is an LRU bounded by total bytes; the disk tier stores one file
+    per entry under cache_dir and keeps an index (size, created, last access)
+    in index.json so entries and their LRU order survive restarts. Additions
+    and removals are appended to index.journal, and index.json is only
+    rewritten once the journal is as long as the index. Both tiers
+    evict least recently used entries until they fit their byte budget, and an
+    entry larger than a tier's whole budget is not stored in that tier.
+
+    An entry's word offset index (see services/audio/words.py) is stored next
+    to it as an entry of its own, under the same key plus WORDS_SUFFIX.
+    """
+
+    INDEX_FILE = "index.json"
+    JOURNAL_FILE = "index.journal"
+    # The journal is folded into index.json after max(this, entries) records
+    MIN_JOURNAL_RECORDS = 256
+    WORDS_SUFFIX = ".words"
+
+    def __init__(
+        self,
+        memory_bytes: int = 64 * 1024 * 1024,
+        cache_dir: str | None = None,
+        disk_bytes: int = 1024 * 1024 * 1024,
+        ttl_seconds: float | None = 24 * 3600,
+    ):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+        # Memory tier: key -> (audio, created), in LRU order
+        self._memory: OrderedDict[str, Tuple[bytes, float]] = OrderedDict()
+        self._memory_used = 0
+
+        # Disk index: key -> {"size", "created", "accessed"}, in LRU order
+        self._dir = Path(cache_dir) if cache_dir else None
+        self._index: OrderedDict[str, Dict[str, float]] = OrderedDict()
+        self._disk_used = 0
+        self._journal_records = 0
+        self._lock = threading.Lock()
+        if self._dir:
+            self._load_index()
+
+    @staticmethod
+    def make_key(text: str, voice: str, rate: str) -> str:
+        """Content address for a synthesis request"""
+        digest = hashlib.sha256()
+        for part in (text, voice, rate):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Look up audio by key, promoting disk hits into memory"""
+        data, tier = await self._lookup(key)
+        if data is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            if tier == "memory":
+                self.stats.memory_hits += 1
+            else:
+                self.stats.disk_hits += 1
+        return data
+
+    async def get_words(self, key: str) -> Optional[WordIndex]:
+        """Word offset index of the audio stored under key, if there is one"""
+        data, _ = await self._lookup(key + self.WORDS_SUFFIX)
+        return WordIndex.from_bytes(data) if data is not None else None
+
+    async def put_words(self, key: str, words: WordIndex) -> None:
+        """Store the word offset index of the audio under key"""
+        await self.put(key + self.WORDS_SUFFIX, words.to_bytes())
+
+    async def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """(data, "memory" or "disk"), or (None, None)"""
+        data = self._memory_get(key)
+        if data is not None:
+            return data, "memory"
+
+        if self._dir and key in self._index:
+            found = await asyncio.to_thread(self._disk_get, key)
+            if found is not None:
+                data, created = found
+                self._memory_put(key, data, created)
+                return data, "disk"
+        return None, None
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Store audio in both tiers"""
+        if not data:
+            return
+        self._memory_put(key, data)
+        if self._dir:
+            await asyncio.to_thread(self._disk_put, key, data)
+
+    def flush(self) -> None:
+        """Persist last-access times so LRU order survives a restart"""
+        if self._dir:
+            with self._lock:
+                self._save_index()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters and tier usage for reporting"""
+        return {
+            **asdict(self.stats),
+            "hit_ratio": self.stats.hit_ratio,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "memory_budget_bytes": self.memory_bytes,
+            "disk_entries": len(self._index),
+            "disk_bytes": self._disk_used,
+            "disk_budget_bytes": self.disk_bytes if self._dir else 0,
+        }
+
+    # Memory tier
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        data, created = item
+        if self.ttl_seconds is not None and time.time() - created > self.ttl_seconds:
+            del self._memory[key]
+            self._memory_used -= len(data)
+            self.stats.expired += 1
+            return None
+        self._memory.move_to_end(key)
+        return data
+
+    def _memory_put(self, key: str, data: bytes, created: float | None = None) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old[0])
+        self._memory[key] = (data, created or time.time())
+        self._memory_used += len(data)
+
+        while self._memory_used > self.memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+            self.stats.memory_evictions += 1
+
+    # Disk tier
+
+    def _path(self, key: str) -> Path:
+        name = key if key.endswith(self.WORDS_SUFFIX) else f"{key}.mp3"
+        return self._dir / key[:2] / name
+
+    def _expired(self, entry: Dict[str, float], now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry["created"] > self.ttl_seconds
+
+    def _disk_get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if self._expired(entry, now):
+                self._disk_remove(key)
+                self.stats.expired += 1
+                return None
+            try:
+                data = self._path(key).read_bytes()
+            except OSError:
+                self._disk_remove(key)
+                return None
+            entry["accessed"] = now
+            self._index.move_to_end(key)
+            return data, entry["created"]
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.disk_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+            if key in self._index:
+                self._disk_used -= int(self._index.pop(key)["size"])
+            now = time.time()
+            entry = {"size": len(data), "created": now, "accessed": now}
+            self._index[key] = entry
+            self._disk_used += len(data)
+            self._journal(key, entry)
+
+            while self._disk_used > self.disk_bytes:
+                oldest = next(iter(self._index))
+                self._disk_remove(oldest)
+                self.stats.disk_evictions += 1
+
+    def _disk_remove(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._disk_used -= int(entry["size"])
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        self._journal(key, None)
+
+    def _load_index(self) -> None:
+        """Rebuild the disk index, dropping entries whose files are gone or expired"""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        try:
+            saved = json.loads((self._dir / self.INDEX_FILE).read_text())
+        except (OSError, ValueError):
+            saved = {}
+        for key, entry in self._read_journal():
+            saved.pop(key, None)
+            if entry is not None:
+                saved[key] = entry
+
+        now = time.time()
+        entries = []
+        for key, entry in saved.items():
+            path = self._path(key)
+            if not path.exists() or self._expired(entry, now):
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((entry["accessed"], key, entry))
+
+        # Adopt files written before the index was last saved (e.g. after a crash)
+        orphans = [*self._dir.glob("*/*.mp3"), *self._dir.glob(f"*/*{self.WORDS_SUFFIX}")]
+        for path in orphans:
+            key = path.stem if path.suffix == ".mp3" else path.name
+            if key not in saved:
+                stat = path.stat()
+                entry = {"size": stat.st_size, "created": stat.st_mtime, "accessed": stat.st_mtime}
+                if self._expired(entry, now):
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((stat.st_mtime, key, entry))
+
+        for _, key, entry in sorted(entries):
+            self._index[key] = entry
+            self._disk_used += int(entry["size"])
+
+        while self._disk_used > self.disk_bytes:
+            self._disk_remove(next(iter(self._index)))
+            self.stats.disk_evictions += 1
+        self._save_index()
+
+    def _journal(self, key: str, entry: Optional[Dict[str, float]]) -> None:
+        """Record an added (entry) or removed (None) key; called with self._lock held"""
+        if self._journal_records >= max(self.MIN_JOURNAL_RECORDS, len(self._index)):
+            self._save_index()
+            return
+        with open(self._dir / self.JOURNAL_FILE, "a") as f:
+            f.write(json.dumps([key, entry]) + "\n")
+        self._journal_records += 1
+
+    def _read_journal(self) -> List[Tuple[str, Optional[Dict[str, float]]]]:
+        records = []
+        try:
+            with open(self._dir / self.JOURNAL_FILE) as f:
+                for line in f:
+                    try:
+                        key, entry = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue  # cut short by a crash
+                    records.append((key, entry))
+        except OSError:
+            pass
+        return records
+
+    def _save_index(self) -> None:
+        """Write the whole index and start a new journal"""
+        index_path = self._dir / self.INDEX_FILE
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index))
+        os.replace(tmp, index_path)
+        # Replaying the old journal onto the new index changes nothing, so a
+        # crash before this line loses nothing
+        (self._dir / self.JOURNAL_FILE).unlink(missing_ok=True)
+        self._journal_records = 0
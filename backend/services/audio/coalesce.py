@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+
+@dataclass
+class CoalesceStats:
+    """Counters for shared synthesis since startup"""
+
+    flights: int = 0  # upstream syntheses started
+    coalesced: int = 0  # requests that joined one already in flight
+    late_joiners: int = 0  # of those, joined after audio had started arriving
+    cancelled: int = 0  # abandoned by every consumer before finishing
+    failed: int = 0
+
+
+class _Flight:
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.consumers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    def notify(self) -> None:
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    async def wait(self) -> None:
+        await self._wake.wait()
+
+
+class SingleFlight:
+    """
+    Shares one upstream synthesis between concurrent identical requests.
+
+    The first request for a key starts produce() in a background task; every
+    request for the same key while it runs, including one that arrives after
+    audio has started, replays the parts received so far and then follows
+    the live stream. The synthesis is cancelled once every consumer has gone
+    away, and forgotten as soon as it finishes: later requests go through the
+    audio cache instead.
+    """
+
+    def __init__(self):
+        self.stats = CoalesceStats()
+        self._flights: Dict[str, _Flight] = {}
+
+    async def stream(
+        self,
+        key: str,
+        produce: Callable[[], AsyncIterator[bytes]],
+    ) -> AsyncIterator[bytes]:
+        """Audio parts for key, from a shared run of produce()"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.create_task(self._run(key, flight, produce))
+            self.stats.flights += 1
+        else:
+            self.stats.coalesced += 1
+            if flight.parts:
+                self.stats.late_joiners += 1
+
+        flight.consumers += 1
+        try:
+            position = 0
+            while True:
+                if position < len(flight.parts):
+                    position += 1
+                    yield flight.parts[position - 1]
+                elif flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                else:
+                    await flight.wait()
+        finally:
+            flight.consumers -= 1
+            if not flight.consumers and not flight.done:
+                self.stats.cancelled += 1
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    async def result(
+        self,
+        key: str,
+        produce: Callable[[], AsyncIterator[bytes]],
+    ) -> bytes:
+        """Complete audio for key, from a shared run of produce()"""
+        return b"".join([part async for part in self.stream(key, produce)])
+
+    async def _run(
+        self,
+        key: str,
+        flight: _Flight,
+        produce: Callable[[], AsyncIterator[bytes]],
+    ) -> None:
+        try:
+            async for part in produce():
+                flight.parts.append(part)
+                flight.notify()
+        except asyncio.CancelledError:
+            flight.error = RuntimeError("Synthesis cancelled")
+            raise
+        except Exception as e:
+            self.stats.failed += 1
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.notify()
+            self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "in_flight": len(self._flights)}
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
-import edge_tts
-from typing import AsyncGenerator, Optional
+import asyncio
+import time
+from typing import AsyncGenerator, Awaitable, Callable, List, Optional, Sequence, Union
+
+from services.audio.backends import EdgeBackend, SynthesisBackend
+from services.audio.cache import AudioCache
+from services.audio.coalesce import SingleFlight
+from services.audio.scheduler import Priority, SynthesisScheduler
+from services.audio.words import WordIndex
+from services.metrics import SYNTHESIS_IN_FLIGHT, SYNTHESIS_SECONDS, SYNTHESIS_TTFB_SECONDS
 
 # Available voices with metadata
 AVAILABLE_VOICES = [
@@ -44,10 +52,39 @@ AVAILABLE_VOICES = [
 
 
 class EdgeTTSService:
-    """Edge TTS service for text-to-speech generation"""
+    """
+    Edge TTS service for text-to-speech generation.
+
+    max_concurrency caps upstream synthesis calls across every request served
+    by this instance; cache hits do not take a slot. When every slot is busy,
+    the scheduler grants freed slots by priority (interactive, next,
+    prefetch, batch; see services/audio/scheduler.py). backend defaults to the
+    online Edge service (see services/audio/backends.py). With coalesce,
+    identical concurrent requests (text, voice and speed) share one upstream
+    synthesis (see services/audio/coalesce.py).
+    """
 
-    def __init__(self, default_voice: str = "en-US-JennyNeural"):
+    def __init__(
+        self,
+        default_voice: str = "en-US-JennyNeural",
+        cache: Optional[AudioCache] = None,
+        max_concurrency: int = 8,
+        backend: Optional[SynthesisBackend] = None,
+        coalesce: bool = True,
+        scheduler: Optional[SynthesisScheduler] = None,
+    ):
         self.default_voice = default_voice
+        self.cache = cache
+        self.backend = backend or EdgeBackend()
+        self.flights = SingleFlight() if coalesce else None
+        self.scheduler = scheduler or SynthesisScheduler(max_concurrency)
+        self._ttfb = SYNTHESIS_TTFB_SECONDS.labels(self.backend.name)
+        self._seconds = SYNTHESIS_SECONDS.labels(self.backend.name)
+        self._in_flight = SYNTHESIS_IN_FLIGHT.labels(self.backend.name)
+
+    def audio_key(self, text: str, voice: str | None = None, speed: float = 1.0) -> str:
+        """Cache key of the audio for a request, for GET /v1/tts/audio/{key}"""
+        return AudioCache.make_key(text, voice or self.default_voice, self._get_rate_string(speed))
 
     def _get_rate_string(self, speed: float) -> str:
         """Convert speed multiplier to rate string for Edge TTS"""
@@ -61,35 +98,163 @@ class EdgeTTSService:
         text: str,
         voice: str | None = None,
         speed: float = 1.0,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> bytes:
         """Generate complete audio from text"""
         voice = voice or self.default_voice
         rate = self._get_rate_string(speed)
 
-        communicate = edge_tts.Communicate(text, voice, rate=rate)
+        key = AudioCache.make_key(text, voice, rate)
+        if self.cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self.flights:
+            # Joining a flight still queued at a lower priority raises it
+            self.scheduler.promote(key, priority)
+            return await self.flights.result(
+                key, lambda: self._synthesize(text, voice, rate, key, priority)
+            )
+        parts = self._synthesize(text, voice, rate, key, priority)
+        return b"".join([part async for part in parts])
+
+    async def generate_batch(
+        self,
+        texts: Sequence[str],
+        voice: str | None = None,
+        speed: float = 1.0,
+        max_concurrency: int = 4,
+        lookup: Optional[Callable[[int], Awaitable[Optional[bytes]]]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> List[Union[bytes, Exception]]:
+        """
+        Generate audio for several texts concurrently.
+        Results are in input order; a failed text yields its exception in
+        place of the audio instead of failing the whole batch. lookup(i), if
+        given, is tried first for text i (e.g. to claim prefetched audio).
+        """
+        return [
+            result
+            async for result in self.iter_batch(
+                texts, voice, speed, max_concurrency, lookup, priority
+            )
+        ]
+
+    async def iter_batch(
+        self,
+        texts: Sequence[str],
+        voice: str | None = None,
+        speed: float = 1.0,
+        max_concurrency: int = 4,
+        lookup: Optional[Callable[[int], Awaitable[Optional[bytes]]]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncGenerator[Union[bytes, Exception], None]:
+        """
+        Like generate_batch, but yields each result as soon as it and every
+        result before it are ready. Closing the generator cancels the rest.
+        The first text is synthesized at priority and the rest at NEXT or
+        lower; each is raised to priority once it is the one being waited on.
+        """
+        limit = asyncio.Semaphore(max_concurrency)
+        later = max(priority, Priority.NEXT)
 
-        audio_data = b""
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_data += chunk["data"]
+        async def generate_one(position: int, text: str) -> bytes:
+            if lookup:
+                audio = await lookup(position)
+                if audio is not None:
+                    return audio
+            async with limit:
+                return await self.generate_audio(
+                    text, voice, speed, priority if position == 0 else later
+                )
 
-        return audio_data
+        tasks = [
+            asyncio.create_task(generate_one(i, text)) for i, text in enumerate(texts)
+        ]
+        try:
+            for text, task in zip(texts, tasks):
+                self.scheduler.promote(self.audio_key(text, voice, speed), priority)
+                try:
+                    yield await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    # Only a cancelled chunk is a per-chunk failure; cancellation
+                    # of the request itself must propagate
+                    if not task.cancelled():
+                        raise
+                    yield RuntimeError("Synthesis cancelled")
+                except Exception as e:
+                    yield e
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def stream_audio(
         self,
         text: str,
         voice: str | None = None,
         speed: float = 1.0,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> AsyncGenerator[bytes, None]:
         """Stream audio chunks for real-time playback"""
         voice = voice or self.default_voice
         rate = self._get_rate_string(speed)
 
-        communicate = edge_tts.Communicate(text, voice, rate=rate)
+        key = AudioCache.make_key(text, voice, rate)
+        if self.cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if self.flights:
+            self.scheduler.promote(key, priority)
+            parts = self.flights.stream(
+                key, lambda: self._synthesize(text, voice, rate, key, priority)
+            )
+        else:
+            parts = self._synthesize(text, voice, rate, key, priority)
+        try:
+            async for part in parts:
+                yield part
+        finally:
+            await parts.aclose()
+
+    async def _synthesize(
+        self,
+        text: str,
+        voice: str,
+        rate: str,
+        key: str,
+        priority: Priority,
+    ) -> AsyncGenerator[bytes, None]:
+        """One upstream synthesis, holding an upstream slot throughout"""
+        # Only a fully streamed result is cached; if every consumer goes away
+        # the generator is closed at a yield and the partial audio is dropped
+        audio_parts = []
+        boundaries = []
+        started = time.perf_counter()
+        self._in_flight.inc()
+        try:
+            async with self.scheduler.slot(priority, key):
+                async for chunk in self.backend.stream(text, voice, rate):
+                    if chunk["type"] == "audio":
+                        if not audio_parts:
+                            self._ttfb.observe(time.perf_counter() - started)
+                        audio_parts.append(chunk["data"])
+                        yield chunk["data"]
+                    elif chunk["type"] == "WordBoundary":
+                        boundaries.append(chunk)
+        finally:
+            self._in_flight.dec()
+        self._seconds.observe(time.perf_counter() - started)
 
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                yield chunk["data"]
+        if self.cache:
+            audio = b"".join(audio_parts)
+            await self.cache.put(key, audio)
+            if boundaries and audio:
+                # Word -> time -> byte, so cached audio can be played from any word
+                await self.cache.put_words(key, WordIndex.build(boundaries, audio))
 
     async def save_audio(
         self,
@@ -0,0 +1,42 @@
+"""
+Length-prefixed binary frames for sending chunk audio without base64.
+
+Each frame is:
+
+    uint32 header length (big-endian)
+    uint32 payload length (big-endian)
+    header: UTF-8 JSON object
+    payload: raw bytes (MP3 audio, or empty)
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, Iterator, Tuple
+
+MEDIA_TYPE = "application/vnd.tts-frames"
+
+_PREFIX = struct.Struct(">II")
+
+
+def encode_frame(header: Dict[str, Any], payload: bytes = b"") -> bytes:
+    """Encode one frame"""
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return _PREFIX.pack(len(encoded), len(payload)) + encoded + payload
+
+
+def decode_frames(data: bytes) -> Iterator[Tuple[Dict[str, Any], bytes]]:
+    """Decode a complete frame stream into (header, payload) pairs"""
+    offset = 0
+    while offset < len(data):
+        if len(data) - offset < _PREFIX.size:
+            raise ValueError("Truncated frame prefix")
+        header_len, payload_len = _PREFIX.unpack_from(data, offset)
+        offset += _PREFIX.size
+        end = offset + header_len + payload_len
+        if end > len(data):
+            raise ValueError("Truncated frame")
+        header = json.loads(data[offset:offset + header_len])
+        yield header, data[offset + header_len:end]
+        offset = end
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Sequence
+
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.scheduler import Priority
+
+JobState = Literal["queued", "running", "done", "failed"]
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity; the client should retry later"""
+
+
+@dataclass
+class JobStats:
+    """Counters for synthesis jobs since startup"""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0  # turned away by admission control
+    chunk_retries: int = 0  # chunk syntheses retried after an error
+    resumed: int = 0  # unfinished jobs picked up again after a restart
+    chunks_synthesized: int = 0
+
+
+@dataclass
+class Job:
+    """A document being synthesized chunk by chunk to disk"""
+
+    job_id: str
+    chunks: List[str]
+    voice: str
+    speed: float
+    state: JobState = "queued"
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    # Chunk files present on disk; rebuilt from the directory on load
+    ready: List[bool] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.ready:
+            self.ready = [False] * len(self.chunks)
+
+    @property
+    def completed_chunks(self) -> int:
+        return sum(self.ready)
+
+    def progress(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "total_chunks": len(self.chunks),
+            "completed_chunks": self.completed_chunks,
+            "ready_chunks": [i for i, ready in enumerate(self.ready) if ready],
+            "progress": self.completed_chunks / len(self.chunks) if self.chunks else 1.0,
+            "created": self.created,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Background synthesis of long documents.
+
+    submit() records a job under jobs_dir/<job_id>/ (job.json with the chunk
+    texts and state) and queues it; max_workers jobs are synthesized at a
+    time, one chunk after another, each chunk written to <index>.mp3 as soon
+    as it is done, so finished chunks can be fetched while the job runs.
+    Progress is the set of chunk files on disk: after a restart, start()
+    re-queues unfinished jobs and they continue from the first missing
+    chunk. Jobs synthesize at BATCH priority, behind listeners and
+    prefetches. A chunk whose synthesis fails is retried up to
+    chunk_retries times, retry_delay seconds apart and then twice as long
+    each time, before the job fails. At most max_pending jobs may be queued
+    or running; submit() raises QueueFull beyond that. Finished jobs are
+    deleted after ttl_seconds.
+    """
+
+    JOB_FILE = "job.json"
+
+    def __init__(
+        self,
+        service: EdgeTTSService,
+        jobs_dir: str,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        ttl_seconds: float | None = 24 * 3600,
+        chunk_retries: int = 2,
+        retry_delay: float = 1.0,
+    ):
+        self.service = service
+        self.dir = Path(jobs_dir)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.chunk_retries = chunk_retries
+        self.retry_delay = retry_delay
+        self.stats = JobStats()
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue[str]] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Load jobs from disk, re-queue unfinished ones and start the workers"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for job in sorted(self._load_jobs(), key=lambda job: job.created):
+            self._jobs[job.job_id] = job
+            if job.state in ("queued", "running"):
+                job.state = "queued"
+                self.stats.resumed += 1
+                self._queue.put_nowait(job.job_id)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_workers)]
+        self._workers.append(asyncio.create_task(self._expire()))
+
+    async def close(self) -> None:
+        """Stop the workers; running jobs resume on the next start()"""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+        self._jobs.clear()
+
+    @property
+    def pending(self) -> int:
+        return sum(job.state in ("queued", "running") for job in self._jobs.values())
+
+    async def submit(self, chunks: Sequence[str], voice: str, speed: float) -> Job:
+        """Queue a document's chunks for synthesis; raises QueueFull at capacity"""
+        self.start()
+        await self._expire()
+        if self.pending >= self.max_pending:
+            self.stats.rejected += 1
+            raise QueueFull(f"{self.pending} jobs are already pending")
+        job = Job(job_id=uuid.uuid4().hex, chunks=list(chunks), voice=voice, speed=speed)
+        # Counted as pending while its directory is written
+        self._jobs[job.job_id] = job
+        try:
+            await asyncio.to_thread((self.dir / job.job_id).mkdir, parents=True)
+            await self._save(job)
+        except OSError:
+            await self.delete(job.job_id)
+            raise
+        self.stats.submitted += 1
+        self._queue.put_nowait(job.job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def chunk_path(self, job: Job, index: int) -> Optional[Path]:
+        """Path of a finished chunk's audio, or None if it is not ready"""
+        if 0 <= index < len(job.chunks) and job.ready[index]:
+            return self._chunk_file(job.job_id, index)
+        return None
+
+    async def delete(self, job_id: str) -> bool:
+        """Forget a job and its files; a running job stops after its current chunk"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        await asyncio.to_thread(shutil.rmtree, self.dir / job_id, ignore_errors=True)
+        return True
+
+    def snapshot(self) -> dict:
+        states: Dict[str, int] = {}
+        for job in self._jobs.values():
+            states[job.state] = states.get(job.state, 0) + 1
+        return {
+            **asdict(self.stats),
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "jobs": states,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                continue
+            try:
+                await self._run(job)
+            except OSError as e:
+                print(f"Job {job_id} stopped: {e}")
+                # Unless it was deleted while a chunk was being written, e.g.
+                # the disk is full: fail the job so it finishes and expires
+                if self._jobs.get(job_id) is job:
+                    job.error = f"Could not write job files: {e}"
+                    try:
+                        await self._finish(job, "failed")
+                    except OSError as save_error:
+                        print(f"Job {job_id} state not saved: {save_error}")
+
+    async def _run(self, job: Job) -> None:
+        job.state = "running"
+        await self._save(job)
+        for index, text in enumerate(job.chunks):
+            if job.ready[index]:
+                continue
+            try:
+                audio = await self._synthesize(job, index, text)
+            except Exception as e:
+                print(f"Job {job.job_id} chunk {index} failed: {e}")
+                job.error = f"Chunk {index}: {str(e) or type(e).__name__}"
+                await self._finish(job, "failed")
+                return
+            if self._jobs.get(job.job_id) is not job:
+                return  # deleted while synthesizing
+            await asyncio.to_thread(self._write_chunk, job.job_id, index, audio)
+            job.ready[index] = True
+            self.stats.chunks_synthesized += 1
+        await self._finish(job, "done")
+
+    async def _synthesize(self, job: Job, index: int, text: str) -> bytes:
+        """A chunk's audio, retrying transient upstream errors"""
+        delay = self.retry_delay
+        for _ in range(self.chunk_retries):
+            try:
+                return await self.service.generate_audio(
+                    text, job.voice, job.speed, Priority.BATCH
+                )
+            except Exception as e:
+                if self._jobs.get(job.job_id) is not job:
+                    raise  # deleted meanwhile
+                print(f"Job {job.job_id} chunk {index} failed, retrying in {delay:g}s: {e}")
+                self.stats.chunk_retries += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        return await self.service.generate_audio(text, job.voice, job.speed, Priority.BATCH)
+
+    async def _finish(self, job: Job, state: JobState) -> None:
+        job.state = state
+        job.finished = time.time()
+        if state == "done":
+            self.stats.completed += 1
+        else:
+            self.stats.failed += 1
+        if self._jobs.get(job.job_id) is job:
+            await self._save(job)
+
+    async def _expire(self) -> None:
+        if self.ttl_seconds is None:
+            return
+        now = time.time()
+        for job in list(self._jobs.values()):
+            if job.finished is not None and now - job.finished > self.ttl_seconds:
+                await self.delete(job.job_id)
+
+    # Disk layout
+
+    def _chunk_file(self, job_id: str, index: int) -> Path:
+        return self.dir / job_id / f"{index}.mp3"
+
+    def _write_chunk(self, job_id: str, index: int, audio: bytes) -> None:
+        path = self._chunk_file(job_id, index)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+
+    async def _save(self, job: Job) -> None:
+        data = asdict(job)
+        del data["ready"]
+        await asyncio.to_thread(self._write_job, job.job_id, json.dumps(data))
+
+    def _write_job(self, job_id: str, data: str) -> None:
+        path = self.dir / job_id / self.JOB_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(data)
+        os.replace(tmp, path)
+
+    def _load_jobs(self) -> List[Job]:
+        jobs = []
+        for path in self.dir.glob(f"*/{self.JOB_FILE}"):
+            try:
+                job = Job(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Skipping unreadable job {path.parent.name}: {e}")
+                continue
+            job.ready = [self._chunk_file(job.job_id, i).exists() for i in range(len(job.chunks))]
+            jobs.append(job)
+        return jobs
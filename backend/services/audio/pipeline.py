@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from typing import AsyncGenerator, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.scheduler import Priority
+
+_END = object()
+
+
+class _ChunkStream:
+    """Synthesizes one chunk in the background, buffering its audio in order"""
+
+    def __init__(self, audio: AsyncIterator[bytes], key: str):
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump(audio))
+
+    async def _pump(self, audio: AsyncIterator[bytes]) -> None:
+        try:
+            async for data in audio:
+                self.queue.put_nowait(data)
+        except Exception as e:
+            self.queue.put_nowait(e)
+        else:
+            self.queue.put_nowait(_END)
+
+    async def drain(self) -> AsyncGenerator[bytes, None]:
+        while True:
+            item = await self.queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class StreamKeys:
+    """
+    Audio keys of the chunks of recent pipelined streams, by stream id, so
+    a client can seek in or re-fetch audio it streamed. Only the last
+    max_streams streams are kept.
+    """
+
+    def __init__(self, max_streams: int = 256):
+        self.max_streams = max_streams
+        # stream_id -> (audio keys in chunk order, every chunk started)
+        self._streams: OrderedDict[str, Tuple[List[str], List[bool]]] = OrderedDict()
+
+    def open(self) -> Tuple[str, List[str]]:
+        """A new stream id and the list its chunk keys are appended to"""
+        stream_id = uuid.uuid4().hex
+        keys: List[str] = []
+        self._streams[stream_id] = (keys, [False])
+        while len(self._streams) > self.max_streams:
+            self._streams.popitem(last=False)
+        return stream_id, keys
+
+    def finish(self, stream_id: str) -> None:
+        entry = self._streams.get(stream_id)
+        if entry is not None:
+            entry[1][0] = True
+
+    def get(self, stream_id: str) -> Optional[dict]:
+        entry = self._streams.get(stream_id)
+        if entry is None:
+            return None
+        keys, complete = entry
+        return {"stream_id": stream_id, "audio_keys": list(keys), "complete": complete[0]}
+
+
+async def stream_chunks(
+    service: EdgeTTSService,
+    chunks: Iterable[str],
+    voice: str | None = None,
+    speed: float = 1.0,
+    lookahead: int = 2,
+    keys: Optional[List[str]] = None,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream audio for a sequence of text chunks as one continuous response.
+
+    Chunks are pulled from the iterable in a worker thread, so formatting never
+    blocks the event loop. While chunk N is being written to the client, up to
+    `lookahead` following chunks (at least 1) are already synthesizing; once
+    that many are buffered, the pipeline stops pulling new chunks until the
+    client catches up.
+    Audio is always yielded in chunk order. The first chunk synthesizes at
+    INTERACTIVE priority and the lookahead at NEXT, raised to INTERACTIVE
+    when the client reaches it. Each chunk's audio key is appended to keys
+    as its synthesis starts.
+    """
+    iterator: Iterator[str] = iter(chunks)
+    pending: asyncio.Queue[Optional[_ChunkStream]] = asyncio.Queue()
+    # With no slots the first chunk would never start
+    slots = asyncio.Semaphore(max(1, lookahead))
+    started: List[_ChunkStream] = []
+
+    async def produce() -> None:
+        try:
+            while True:
+                # A slot is freed when the consumer starts writing a chunk
+                await slots.acquire()
+                text = await asyncio.to_thread(next, iterator, None)
+                if text is None:
+                    break
+                priority = Priority.NEXT if started else Priority.INTERACTIVE
+                stream = _ChunkStream(
+                    service.stream_audio(text, voice, speed, priority),
+                    service.audio_key(text, voice, speed),
+                )
+                started.append(stream)
+                if keys is not None:
+                    keys.append(stream.key)
+                pending.put_nowait(stream)
+        finally:
+            pending.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            stream = await pending.get()
+            if stream is None:
+                break
+            slots.release()
+            service.scheduler.promote(stream.key, Priority.INTERACTIVE)
+            async for data in stream.drain():
+                yield data
+        # Surface errors from the chunk source (e.g. the formatter)
+        await producer
+    finally:
+        # Client disconnected or a chunk failed: stop all outstanding work
+        producer.cancel()
+        for stream in started:
+            stream.task.cancel()
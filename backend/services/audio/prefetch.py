@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Mapping, Optional
+
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.scheduler import Priority
+
+
+@dataclass
+class PrefetchStats:
+    """Counters for speculative synthesis since startup"""
+
+    scheduled: int = 0
+    hits: int = 0  # prefetched audio used by a follow-up request
+    wasted: int = 0  # synthesized but dropped before anyone asked for it
+    cancelled: int = 0  # dropped before synthesis finished
+    failed: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.scheduled if self.scheduled else 0.0
+
+
+@dataclass
+class _Prefetch:
+    key: str
+    voice: str
+    speed: float
+    task: asyncio.Task
+
+
+class Prefetcher:
+    """
+    Speculatively synthesizes the chunks a client is expected to request next.
+
+    Prefetches are grouped by document. Each schedule() call replaces the
+    document's predictions, so chunks the client skipped past are cancelled;
+    cancel() drops a document's prefetches when it is released or evicted.
+    Prefetch work runs in at most max_concurrency slots, so it can never take
+    more than that share of the service's upstream capacity away from
+    requests a client is waiting on; it also runs at PREFETCH priority, so
+    queued interactive work gets free slots first.
+    """
+
+    def __init__(
+        self,
+        service: EdgeTTSService,
+        max_concurrency: int = 2,
+        max_documents: int = 64,
+    ):
+        self.service = service
+        self.max_documents = max_documents
+        self.stats = PrefetchStats()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # document_id -> chunk index -> prefetch, documents in LRU order
+        self._documents: OrderedDict[str, Dict[int, _Prefetch]] = OrderedDict()
+
+    def schedule(
+        self,
+        document_id: str,
+        chunks: Mapping[int, str],
+        voice: str,
+        speed: float,
+    ) -> None:
+        """Start synthesizing chunks (index -> text) in the background"""
+        previous = self._documents.pop(document_id, {})
+        pending: Dict[int, _Prefetch] = {}
+        for index, item in previous.items():
+            if index in chunks and (item.voice, item.speed) == (voice, speed):
+                pending[index] = item
+            else:
+                self._discard(item)
+
+        for index, text in chunks.items():
+            if index not in pending:
+                task = asyncio.create_task(self._synthesize(text, voice, speed))
+                task.add_done_callback(self._on_done)
+                key = self.service.audio_key(text, voice, speed)
+                pending[index] = _Prefetch(key, voice, speed, task)
+                self.stats.scheduled += 1
+
+        if pending:
+            self._documents[document_id] = pending
+        while len(self._documents) > self.max_documents:
+            self.cancel(next(iter(self._documents)))
+
+    async def take(
+        self,
+        document_id: str,
+        index: int,
+        voice: str,
+        speed: float,
+        priority: Priority = Priority.NEXT,
+    ) -> Optional[bytes]:
+        """
+        Claim prefetched audio for a chunk, waiting if it is still being
+        synthesized; if it is still queued for an upstream slot, it is
+        raised to priority. Returns None if nothing usable was prefetched.
+        """
+        pending = self._documents.get(document_id)
+        item = pending.pop(index, None) if pending else None
+        if item is None:
+            return None
+        if not pending:
+            del self._documents[document_id]
+        if (item.voice, item.speed) != (voice, speed):
+            self._discard(item)
+            return None
+
+        self.service.scheduler.promote(item.key, priority)
+        try:
+            # Shielded so a disconnecting client does not cancel the synthesis;
+            # the audio still lands in the service's cache
+            audio = await asyncio.shield(item.task)
+        except asyncio.CancelledError:
+            if not item.task.cancelled():
+                raise
+            return None
+        except Exception:
+            return None
+        self.stats.hits += 1
+        return audio
+
+    def cancel(self, document_id: str) -> None:
+        """Drop every prefetch for a document"""
+        for item in self._documents.pop(document_id, {}).values():
+            self._discard(item)
+
+    def close(self) -> None:
+        for document_id in list(self._documents):
+            self.cancel(document_id)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            **asdict(self.stats),
+            "hit_ratio": self.stats.hit_ratio,
+            "documents": len(self._documents),
+            "pending": sum(
+                not item.task.done()
+                for pending in self._documents.values()
+                for item in pending.values()
+            ),
+        }
+
+    async def _synthesize(self, text: str, voice: str, speed: float) -> bytes:
+        async with self._slots:
+            return await self.service.generate_audio(text, voice, speed, Priority.PREFETCH)
+
+    def _discard(self, item: _Prefetch) -> None:
+        if item.task.done():
+            if not item.task.cancelled() and item.task.exception() is None:
+                self.stats.wasted += 1
+        else:
+            item.task.cancel()
+            self.stats.cancelled += 1
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        # Retrieve the exception so failed prefetches are not logged as
+        # "never retrieved"; the follow-up request synthesizes the chunk itself
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.failed += 1
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from services.metrics import SYNTHESIS_QUEUE_SECONDS
+
+
+class Priority(IntEnum):
+    """Synthesis priority classes, most urgent first"""
+
+    INTERACTIVE = 0  # the chunk a listener is waiting on right now
+    NEXT = 1  # later chunks of a request being played
+    PREFETCH = 2  # chunks a listener is expected to ask for
+    BATCH = 3  # background jobs
+
+
+@dataclass
+class ClassStats:
+    """Upstream slot grants and queue wait for one priority class"""
+
+    granted: int = 0
+    promoted: int = 0  # raised to this class while queued
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.wait_seconds / self.granted if self.granted else 0.0
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "key", "enqueued", "rank")
+
+    def __init__(self, future: asyncio.Future, priority: Priority, key: Optional[str]):
+        self.future = future
+        self.priority = priority
+        self.key = key
+        self.enqueued = time.monotonic()
+        self.rank = 0.0
+
+
+class SynthesisScheduler:
+    """
+    Global cap on upstream synthesis calls, granting slots by priority.
+
+    When every slot is busy, callers queue and each freed slot goes to the
+    waiter with the lowest rank: its arrival time plus aging_seconds per
+    priority class below INTERACTIVE. A waiter therefore moves up one class
+    for every aging_seconds it waits, so a steady stream of interactive work
+    delays batch work by at most 3 x aging_seconds, and never starves it.
+    promote() raises the class of queued work (e.g. a prefetch a listener
+    now waits on). Queue wait is reported per class in snapshot() and as
+    tts_synthesis_queue_seconds.
+    """
+
+    def __init__(self, max_concurrency: int = 8, aging_seconds: float = 2.0):
+        self.max_concurrency = max_concurrency
+        self.aging_seconds = aging_seconds
+        self.stats: Dict[Priority, ClassStats] = {p: ClassStats() for p in Priority}
+        self._active = 0
+        # (rank, sequence, waiter); entries left behind by promote() or
+        # cancellation are skipped when popped
+        self._heap: List[Tuple[float, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._wait = {p: SYNTHESIS_QUEUE_SECONDS.labels(p.name.lower()) for p in Priority}
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, key: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold one upstream slot; key lets promote() find the waiter"""
+        await self._acquire(priority, key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def promote(self, key: str, priority: Priority) -> bool:
+        """Raise queued work for key to priority; False if none was queued below it"""
+        promoted = False
+        for _, _, waiter in list(self._heap):
+            if waiter.key == key and waiter.priority > priority and not waiter.future.done():
+                waiter.priority = priority
+                waiter.rank = waiter.enqueued + priority * self.aging_seconds
+                heapq.heappush(self._heap, (waiter.rank, next(self._sequence), waiter))
+                self.stats[priority].promoted += 1
+                promoted = True
+        return promoted
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def waiting(self) -> Dict[Priority, int]:
+        counts = {p: 0 for p in Priority}
+        for rank, _, waiter in self._heap:
+            if rank == waiter.rank and not waiter.future.done():
+                counts[waiter.priority] += 1
+        return counts
+
+    def snapshot(self) -> dict:
+        waiting = self.waiting()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "aging_seconds": self.aging_seconds,
+            "classes": {
+                p.name.lower(): {
+                    **asdict(self.stats[p]),
+                    "mean_wait_seconds": self.stats[p].mean_wait_seconds,
+                    "waiting": waiting[p],
+                }
+                for p in Priority
+            },
+        }
+
+    async def _acquire(self, priority: Priority, key: Optional[str]) -> None:
+        if self._active < self.max_concurrency and not self._has_waiters():
+            self._active += 1
+            self._record(priority, 0.0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(future, priority, key)
+        waiter.rank = waiter.enqueued + priority * self.aging_seconds
+        heapq.heappush(self._heap, (waiter.rank, next(self._sequence), waiter))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Cancelled just after being handed a slot: pass it on
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        self._record(waiter.priority, time.monotonic() - waiter.enqueued)
+
+    def _has_waiters(self) -> bool:
+        self._drop_stale()
+        return bool(self._heap)
+
+    def _release(self) -> None:
+        self._drop_stale()
+        if self._heap:
+            # Hand the slot straight to the next waiter; _active is unchanged
+            _, _, waiter = heapq.heappop(self._heap)
+            waiter.future.set_result(None)
+        else:
+            self._active -= 1
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            rank, _, waiter = self._heap[0]
+            if rank == waiter.rank and not waiter.future.done():
+                return
+            heapq.heappop(self._heap)
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        stats = self.stats[priority]
+        stats.granted += 1
+        stats.wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        self._wait[priority].observe(waited)
@@ -0,0 +1,171 @@
+"""
+Word offset index for synthesized audio: word -> time -> byte.
+
+Built from the WordBoundary events a synthesis emits, and the MP3 frames of
+its audio. Each word's byte offset is the start of the frame that contains
+the word's start time, so playback can begin there with no re-synthesis
+(e.g. GET /v1/tts/audio/{key} with "Range: bytes=<offset>-").
+
+Serialized form, all integers little-endian:
+
+    b"WIX1", uint32 word count n, uint32 total audio bytes,
+    uint32 total duration (ms),
+    n x uint32 start (ms), n x uint32 duration (ms), n x uint32 byte offset,
+    the words in UTF-8, each followed by a NUL
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"WIX1"
+_HEADER = struct.Struct("<4sIII")
+# WordBoundary offsets and durations are in 100 ns ticks
+TICKS_PER_MS = 10_000
+
+# MPEG audio Layer III header tables, indexed by the header's version bits
+# (3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5)
+_BITRATES_KBPS = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_BITRATES_KBPS[0] = _BITRATES_KBPS[2]
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _frame_at(data: bytes, offset: int) -> Optional[Tuple[int, float]]:
+    """(length in bytes, duration in seconds) of the Layer III frame at offset"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 3
+    layer = (data[offset + 1] >> 1) & 3
+    bitrate_index = data[offset + 2] >> 4
+    rate_index = (data[offset + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES_KBPS[version][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (data[offset + 2] >> 1) & 1
+    samples = 1152 if version == 3 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples / sample_rate
+
+
+def frame_table(data: bytes) -> Tuple[array, array, float]:
+    """
+    Byte offsets and start times (ms) of the MP3 frames in data, from the
+    start of the audio up to the first byte that is not a frame header,
+    and the duration of those frames in ms
+    """
+    offsets, times = array("I"), array("d")
+    position, elapsed = 0, 0.0
+    while True:
+        frame = _frame_at(data, position)
+        if frame is None:
+            break
+        length, seconds = frame
+        offsets.append(position)
+        times.append(elapsed * 1000)
+        position += length
+        elapsed += seconds
+    return offsets, times, elapsed * 1000
+
+
+class WordIndex:
+    """Compact start time, duration and byte offset of every spoken word"""
+
+    def __init__(
+        self,
+        words: Sequence[str],
+        start_ms: array,
+        duration_ms: array,
+        byte_offsets: array,
+        total_bytes: int,
+        total_ms: int,
+    ):
+        self.words = list(words)
+        self.start_ms = start_ms
+        self.duration_ms = duration_ms
+        self.byte_offsets = byte_offsets
+        self.total_bytes = total_bytes
+        self.total_ms = total_ms
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @classmethod
+    def build(cls, boundaries: Sequence[Dict[str, Any]], audio: bytes) -> "WordIndex":
+        """Index WordBoundary events against the frames of the audio"""
+        offsets, times, frames_ms = frame_table(audio)
+        # Without parsable frames, the end of the last word stands in for
+        # the audio's duration
+        last = boundaries[-1] if boundaries else None
+        total_ms = int(frames_ms) if offsets else (
+            (last["offset"] + last["duration"]) // TICKS_PER_MS if last else 0
+        )
+        start_ms, duration_ms, byte_offsets = array("I"), array("I"), array("I")
+        words: List[str] = []
+        for event in boundaries:
+            start = event["offset"] // TICKS_PER_MS
+            words.append(event["text"])
+            start_ms.append(start)
+            duration_ms.append(event["duration"] // TICKS_PER_MS)
+            if offsets:
+                frame = max(bisect_right(times, start) - 1, 0)
+                byte_offsets.append(offsets[frame])
+            else:
+                # Not MP3 frames we can parse: assume a constant bitrate
+                byte_offsets.append(
+                    min(len(audio), int(len(audio) * start / total_ms)) if total_ms else 0
+                )
+        return cls(words, start_ms, duration_ms, byte_offsets, len(audio), total_ms)
+
+    def locate(self, position_ms: float) -> int:
+        """Index of the word being spoken at position_ms (0 before the first)"""
+        return max(bisect_right(self.start_ms, position_ms) - 1, 0)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(MAGIC, len(self.words), self.total_bytes, self.total_ms)]
+        for values in (self.start_ms, self.duration_ms, self.byte_offsets):
+            packed = array("I", values)
+            if sys.byteorder == "big":
+                packed.byteswap()
+            parts.append(packed.tobytes())
+        parts.append("".join(word + "\0" for word in self.words).encode("utf-8"))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordIndex":
+        magic, count, total_bytes, total_ms = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a word index")
+        position = _HEADER.size
+        columns = []
+        for _ in range(3):
+            values = array("I")
+            values.frombytes(data[position:position + 4 * count])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns.append(values)
+            position += 4 * count
+        words = data[position:].decode("utf-8").split("\0")[:count]
+        return cls(words, *columns, total_bytes=total_bytes, total_ms=total_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total_bytes": self.total_bytes,
+            "duration_ms": self.total_ms,
+            "words": [
+                {
+                    "index": i,
+                    "text": word,
+                    "start_ms": self.start_ms[i],
+                    "duration_ms": self.duration_ms[i],
+                    "byte": self.byte_offsets[i],
+                }
+                for i, word in enumerate(self.words)
+            ],
+        }
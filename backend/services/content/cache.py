@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key for a URL: lower-case scheme and host, no default port, no
+    fragment, no tracking parameters, remaining query parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass
+class ExtractedArticle:
+    """Cleaned extraction result plus the validators to revalidate it"""
+
+    title: str
+    content: str
+    word_count: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored: float = field(default_factory=time.monotonic)  # created or last refetched
+    validated: float = field(default_factory=time.monotonic)  # last confirmed current
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.title.encode("utf-8")) + len(self.content.encode("utf-8"))
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+@dataclass
+class ExtractionCacheStats:
+    """Counters for extraction cache activity since startup"""
+
+    hits: int = 0  # fresh entries served without a request
+    revalidated: int = 0  # stale entries confirmed by a 304
+    refetched: int = 0  # stale entries replaced after the page changed
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered without re-extracting the page"""
+        served = self.hits + self.revalidated
+        total = served + self.refetched + self.misses
+        return served / total if total else 0.0
+
+
+class ExtractionCache:
+    """
+    In-memory cache of extracted articles keyed by normalized URL.
+
+    An entry is fresh for fresh_seconds after it was last validated; after
+    that the caller revalidates it with a conditional GET and, on 304, marks it
+    validated again without re-extracting. Entries are dropped ttl_seconds
+    after they were stored, whether or not they were revalidated, and least
+    recently used entries are evicted to keep the total under memory_bytes.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = 32 * 1024 * 1024,
+        fresh_seconds: float = 600,
+        ttl_seconds: float = 24 * 3600,
+    ):
+        self.memory_bytes = memory_bytes
+        self.fresh_seconds = fresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self.stats = ExtractionCacheStats()
+        self._entries: OrderedDict[str, ExtractedArticle] = OrderedDict()
+        self._used = 0
+
+    def get(self, url: str) -> Optional[ExtractedArticle]:
+        """Entry for a URL, fresh or stale; None if absent or expired"""
+        key = normalize_url(url)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored > self.ttl_seconds:
+            self._remove(key)
+            self.stats.expired += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: ExtractedArticle) -> bool:
+        return time.monotonic() - entry.validated <= self.fresh_seconds
+
+    def mark_validated(self, entry: ExtractedArticle) -> None:
+        entry.validated = time.monotonic()
+
+    def put(self, url: str, entry: ExtractedArticle) -> None:
+        key = normalize_url(url)
+        if key in self._entries:
+            self._remove(key)
+        size = entry.size_bytes
+        if size > self.memory_bytes:
+            return
+        self._entries[key] = entry
+        self._used += size
+        while self._used > self.memory_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            **asdict(self.stats),
+            "hit_ratio": self.stats.hit_ratio,
+            "entries": len(self._entries),
+            "memory_bytes": self._used,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._used -= entry.size_bytes
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import re
-from trafilatura import extract
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from services.processing.profiling import PassProfile
 
 
 class ContentCleaner:
@@ -35,45 +38,169 @@ class ContentCleaner:
         r"join\s+(our|the)\s+(newsletter|mailing\s+list)",
     ]
 
-    def clean(self, text: str, source_url: str | None = None) -> str:
-        """Main cleaning pipeline"""
+    # Cleaning passes after HTML extraction, in the order clean applies them
+    PASSES = (
+        "_remove_promo_content",  # Remove promotional patterns
+        "_normalize_text",  # Clean up formatting
+        "_format_for_tts",  # Format for TTS
+    )
+
+    def clean(
+        self,
+        text: str,
+        source_url: str | None = None,
+        profile: Optional[PassProfile] = None,
+    ) -> str:
+        """
+        Main cleaning pipeline. With a profile, the time and size change of
+        each pass are recorded in it.
+        """
         if not text:
             return ""
 
         # If HTML, extract text first
         if "<" in text and ">" in text:
-            extracted = extract(
-                text,
-                include_comments=False,
-                include_tables=False,
-                include_images=False,
-                url=source_url,
-            )
-            text = extracted or text
+            def extract_html(html: str) -> str:
+                # Imported on first use; trafilatura is slow to import
+                from trafilatura import extract
 
-        # Remove promotional patterns
-        text = self._remove_promo_content(text)
+                extracted = extract(
+                    html,
+                    include_comments=False,
+                    include_tables=False,
+                    include_images=False,
+                    url=source_url,
+                )
+                return extracted or html
 
-        # Clean up formatting
-        text = self._normalize_text(text)
+            if profile is not None:
+                text = profile.run("_extract_html", extract_html, text)
+            else:
+                text = extract_html(text)
 
-        # Format for TTS
-        text = self._format_for_tts(text)
+        if profile is None:
+            for name in self.PASSES:
+                text = getattr(self, name)(text)
+        else:
+            for name in self.PASSES:
+                text = profile.run(name, getattr(self, name), text)
 
         return text
 
     def _remove_promo_content(self, text: str) -> str:
         """Remove promotional and boilerplate content"""
-        for pattern in self.REMOVE_PATTERNS:
-            # Remove sentences containing promotional patterns
-            text = re.sub(
-                rf"[^.!?\n]*{pattern}[^.!?\n]*[.!?]?\s*",
-                "",
-                text,
-                flags=re.IGNORECASE,
-            )
+        # Remove sentences containing promotional patterns, with one scan of
+        # all patterns merged into a single matcher
+        spans, joins_lines = self._promo_spans(text)
+        if not spans:
+            return text
+        cleaned = self._splice(text, spans)
+        if not joins_lines and not _PROMO.search(cleaned):
+            return cleaned
+
+        # A match ran past a newline (\s in a pattern), or removing a sentence
+        # brings two lines together, which can form a new match for a later
+        # pattern even if that is removed again afterwards. The result then
+        # depends on pattern order, so apply the patterns one at a time
+        for pattern, head in zip(_PROMO_PATTERNS, _PROMO_HEADS):
+            text = self._remove_sentences(text, pattern, head)
         return text
 
+    @staticmethod
+    def _remove_sentences(text: str, pattern: re.Pattern, head: re.Pattern) -> str:
+        """
+        text with every sentence containing pattern removed, exactly as the
+        original re.sub over the pattern with its sentence around it did, but
+        without retrying the sentence at every position where no match
+        follows (quadratic in long sentences). Each removal starts at its sentence's
+        start, or where the previous removal ended, and runs from the last
+        match starting in that sentence through the end of the sentence.
+        """
+        kept = []
+        position = 0
+        boundaries = None
+        while True:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            if boundaries is None:
+                boundaries = [m.start() for m in _SENTENCE_BOUNDARY.finditer(text)]
+            i = bisect_left(boundaries, match.start())
+            start = max(position, boundaries[i - 1] + 1 if i else 0)
+            # head is [^.!?\n]*{pattern}: like re.sub, it takes the last match
+            # in the sentence, which may run on past a newline
+            end = _SENTENCE_TAIL.match(text, head.match(text, start).end()).end()
+            kept.append(text[position:start])
+            position = end
+        kept.append(text[position:])
+        return "".join(kept)
+
+    def _promo_spans(self, text: str) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        (start, end) of every sentence containing a match: from the sentence
+        start (after ., !, ?, a newline or the start of the text) through its
+        closing punctuation and the whitespace after it. Linear in the text
+        length: sentence starts are found once and looked up by bisection.
+        Also reports whether removing them can join lines: a match spans a
+        newline, or a sentence starting a line is followed by more text.
+        """
+        spans: List[Tuple[int, int]] = []
+        joins_lines = False
+        boundaries = None
+        for match in _PROMO.finditer(text):
+            if boundaries is None:
+                boundaries = [m.start() for m in _SENTENCE_BOUNDARY.finditer(text)]
+            i = bisect_left(boundaries, match.start())
+            start = boundaries[i - 1] + 1 if i else 0
+
+            # finditer skips matches starting inside this one; with the merged
+            # matcher, one of those may run past a newline. Only possible when
+            # this sentence ends at a newline a few words after the match
+            found = [match]
+            if (
+                i < len(boundaries)
+                and text[boundaries[i]] == "\n"
+                and _NEAR_NEWLINE.match(text, match.end(), boundaries[i] + 1)
+            ):
+                # Patterns start with a word, so only non-space positions
+                for char in _NON_SPACE.finditer(text, match.start() + 1, match.end()):
+                    for pattern in _PROMO_PATTERNS:
+                        other = pattern.match(text, char.start())
+                        if other and other.end() > match.end():
+                            found.append(other)
+            for m in found:
+                joins_lines = joins_lines or "\n" in m.group()
+            if spans and match.start() < spans[-1][1]:
+                # Starts inside the previous removal, where the pattern-by-
+                # pattern removal never looks. Also keeps long sentences from
+                # being scanned to their end once per match. A match running
+                # on past the removal crosses a newline, so the patterns are
+                # then applied one at a time anyway
+                continue
+            last = max(m.end() for m in found)
+            end = _SENTENCE_TAIL.match(text, last).end()
+            if start and text[start - 1] == "\n" and end < len(text):
+                joins_lines = True
+
+            if spans and start <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(end, spans[-1][1]))
+            else:
+                spans.append((start, end))
+        return spans, joins_lines
+
+    @staticmethod
+    def _splice(text: str, spans: List[Tuple[int, int]]) -> str:
+        """text without the given sorted, non-overlapping spans"""
+        if not spans:
+            return text
+        kept = []
+        position = 0
+        for start, end in spans:
+            kept.append(text[position:start])
+            position = end
+        kept.append(text[position:])
+        return "".join(kept)
+
     def _normalize_text(self, text: str) -> str:
         """Normalize whitespace and formatting"""
         # Collapse multiple newlines
@@ -114,7 +241,9 @@ class ContentCleaner:
         text = re.sub(r"https?://\S+", "[link]", text)
 
         # Handle email addresses
-        text = re.sub(r"\S+@\S+\.\S+", "[email]", text)
+        # (only tried where a run of non-space starts, so it cannot backtrack
+        # through long runs with no @)
+        text = re.sub(r"(?<!\S)\S+@\S+\.\S+", "[email]", text)
 
         # Format currency
         text = re.sub(r"\$(\d+(?:,\d{3})*(?:\.\d{2})?)", r"\1 dollars", text)
@@ -141,3 +270,23 @@ class ContentCleaner:
         text = re.sub(r"\.{4,}", "...", text)
 
         return text
+
+
+_PROMO_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in ContentCleaner.REMOVE_PATTERNS]
+# Each pattern with the start of its sentence in front of it
+_PROMO_HEADS = [
+    re.compile(rf"[^.!?\n]*(?:{pattern})", re.IGNORECASE) for pattern in ContentCleaner.REMOVE_PATTERNS
+]
+# All REMOVE_PATTERNS as one alternation, in list order
+_PROMO = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in ContentCleaner.REMOVE_PATTERNS),
+    re.IGNORECASE,
+)
+_SENTENCE_BOUNDARY = re.compile(r"[.!?\n]")
+_NON_SPACE = re.compile(r"\S")
+# At most a few words, then a newline: how far past the end of one match
+# another overlapping match can reach before crossing a line
+_NEAR_NEWLINE = re.compile(r"\S{0,40}(?:[^\S\n]+\S{1,40}){0,6}[^\S\n]*\n")
+# Rest of a sentence after a match: up to and including its punctuation,
+# plus the whitespace before the next one
+_SENTENCE_TAIL = re.compile(r"[^.!?\n]*[.!?]?\s*")
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-import httpx
-from trafilatura import extract, fetch_url
-from trafilatura.settings import use_config
-from bs4 import BeautifulSoup
-from typing import TypedDict
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from services.content.cleaner import ContentCleaner
+from services.content.fetcher import PageFetcher
+from services.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
+httpx = lazy_import("httpx")
 
 
 class ExtractedContent(TypedDict):
@@ -13,29 +20,63 @@ class ExtractedContent(TypedDict):
     site_name: str | None
 
 
+class TimedContent(ExtractedContent, total=False):
+    """extract_article result: content plus the time each step took"""
+
+    extract_seconds: float
+    clean_seconds: float
+
+
+@dataclass
+class ParseStats:
+    """HTML parses done by one extractor (one per document)"""
+
+    parses: int = 0
+    parse_seconds: float = 0.0
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_UNWANTED = "|".join(
+    f"//{tag}" for tag in ("script", "style", "nav", "header", "footer", "aside", "form", "iframe")
+)
+# Main content candidates, in order of preference
+_MAIN_CONTENT = (
+    "(//main)[1]",
+    "(//article)[1]",
+    f"(//div[{_has_class('content')}])[1]",
+    f"(//div[{_has_class('post')}])[1]",
+    "(//div[@id='content'])[1]",
+)
+
+
 class ContentExtractor:
     """Extract readable content from web pages"""
 
-    def __init__(self):
-        # Configure trafilatura for better extraction
-        self.config = use_config()
-        self.config.set("DEFAULT", "EXTRACTION_TIMEOUT", "30")
+    def __init__(self, fetcher: PageFetcher | None = None):
+        self.fetcher = fetcher or PageFetcher()
+        self.stats = ParseStats()
+        self._config: Any = None
+
+    @property
+    def config(self) -> Any:
+        """trafilatura settings, created on first extraction"""
+        if self._config is None:
+            # trafilatura (and lxml) load here rather than at import time
+            from trafilatura.settings import use_config
+
+            # Configure trafilatura for better extraction
+            self._config = use_config()
+            self._config.set("DEFAULT", "EXTRACTION_TIMEOUT", "30")
+        return self._config
 
     async def extract_from_url(self, url: str) -> ExtractedContent | None:
         """Fetch and extract content from a URL"""
         try:
-            # Fetch the page
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                follow_redirects=True,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                },
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                html = response.text
+            # Fetch the page over the shared connection pool
+            html = await self.fetcher.fetch(url)
 
             return self.extract_from_html(html, url)
 
@@ -48,10 +89,18 @@ class ContentExtractor:
 
     def extract_from_html(self, html: str, url: str | None = None) -> ExtractedContent | None:
         """Extract content from HTML string"""
+        from trafilatura import extract
+
         try:
-            # Try trafilatura first (best for articles)
+            # Parse once with lxml; trafilatura, the title and site name
+            # lookups and the fallback all read the same tree
+            tree = self._parse(html)
+            if tree is None:
+                return None
+
+            # Try trafilatura first (best for articles); it works on a copy
             content = extract(
-                html,
+                tree,
                 include_comments=False,
                 include_tables=False,
                 include_images=False,
@@ -62,8 +111,8 @@ class ContentExtractor:
             )
 
             # Get title from HTML
-            title = self._extract_title(html)
-            site_name = self._extract_site_name(html)
+            title = self._extract_title(tree)
+            site_name = self._extract_site_name(tree)
 
             if content and len(content.strip()) > 100:
                 return ExtractedContent(
@@ -72,8 +121,8 @@ class ContentExtractor:
                     site_name=site_name,
                 )
 
-            # Fallback to BeautifulSoup
-            fallback_content = self._fallback_extract(html)
+            # Fallback to the parsed tree's main content
+            fallback_content = self._fallback_extract(tree)
             if fallback_content:
                 return ExtractedContent(
                     title=title,
@@ -87,61 +136,64 @@ class ContentExtractor:
             print(f"Error extracting content: {e}")
             return None
 
-    def _extract_title(self, html: str) -> str:
-        """Extract page title from HTML"""
-        soup = BeautifulSoup(html, "html.parser")
-
+    def _parse(self, html: str) -> HtmlElement | None:
+        """Parse a document, recording the parse count and time"""
+        from trafilatura.utils import load_html
+
+        started = time.perf_counter()
+        tree = load_html(html)
+        self.stats.parses += 1
+        self.stats.parse_seconds += time.perf_counter() - started
+        return tree
+
+    def snapshot(self) -> dict:
+        parses = self.stats.parses
+        return {
+            **asdict(self.stats),
+            "parse_ms_per_document": self.stats.parse_seconds / parses * 1000 if parses else 0.0,
+        }
+
+    def _extract_title(self, tree: HtmlElement) -> str:
+        """Extract page title from a parsed document"""
         # Try og:title first
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            return og_title["content"]
+        og_title = tree.xpath('//meta[@property="og:title"]/@content')
+        if og_title and og_title[0]:
+            return og_title[0]
 
         # Try regular title tag
-        title_tag = soup.find("title")
-        if title_tag and title_tag.string:
-            return title_tag.string.strip()
+        title_tag = tree.find(".//title")
+        if title_tag is not None and title_tag.text:
+            return title_tag.text.strip()
 
         # Try h1
-        h1 = soup.find("h1")
-        if h1:
-            return h1.get_text().strip()
+        h1 = tree.find(".//h1")
+        if h1 is not None:
+            return h1.text_content().strip()
 
         return "Untitled"
 
-    def _extract_site_name(self, html: str) -> str | None:
-        """Extract site name from HTML"""
-        soup = BeautifulSoup(html, "html.parser")
-
-        og_site = soup.find("meta", property="og:site_name")
-        if og_site and og_site.get("content"):
-            return og_site["content"]
+    def _extract_site_name(self, tree: HtmlElement) -> str | None:
+        """Extract site name from a parsed document"""
+        og_site = tree.xpath('//meta[@property="og:site_name"]/@content')
+        if og_site and og_site[0]:
+            return og_site[0]
 
         return None
 
-    def _fallback_extract(self, html: str) -> str | None:
-        """Fallback extraction using BeautifulSoup"""
-        soup = BeautifulSoup(html, "html.parser")
-
+    def _fallback_extract(self, tree: HtmlElement) -> str | None:
+        """Fallback extraction from the parsed document (modifies the tree)"""
         # Remove unwanted elements
-        for tag in soup.find_all(
-            ["script", "style", "nav", "header", "footer", "aside", "form", "iframe"]
-        ):
-            tag.decompose()
+        for tag in tree.xpath(_UNWANTED):
+            tag.drop_tree()
 
         # Try to find main content
-        main = (
-            soup.find("main")
-            or soup.find("article")
-            or soup.find("div", class_="content")
-            or soup.find("div", class_="post")
-            or soup.find("div", id="content")
-        )
-
-        if main:
-            text = main.get_text(separator="\n")
+        main = next((found[0] for xpath in _MAIN_CONTENT if (found := tree.xpath(xpath))), None)
+
+        if main is not None:
+            text = "\n".join(main.itertext())
         else:
-            body = soup.find("body")
-            text = body.get_text(separator="\n") if body else ""
+            body = tree.find(".//body")
+            text = "\n".join(body.itertext()) if body is not None else ""
 
         # Clean up whitespace
         lines = [line.strip() for line in text.split("\n") if line.strip()]
@@ -151,3 +203,27 @@ class ContentExtractor:
             return content
 
         return None
+
+
+_extractor: ContentExtractor | None = None
+_cleaner: ContentCleaner | None = None
+
+
+def extract_article(html: str, url: str | None = None) -> TimedContent | None:
+    """
+    Extract and clean a page in one call, timing each step. Module-level so
+    it can be sent to a worker process, which keeps its own extractor and
+    cleaner.
+    """
+    global _extractor, _cleaner
+    if _extractor is None:
+        _extractor = ContentExtractor()
+        _cleaner = ContentCleaner()
+    started = time.perf_counter()
+    result = _extractor.extract_from_html(html, url)
+    extracted = time.perf_counter()
+    if result:
+        result["content"] = _cleaner.clean(result["content"])
+        result["extract_seconds"] = extracted - started
+        result["clean_seconds"] = time.perf_counter() - extracted
+    return result
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+from services.lazy import lazy_import
+from services.metrics import FETCH_SECONDS
+
+# Loaded when the client is created, by start() or the first fetch
+httpx = lazy_import("httpx")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+_fetch_seconds = FETCH_SECONDS.labels()
+
+
+@dataclass
+class FetchStats:
+    """Counters for page fetches since startup"""
+
+    requests: int = 0
+    failures: int = 0
+    new_connections: int = 0  # requests that opened a TCP connection
+    reused_connections: int = 0  # requests served on a pooled keep-alive connection
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else 0.0
+
+
+@dataclass
+class Page:
+    """A fetched page; not_modified means a conditional GET got 304"""
+
+    text: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class _HostSlots:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class PageFetcher:
+    """
+    Long-lived pooled HTTP client for fetching web pages.
+
+    Connections are kept alive and reused across requests. max_per_host caps
+    concurrent requests to any one host, on top of the pool-wide limits, so a
+    burst of links to the same site cannot take every connection. HTTP/2 is
+    used when enabled and the h2 package is installed.
+
+    The client is created on first use or by start(); close() must be awaited
+    on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_per_host: int = 6,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = False,
+        latency_samples: int = 1024,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            print("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        self.stats = FetchStats()
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self._hosts: Dict[str, _HostSlots] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self.http2,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def fetch(self, url: str) -> str:
+        """GET a page and return its text; raises httpx.HTTPError on failure"""
+        return (await self.fetch_page(url)).text
+
+    async def fetch_page(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> Page:
+        """
+        GET a page, conditionally if validators from an earlier response are
+        given; raises httpx.HTTPError on failure
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        self.start()
+        host = urlsplit(url).netloc.lower()
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _HostSlots(self.max_per_host)
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                response = await self._get(url, headers)
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                del self._hosts[host]
+        if response.status_code == 304:
+            return Page(etag=etag, last_modified=last_modified, not_modified=True)
+        return Page(
+            text=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    async def _get(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        connected = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal connected
+            if event == "connection.connect_tcp.complete":
+                connected = True
+
+        self.stats.requests += 1
+        started = time.perf_counter()
+        try:
+            response = await self._client.get(url, headers=headers, extensions={"trace": trace})
+        except Exception:
+            self.stats.failures += 1
+            if connected:
+                self.stats.new_connections += 1
+            raise
+        if connected:
+            self.stats.new_connections += 1
+        else:
+            self.stats.reused_connections += 1
+        elapsed = time.perf_counter() - started
+        self._latencies.append(elapsed)
+        _fetch_seconds.observe(elapsed)
+        if response.is_error:
+            self.stats.failures += 1
+            response.raise_for_status()
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        return {
+            **asdict(self.stats),
+            "reuse_ratio": self.stats.reuse_ratio,
+            "http2": self.http2,
+            "active_hosts": len(self._hosts),
+            "latency_p50_ms": percentile(50),
+            "latency_p95_ms": percentile(95),
+            "latency_p99_ms": percentile(99),
+        }
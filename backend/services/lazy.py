@@ -0,0 +1,39 @@
+"""
+Deferred imports for heavy dependencies, so importing the API stays fast.
+
+lazy_import() returns a module that is only executed on its first attribute
+access. importlib's lazy loader is not thread-safe before Python 3.12, so it
+is used for modules touched from the event loop thread only (edge_tts,
+httpx); code that runs in worker threads or processes (trafilatura, lxml)
+imports inside the functions that need them instead.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Module name, loaded when it is first used rather than now"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def preload(*names: str) -> None:
+    """Import modules now, including ones deferred by lazy_import"""
+    for name in names:
+        # The first attribute access runs a lazily loaded module
+        getattr(importlib.import_module(name), "__doc__", None)
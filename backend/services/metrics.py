@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a cached lookup up to a long synthesis
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))  # 1 KB to 256 MB
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str) -> Any:
+        """
+        The series for these label values. Bind it once, at import or set-up
+        time, and keep the result: updating it is then a plain attribute
+        update, with no label lookup on the hot path.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._child()
+        return child
+
+    @abstractmethod
+    def _child(self) -> Any:
+        """A new series, with a value attribute for the default rendering"""
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} needs labels {self.labelnames}")
+        return self.labels()
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in self._children.items():
+            self._render_child(lines, _label_text(self.labelnames, values), child)
+
+    def _render_child(self, lines: List[str], labels: str, child: Any) -> None:
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{self.name}{suffix} {_number(child.value)}")
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonic total, e.g. requests served"""
+
+    kind = "counter"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. requests in flight"""
+
+    kind = "gauge"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # counts[i] observations in (bounds[i - 1], bounds[i]]; the last
+        # slot is the +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = TIME_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def _render_child(self, lines: List[str], labels: str, child: _Buckets) -> None:
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{{prefix}le="{_number(bound)}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{self.name}_sum{suffix} {_number(child.sum)}")
+        lines.append(f"{self.name}_count{suffix} {child.count}")
+
+
+class _Reading:
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], float]):
+        self.fn = fn
+
+    @property
+    def value(self) -> float:
+        return float(self.fn())
+
+
+class _Callback(_Metric):
+    """Gauge read from fn() at scrape time, for values kept elsewhere"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+        self.labels()
+
+    def _child(self) -> _Reading:
+        return _Reading(self.fn)
+
+
+class Registry:
+    """A set of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = TIME_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help: str, fn: Callable[[], float]) -> None:
+        """Register a gauge whose value is fn() at scrape time; replaces any earlier one"""
+        self._metrics.pop(name, None)
+        self._add(_Callback(name, help, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+def timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """
+    (fn(*args), seconds it took). Module-level so it can wrap a task sent to
+    a worker process, timing only the work and not the queue or the pickling.
+    """
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+# Pipeline metrics for the whole process, served at /metrics
+registry = Registry()
+
+FETCH_SECONDS = registry.histogram("tts_fetch_seconds", "Page fetch time per successful request")
+EXTRACT_SECONDS = registry.histogram("tts_extract_seconds", "Article extraction time per page")
+CLEAN_SECONDS = registry.histogram("tts_clean_seconds", "Text cleaning time per document")
+FORMAT_SECONDS = registry.histogram(
+    "tts_format_seconds", "Prosody formatting and chunking time per document"
+)
+CHUNKS = registry.histogram(
+    "tts_document_chunks", "Synthesis chunks per registered document", buckets=COUNT_BUCKETS
+)
+SYNTHESIS_TTFB_SECONDS = registry.histogram(
+    "tts_synthesis_ttfb_seconds",
+    "Upstream synthesis time to first audio byte, including waiting for an upstream slot",
+    ["backend"],
+)
+SYNTHESIS_SECONDS = registry.histogram(
+    "tts_synthesis_seconds", "Upstream synthesis total time", ["backend"]
+)
+SYNTHESIS_QUEUE_SECONDS = registry.histogram(
+    "tts_synthesis_queue_seconds",
+    "Time upstream syntheses waited for a slot, by priority class",
+    ["priority"],
+)
+SYNTHESIS_IN_FLIGHT = registry.gauge(
+    "tts_synthesis_in_flight", "Upstream syntheses running or waiting for a slot", ["backend"]
+)
+RESPONSE_BYTES = registry.histogram(
+    "tts_response_bytes", "Audio bytes sent per response", ["route"], buckets=SIZE_BUCKETS
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "tts_http_requests_in_flight", "HTTP requests being served, by API area", ["area"]
+)
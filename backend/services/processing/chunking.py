@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import io
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Tuple, Union
+
+
+@dataclass(frozen=True)
+class ChunkSchedule:
+    """
+    Target sizes for a document's chunks, ramping up from a small first chunk.
+
+    Chunk 0 aims for first_chars, so the first audio is ready quickly; each
+    later chunk aims for growth times the previous target, up to max_chars.
+    Targets are soft: chunks are only cut at paragraph and sentence
+    boundaries, so a single long sentence still makes one chunk.
+    """
+
+    first_chars: int = 150
+    growth: float = 2.0
+    max_chars: int = 800
+
+    def __post_init__(self):
+        if self.first_chars < 1 or self.max_chars < 1:
+            raise ValueError("Chunk sizes must be positive")
+        if self.growth < 1:
+            raise ValueError("Chunk growth must be at least 1")
+
+    @classmethod
+    def fixed(cls, chars: int) -> "ChunkSchedule":
+        """Every chunk aims for chars"""
+        return cls(first_chars=chars, growth=1.0, max_chars=chars)
+
+    @classmethod
+    def of(cls, target: Union[int, "ChunkSchedule"]) -> "ChunkSchedule":
+        """A schedule as given, or a fixed one for a plain target size"""
+        return target if isinstance(target, ChunkSchedule) else cls.fixed(target)
+
+    def target(self, index: int) -> int:
+        """Target size of chunk index"""
+        size = float(min(self.first_chars, self.max_chars))
+        # Stops at the ceiling, so this is a handful of steps for any index
+        for _ in range(index):
+            if size >= self.max_chars or self.growth == 1:
+                break
+            size *= self.growth
+        return int(min(size, self.max_chars))
+
+
+class ChunkTable:
+    """
+    A document's chunks as spans of one buffer.
+
+    Chunk i is buffer[offsets[i]:offsets[i + 1]]; character and word counts
+    are read from the table, so only a chunk that is synthesized is ever
+    copied out. Built from a stream of chunks, so the individual chunk
+    strings are freed as soon as they are written to the buffer.
+    """
+
+    __slots__ = ("buffer", "offsets", "word_counts")
+
+    def __init__(self, buffer: str, offsets: array, word_counts: array):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.word_counts = word_counts
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Tuple[int, str]]) -> "ChunkTable":
+        """Table of (chunk_index, chunk_text) pairs, e.g. from chunk_for_streaming"""
+        if isinstance(chunks, ChunkTable):
+            return chunks
+        buffer = io.StringIO()
+        offsets = array("q", [0])
+        word_counts = array("q")
+        for _, text in chunks:
+            buffer.write(text)
+            offsets.append(offsets[-1] + len(text))
+            word_counts.append(len(text.split()))
+        return cls(buffer.getvalue(), offsets, word_counts)
+
+    def __len__(self) -> int:
+        return len(self.word_counts)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for index in range(len(self)):
+            yield index, self.chunk(index)
+
+    def chunk(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]]
+
+    def char_count(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def preview(self, index: int, chars: int = 100) -> str:
+        """The first chars of a chunk, without copying the rest of it"""
+        start = self.offsets[index]
+        return self.buffer[start:min(start + chars, self.offsets[index + 1])]
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by this table"""
+        return (
+            sys.getsizeof(self.buffer)
+            + self.offsets.itemsize * len(self.offsets)
+            + self.word_counts.itemsize * len(self.word_counts)
+        )
@@ -1,7 +1,11 @@
 import re
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import html.parser
 
+from services.processing.chunking import ChunkSchedule, ChunkTable
+from services.processing.profiling import PassProfile
+from services.processing.rules import RuleTable
+
 
 class HTMLToText(html.parser.HTMLParser):
     """Convert HTML to plain text with preserved structure"""
@@ -49,47 +53,269 @@ class HTMLToText(html.parser.HTMLParser):
         return ''.join(self.text)
 
 
+# Pause placeholders (removed at the end, TTS relies on natural punctuation)
+# Using unique markers that won't be affected by text cleaning
+PAUSE_SHORT = ' XPAUSESHORTX '
+PAUSE_MEDIUM = ' XPAUSEMEDIUMX '
+PAUSE_LONG = ' XPAUSELONGX '
+PAUSE_PARAGRAPH = ' XPAUSEPARAGRAPHX '
+
+ORDINALS = {
+    1: "First", 2: "Second", 3: "Third", 4: "Fourth", 5: "Fifth",
+    6: "Sixth", 7: "Seventh", 8: "Eighth", 9: "Ninth", 10: "Tenth",
+    11: "Eleventh", 12: "Twelfth"
+}
+
+
+def _html_to_text(text: str) -> str:
+    parser = HTMLToText()
+    parser.feed(text)
+    return parser.get_text()
+
+
+def _ordinal(num: int) -> str:
+    return ORDINALS.get(num, f"Item {num}")
+
+
+# Rule tables below are compiled once at import. Each formatting pass applies
+# its table in as few scans as possible while producing the same output as
+# running the original rules one by one.
+
+# Whitespace: runs of spaces/tabs that aren't already a single space, CRLF,
+# and 3+ newlines (counting CRLF pairs, which are normalized first).
+_WHITESPACE = RuleTable([
+    (r'(?:\r?\n){3,}', '\n\n'),
+    (r'\r\n', '\n'),
+    (r'\t[ \t]*| [ \t]+', ' '),
+], guard=r'(?=\t|\r\n|\n[\r\n]| [ \t])')
+
+_MARKDOWN_HEADER = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+_HTML_HEADER_MAJOR = re.compile(r'<h[1-2][^>]*>(.+?)</h[1-2]>', re.IGNORECASE)
+_HTML_HEADER_MINOR = re.compile(r'<h[3-6][^>]*>(.+?)</h[3-6]>', re.IGNORECASE)
+_PLAIN_HEADER = re.compile(r'^(.{1,100}[^.!?;:,\s])\s*\n\n', re.MULTILINE)
+
+# Unicode bullets, dash or asterisk bullets, arrow bullets
+_BULLET_UNICODE = r'[•●○◦▪▸►‣⁃]\s*'
+_BULLET_ASCII = r'[-*]\s+'
+_BULLET_ARROW = r'[→⇒➤➜]\s*'
+_BULLET = re.compile(rf'[\s]*(?:{_BULLET_UNICODE}|{_BULLET_ASCII}|{_BULLET_ARROW})')
+_BULLET_ANY_LINE = re.compile(rf'^[\s]*(?:{_BULLET_UNICODE}|{_BULLET_ASCII}|{_BULLET_ARROW})',
+                              re.MULTILINE)
+# Each bullet style is stripped once, in order, so "• - item" loses both markers
+_BULLET_STRIP = re.compile(
+    rf'(?:[\s]*{_BULLET_UNICODE})?(?:[\s]*{_BULLET_ASCII})?(?:[\s]*{_BULLET_ARROW})?'
+)
+
+# Rules after "b/c" also see a word boundary where "b/c" ran straight into a
+# word, since it has been replaced by "because " by the time they apply
+_BC = r'(?:\b|(?<=\bb/c))'
+_ABBREVIATIONS = RuleTable([
+    (r'\be\.g\.\s*', 'for example '),
+    # "i.e.g." - the e.g. rule applies first and wins
+    (r'\bi\.e\.(?!g\.)\s*', 'that is '),
+    (r'\betc\.\s*', 'etcetera '),
+    (r'\bvs\.\s*', 'versus '),
+    (r'\bDr\.\s+', 'Doctor '),
+    (r'\bMr\.\s+', 'Mister '),
+    (r'\bMrs\.\s+', 'Missus '),
+    (r'\bMs\.\s+', 'Miss '),
+    (r'\bProf\.\s+', 'Professor '),
+    (r'\bSt\.\s+', 'Saint '),
+    (r'\bw/\s*', 'with '),
+    (r'\bw/o\s*', 'without '),
+    (r'\bb/c\s*', 'because '),
+    (rf'{_BC}min\.\s*', 'minutes '),
+    (rf'{_BC}sec\.\s*', 'seconds '),
+    (rf'{_BC}hrs?\.\s*', 'hours '),
+    (rf'{_BC}approx\.\s*', 'approximately '),
+    (rf'{_BC}FYI\b', 'for your information'),
+    (rf'{_BC}ASAP\b', 'as soon as possible'),
+    (rf'{_BC}TBD\b', 'to be determined'),
+    # "TL;DR. " - the Dr. rule applies first and wins
+    (rf'{_BC}TL(?:;DR(?!\.\s)|DR)\b', 'too long, didn\'t read'),
+    (rf'{_BC}IMO\b', 'in my opinion'),
+    (rf'{_BC}IMHO\b', 'in my humble opinion'),
+    (rf'{_BC}AFAIK\b', 'as far as I know'),
+], flags=re.IGNORECASE, guard=rf'(?=[abdefhimpstvw]){_BC}')
+
+_AND_OR = re.compile(r'\band\s*/\s*or\b', re.IGNORECASE)
+_WORD_SLASH = re.compile(r'(?<!/)(?<!\d)(\b[a-zA-Z]+)\s*/\s*([a-zA-Z]+\b)(?!\d)(?!/)')
+_PERIOD_SPACE = re.compile(r'\.(\s+)')
+_CLAUSE_PUNCTUATION = re.compile(r'([,;:])\s+')
+_DASH = re.compile(r'\s*[—–]\s*')
+_DOUBLE_HYPHEN = re.compile(r'\s*--\s*')
+_OPEN_PAREN = re.compile(r'\(\s*')
+_CLOSE_PAREN = re.compile(r'\s*\)')
+_EMPHATIC = re.compile(r'([!?])\s+')
+_NUMERIC_RANGE = re.compile(r'(\d+)\s*[-–]\s*(\d+)')
+_ELLIPSIS = re.compile(r'\.\.\.+')
+
+_SPECIAL_CHARACTERS = {
+    '&': ' and ',
+    '@': ' at ',
+    '#': ' number ',
+    '%': ' percent ',
+    '+': ' plus ',
+    '=': ' equals ',
+    '<': ' less than ',
+    '>': ' greater than ',
+    '→': f' {PAUSE_SHORT} then ',
+    '←': ' from ',
+    '↔': ' and ',
+    '✓': ' check ',
+    '✗': ' cross ',
+    '★': ' star ',
+    '©': ' copyright ',
+    '®': ' registered ',
+    '™': ' trademark ',
+    '°': ' degrees ',
+    '×': ' times ',
+    '÷': ' divided by ',
+    '≈': ' approximately ',
+    '≠': ' not equal to ',
+    '≤': ' less than or equal to ',
+    '≥': ' greater than or equal to ',
+}
+_SPECIAL_CHARACTER = re.compile(f"[{re.escape(''.join(_SPECIAL_CHARACTERS))}]")
+
+TRANSITION_WORDS = [
+    'however', 'therefore', 'furthermore', 'moreover', 'nevertheless',
+    'consequently', 'meanwhile', 'additionally', 'alternatively',
+    'subsequently', 'nonetheless', 'accordingly', 'hence', 'thus',
+    'otherwise', 'instead', 'likewise', 'similarly', 'conversely',
+    'in contrast', 'on the other hand', 'in addition', 'as a result',
+    'for example', 'for instance', 'in fact', 'indeed', 'notably',
+    'specifically', 'particularly', 'importantly', 'significantly',
+    'finally', 'lastly', 'in conclusion', 'to summarize', 'overall',
+]
+# Alternation order follows the list, so the first listed word still wins
+_TRANSITION = re.compile(rf'([.!?])\s+({"|".join(TRANSITION_WORDS)})', re.IGNORECASE)
+
+
+def _format_large_number(parts: Tuple[str, ...]) -> str:
+    num = int(parts[0].replace(',', ''))
+    if num >= 1000000000:
+        return f"{num / 1000000000:.1f} billion"
+    elif num >= 1000000:
+        return f"{num / 1000000:.1f} million"
+    elif num >= 10000:
+        return f"{num / 1000:.1f} thousand"
+    return parts[0]
+
+
+_NUMBERS = RuleTable([
+    # Numbered lists (1. or 1))
+    (r'^(\d{1,2})[.)]\s+', lambda parts: f"{_ordinal(int(parts[1]))}, "),
+    # Large numbers with thousands separators
+    (r'\b\d{1,3}(?:,\d{3})+\b', _format_large_number),
+], flags=re.MULTILINE)
+_PERCENT = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+
+# URLs: a www. run stops where an http(s):// URL begins, as if that URL had
+# already been replaced (a bare scheme with nothing after it is no URL)
+_URL = RuleTable([
+    (r'https?://[^\s]+', ' link '),
+    (r'www\.(?:(?!https?://\S)[^\s])+', ' link '),
+])
+_EMAIL = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_CODE_BLOCK = re.compile(r'```[\s\S]*?```')
+_INLINE_CODE = re.compile(r'`[^`]+`')
+_BOLD_STAR = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_STAR = re.compile(r'\*([^*]+)\*')
+_BOLD_UNDERSCORE = re.compile(r'__([^_]+)__')
+_ITALIC_UNDERSCORE = re.compile(r'_([^_]+)_')
+_PARENTHETICAL = re.compile(r'\(([^)]+)\)')
+_BRACKETS = re.compile(r'\[[^\]]*\]')
+_MULTIPLE_SPACES = re.compile(r' {2,}')
+
+# Lines (followed by a single newline) whose last visible character isn't
+# punctuation; the trailing whitespace is dropped along with the match
+_UNPUNCTUATED_LINE = re.compile(r'^([^\n]*[^\s.!?;:,])[^\S\n]*\n(?!\n)', re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(r'\n\n+')
+
+_PARAGRAPH_SPLIT = re.compile(r'\n+')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def _iter_split(pattern: re.Pattern, text: str) -> Iterator[str]:
+    """pattern.split(text) one piece at a time, for patterns without groups"""
+    start = 0
+    for match in pattern.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+# Incremental chunking: raw input is cut into blocks at blank lines and blocks
+# are formatted in groups. A group is only closed at a blank line that no
+# formatting rule can match across: the text before it must not end with
+# punctuation, a bare bullet, a list number or an abbreviation whose rule
+# consumes the following whitespace (short lines gain a period as plain
+# headers, so the period is optional), the text after it must not start with a
+# dash, closing parenthesis or bullet, code and emphasis markers in the group
+# must pair up, and no parenthesis or bracket may be left open.
+_BLOCK_BREAK = re.compile(r'(?:\r?\n){2,}')
+_JOINS_NEXT = re.compile(
+    r'(?:[,;:!?—–\-(/#•●○◦▪▸►‣⁃→⇒➤➜]'
+    r'|\b(?:e\.g|i\.e|etc|vs|dr|mrs?|ms|prof|st|min|sec|hrs?|approx)\.?'
+    r'|\bw/o?|\bb/c|^\d{1,2}[.)]?)\s*\Z',
+    re.IGNORECASE | re.MULTILINE,
+)
+_JOINS_PREVIOUS = re.compile(
+    rf'\s*(?:[—–\-)/%*]|{_BULLET_UNICODE}|{_BULLET_ARROW})'
+)
+
+
 class ProsodyFormatter:
     """Prepare text for natural-sounding TTS output with proper pauses and formatting"""
 
-    # Pause placeholders (removed at the end, TTS relies on natural punctuation)
-    # Using unique markers that won't be affected by text cleaning
-    PAUSE_SHORT = ' XPAUSESHORTX '
-    PAUSE_MEDIUM = ' XPAUSEMEDIUMX '
-    PAUSE_LONG = ' XPAUSELONGX '
-    PAUSE_PARAGRAPH = ' XPAUSEPARAGRAPHX '
-
-    def format(self, text: str) -> str:
-        """Apply all formatting rules for TTS"""
+    PAUSE_SHORT = PAUSE_SHORT
+    PAUSE_MEDIUM = PAUSE_MEDIUM
+    PAUSE_LONG = PAUSE_LONG
+    PAUSE_PARAGRAPH = PAUSE_PARAGRAPH
+
+    # Formatting passes, in the order _format_text applies them
+    PASSES = (
+        "_normalize_whitespace",
+        "_format_headers",  # Handle headers before cleaning
+        "_convert_bullets_to_numbers",
+        "_handle_abbreviations",
+        "_add_punctuation_pauses",
+        "_handle_special_characters",
+        "_add_transition_pauses",
+        "_format_numbers",
+        "_clean_for_speech",
+        "_add_paragraph_pauses",
+        "_convert_pauses_to_ssml",  # Clean up pause placeholders
+    )
+
+    def format(self, text: str, profile: Optional[PassProfile] = None) -> str:
+        """
+        Apply all formatting rules for TTS. With a profile, the time and size
+        change of each pass are recorded in it.
+        """
         # Convert HTML to text if input is HTML
         if '<' in text and '>' in text:
-            parser = HTMLToText()
-            parser.feed(text)
-            text = parser.get_text()
-
-        text = self._normalize_whitespace(text)
-        text = self._format_headers(text)  # Handle headers before cleaning
-        text = self._convert_bullets_to_numbers(text)
-        text = self._handle_abbreviations(text)
-        text = self._add_punctuation_pauses(text)
-        text = self._handle_special_characters(text)
-        text = self._add_transition_pauses(text)
-        text = self._format_numbers(text)
-        text = self._clean_for_speech(text)
-        text = self._add_paragraph_pauses(text)
-        text = self._convert_pauses_to_ssml(text)  # Clean up pause placeholders
+            if profile is not None:
+                text = profile.run("_html_to_text", _html_to_text, text)
+            else:
+                text = _html_to_text(text)
+
+        return self._format_text(text, profile)
+
+    def _format_text(self, text: str, profile: Optional[PassProfile] = None) -> str:
+        """Apply the formatting passes to plain text"""
+        if profile is None:
+            for name in self.PASSES:
+                text = getattr(self, name)(text)
+        else:
+            for name in self.PASSES:
+                text = profile.run(name, getattr(self, name), text)
 
         return text.strip()
 
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize all whitespace"""
-        # Replace multiple spaces with single space
-        text = re.sub(r'[ \t]+', ' ', text)
-        # Normalize line endings
-        text = re.sub(r'\r\n', '\n', text)
-        # Keep paragraph breaks (2+ newlines)
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text
+        return _WHITESPACE.sub(text)
 
     def _format_headers(self, text: str) -> str:
         """Format headers for engaging TTS with announcements"""
@@ -106,62 +332,39 @@ class ProsodyFormatter:
                 return f"\n\n {self.PAUSE_SHORT} {header_text}.\n\n"
 
         # Match markdown headers (# Header, ## Header, etc.)
-        text = re.sub(r'^(#{1,6})\s+(.+)$', replace_header, text, flags=re.MULTILINE)
+        if '#' in text:
+            text = _MARKDOWN_HEADER.sub(replace_header, text)
 
         # Also handle HTML-style headers if present
-        text = re.sub(r'<h[1-2][^>]*>(.+?)</h[1-2]>',
-                     lambda m: f"\n\nNext section. {self.PAUSE_MEDIUM} {m.group(1)}.\n\n",
-                     text, flags=re.IGNORECASE)
-        text = re.sub(r'<h[3-6][^>]*>(.+?)</h[3-6]>',
-                     lambda m: f"\n\n{m.group(1)}.\n\n",
-                     text, flags=re.IGNORECASE)
-
-        # Detect plain text headers (lines without ending punctuation, followed by blank line)
-        # Pattern: Short line (< 100 chars), no ending punctuation, followed by paragraph break
-        def fix_plain_header(match):
-            header_line = match.group(1).strip()
-            # Add period to ensure pause
-            return f"{header_line}.\n\n"
-
-        # Match lines that:
-        # - Don't end with punctuation (.!?;:,)
-        # - Are followed by blank line (paragraph break)
-        # - Are relatively short (< 100 chars, typical header length)
-        text = re.sub(
-            r'^(.{1,100}[^.!?;:,\s])\s*\n\n',
-            fix_plain_header,
-            text,
-            flags=re.MULTILINE
-        )
+        if '<' in text:
+            text = _HTML_HEADER_MAJOR.sub(
+                lambda m: f"\n\nNext section. {self.PAUSE_MEDIUM} {m.group(1)}.\n\n", text
+            )
+            text = _HTML_HEADER_MINOR.sub(lambda m: f"\n\n{m.group(1)}.\n\n", text)
 
-        return text
+        # Detect plain text headers: short lines (< 100 chars) without ending
+        # punctuation, followed by a blank line. Add a period to ensure a pause.
+        return _PLAIN_HEADER.sub(lambda m: f"{m.group(1).strip()}.\n\n", text)
 
     def _convert_bullets_to_numbers(self, text: str) -> str:
         """Convert bullet points to numbered list for clear TTS"""
+        if not _BULLET_ANY_LINE.search(text):
+            return text
+
         lines = text.split('\n')
         result = []
         bullet_count = 0
         in_list = False
 
-        bullet_patterns = [
-            r'^[\s]*[•●○◦▪▸►‣⁃]\s*',  # Unicode bullets
-            r'^[\s]*[-*]\s+',            # Dash or asterisk bullets
-            r'^[\s]*[→⇒➤➜]\s*',         # Arrow bullets
-        ]
-
         for line in lines:
-            is_bullet = any(re.match(p, line) for p in bullet_patterns)
-
-            if is_bullet:
+            if _BULLET.match(line):
                 if not in_list:
                     bullet_count = 0
                     in_list = True
                 bullet_count += 1
 
                 # Remove bullet character
-                clean_line = line
-                for pattern in bullet_patterns:
-                    clean_line = re.sub(pattern, '', clean_line)
+                clean_line = line[_BULLET_STRIP.match(line).end():]
 
                 # Convert to ordinal
                 ordinal = self._get_ordinal(bullet_count)
@@ -175,207 +378,95 @@ class ProsodyFormatter:
 
     def _get_ordinal(self, num: int) -> str:
         """Get ordinal word for number"""
-        ordinals = {
-            1: "First", 2: "Second", 3: "Third", 4: "Fourth", 5: "Fifth",
-            6: "Sixth", 7: "Seventh", 8: "Eighth", 9: "Ninth", 10: "Tenth",
-            11: "Eleventh", 12: "Twelfth"
-        }
-        return ordinals.get(num, f"Item {num}")
+        return _ordinal(num)
 
     def _handle_abbreviations(self, text: str) -> str:
         """Expand common abbreviations for clearer speech"""
-        abbreviations = {
-            r'\be\.g\.\s*': 'for example ',
-            r'\bi\.e\.\s*': 'that is ',
-            r'\betc\.\s*': 'etcetera ',
-            r'\bvs\.\s*': 'versus ',
-            r'\bDr\.\s+': 'Doctor ',
-            r'\bMr\.\s+': 'Mister ',
-            r'\bMrs\.\s+': 'Missus ',
-            r'\bMs\.\s+': 'Miss ',
-            r'\bProf\.\s+': 'Professor ',
-            r'\bSt\.\s+': 'Saint ',
-            r'\bw/\s*': 'with ',
-            r'\bw/o\s*': 'without ',
-            r'\bb/c\s*': 'because ',
-            r'\bmin\.\s*': 'minutes ',
-            r'\bsec\.\s*': 'seconds ',
-            r'\bhrs?\.\s*': 'hours ',
-            r'\bapprox\.\s*': 'approximately ',
-            r'\bFYI\b': 'for your information',
-            r'\bASAP\b': 'as soon as possible',
-            r'\bTBD\b': 'to be determined',
-            r'\bTL;?DR\b': 'too long, didn\'t read',
-            r'\bIMO\b': 'in my opinion',
-            r'\bIMHO\b': 'in my humble opinion',
-            r'\bAFAIK\b': 'as far as I know',
-        }
-
-        for abbr, expansion in abbreviations.items():
-            text = re.sub(abbr, expansion, text, flags=re.IGNORECASE)
-
-        return text
+        return _ABBREVIATIONS.sub(text)
 
     def _add_punctuation_pauses(self, text: str) -> str:
         """Add appropriate pauses for all English punctuation marks"""
-
-        # Special handling for "and/or" before general slash handling
-        text = re.sub(r'\band\s*/\s*or\b', 'and or', text, flags=re.IGNORECASE)
-
-        # Numeric ratios (e.g., "50/50"): keep as-is, TTS handles naturally
-        # Already handled by not matching digits in the pattern below
-
-        # Forward slash between words: say "or" (but not in URLs or numeric ratios)
-        # Skip if preceded/followed by http, https, or digits only
-        text = re.sub(r'(?<!/)(?<!\d)(\b[a-zA-Z]+)\s*/\s*([a-zA-Z]+\b)(?!\d)(?!/)', r'\1 or \2', text)
+        if '/' in text:
+            # Special handling for "and/or" before general slash handling
+            text = _AND_OR.sub('and or', text)
+            # Forward slash between words: say "or" (but not in URLs or numeric
+            # ratios like "50/50", which TTS handles naturally)
+            text = _WORD_SLASH.sub(r'\1 or \2', text)
 
         # Dot: short pause (lighter for natural flow)
-        text = re.sub(r'\.(\s+)', rf'. {self.PAUSE_SHORT} \1', text)
-
-        # Comma: short pause (lighter for natural flow)
-        text = re.sub(r',\s+', f', {self.PAUSE_SHORT} ', text)
+        text = _PERIOD_SPACE.sub(rf'. {self.PAUSE_SHORT} \1', text)
 
-        # Semicolon: short-medium pause
-        text = re.sub(r';\s+', f'; {self.PAUSE_SHORT} ', text)
-
-        # Colon: short-medium pause (for explanations and lists)
-        text = re.sub(r':\s+', f': {self.PAUSE_SHORT} ', text)
+        # Comma, semicolon, colon: short pause
+        text = _CLAUSE_PUNCTUATION.sub(rf'\1 {self.PAUSE_SHORT} ', text)
 
         # Em dash or en dash: short pause for interruption/aside
-        text = re.sub(r'\s*[—–]\s*', f' {self.PAUSE_SHORT} ', text)
-        text = re.sub(r'\s*--\s*', f' {self.PAUSE_SHORT} ', text)
+        if '—' in text or '–' in text:
+            text = _DASH.sub(f' {self.PAUSE_SHORT} ', text)
+        if '--' in text:
+            text = _DOUBLE_HYPHEN.sub(f' {self.PAUSE_SHORT} ', text)
 
         # Parentheses: very brief pause for asides
-        # Opening parenthesis
-        text = re.sub(r'\(\s*', f'( {self.PAUSE_SHORT} ', text)
-        # Closing parenthesis (pause after)
-        text = re.sub(r'\s*\)', f' {self.PAUSE_SHORT} )', text)
+        if '(' in text:
+            text = _OPEN_PAREN.sub(f'( {self.PAUSE_SHORT} ', text)
+        if ')' in text:
+            text = _CLOSE_PAREN.sub(f' {self.PAUSE_SHORT} )', text)
 
-        # Question mark and exclamation: ensure medium pause (more emphasis)
-        text = re.sub(r'([!?])\s+', rf'\1 {self.PAUSE_SHORT} ', text)
+        # Question mark and exclamation: ensure pause (more emphasis)
+        text = _EMPHATIC.sub(rf'\1 {self.PAUSE_SHORT} ', text)
 
         # Period: handled naturally by TTS, just ensure clean spacing
-        text = re.sub(r'\.(\s+)', r'. \1', text)
+        text = _PERIOD_SPACE.sub(r'. \1', text)
 
         # En dash in ranges (e.g., "2020-2025"): say "to"
-        text = re.sub(r'(\d+)\s*[-–]\s*(\d+)', r'\1 to \2', text)
+        if '-' in text or '–' in text:
+            text = _NUMERIC_RANGE.sub(r'\1 to \2', text)
 
         # Ellipsis: medium pause (thinking/trailing off)
-        text = re.sub(r'\.\.\.+', f' {self.PAUSE_MEDIUM} ', text)
+        if '...' in text:
+            text = _ELLIPSIS.sub(f' {self.PAUSE_MEDIUM} ', text)
 
         return text
 
     def _handle_special_characters(self, text: str) -> str:
         """Convert special characters to speakable text"""
-        replacements = {
-            '&': ' and ',
-            '@': ' at ',
-            '#': ' number ',
-            '%': ' percent ',
-            '+': ' plus ',
-            '=': ' equals ',
-            '<': ' less than ',
-            '>': ' greater than ',
-            '→': f' {self.PAUSE_SHORT} then ',
-            '←': ' from ',
-            '↔': ' and ',
-            '✓': ' check ',
-            '✗': ' cross ',
-            '★': ' star ',
-            '©': ' copyright ',
-            '®': ' registered ',
-            '™': ' trademark ',
-            '°': ' degrees ',
-            '×': ' times ',
-            '÷': ' divided by ',
-            '≈': ' approximately ',
-            '≠': ' not equal to ',
-            '≤': ' less than or equal to ',
-            '≥': ' greater than or equal to ',
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+        return _SPECIAL_CHARACTER.sub(lambda m: _SPECIAL_CHARACTERS[m.group()], text)
 
     def _add_transition_pauses(self, text: str) -> str:
         """Add pauses before transition words for better comprehension"""
-        transition_words = [
-            'however', 'therefore', 'furthermore', 'moreover', 'nevertheless',
-            'consequently', 'meanwhile', 'additionally', 'alternatively',
-            'subsequently', 'nonetheless', 'accordingly', 'hence', 'thus',
-            'otherwise', 'instead', 'likewise', 'similarly', 'conversely',
-            'in contrast', 'on the other hand', 'in addition', 'as a result',
-            'for example', 'for instance', 'in fact', 'indeed', 'notably',
-            'specifically', 'particularly', 'importantly', 'significantly',
-            'finally', 'lastly', 'in conclusion', 'to summarize', 'overall',
-        ]
-
-        for word in transition_words:
-            # Add pause after sentence-ending punctuation before transition
-            pattern = rf'([.!?])\s+({word})'
-            replacement = rf'\1 {self.PAUSE_MEDIUM} \2'
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-
-        return text
+        return _TRANSITION.sub(rf'\1 {self.PAUSE_MEDIUM} \2', text)
 
     def _format_numbers(self, text: str) -> str:
         """Format numbers for clearer speech"""
-        # Handle numbered lists (1. or 1))
-        def replace_list_number(match):
-            num = int(match.group(1))
-            ordinal = self._get_ordinal(num)
-            return f"{ordinal}, "
-
-        text = re.sub(r'^(\d{1,2})[.)]\s+', replace_list_number, text, flags=re.MULTILINE)
-
-        # Format large numbers with word separators
-        def format_large_number(match):
-            num_str = match.group(0).replace(',', '')
-            try:
-                num = int(num_str)
-                if num >= 1000000000:
-                    return f"{num / 1000000000:.1f} billion"
-                elif num >= 1000000:
-                    return f"{num / 1000000:.1f} million"
-                elif num >= 10000:
-                    return f"{num / 1000:.1f} thousand"
-            except ValueError:
-                pass
-            return match.group(0)
-
-        text = re.sub(r'\b\d{1,3}(?:,\d{3})+\b', format_large_number, text)
-
-        # Format years to be spoken naturally (keep as-is, TTS handles well)
-        # Format percentages
-        text = re.sub(r'(\d+(?:\.\d+)?)\s*%', r'\1 percent', text)
+        text = _NUMBERS.sub(text)
+
+        # Format percentages (years are kept as-is, TTS handles them well)
+        if '%' in text:
+            text = _PERCENT.sub(r'\1 percent', text)
 
         return text
 
     def _clean_for_speech(self, text: str) -> str:
         """Final cleanup for TTS"""
-        # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace("'", "'").replace("'", "'")
-
         # Remove URLs - replace with "link"
-        text = re.sub(r'https?://[^\s]+', ' link ', text)
-        text = re.sub(r'www\.[^\s]+', ' link ', text)
+        text = _URL.sub(text)
 
         # Remove email addresses - replace with "email address"
-        text = re.sub(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', ' email address ', text)
+        if '@' in text:
+            text = _EMAIL.sub(' email address ', text)
 
         # Remove code blocks and inline code
-        text = re.sub(r'```[\s\S]*?```', ' code block ', text)
-        text = re.sub(r'`[^`]+`', ' code ', text)
+        if '`' in text:
+            text = _CODE_BLOCK.sub(' code block ', text)
+            text = _INLINE_CODE.sub(' code ', text)
 
         # Remove markdown formatting
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # Bold
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)      # Italic
-        text = re.sub(r'__([^_]+)__', r'\1', text)      # Bold
-        text = re.sub(r'_([^_]+)_', r'\1', text)        # Italic
         # Headers are handled in _format_headers() earlier in the pipeline
+        if '*' in text:
+            text = _BOLD_STAR.sub(r'\1', text)
+            text = _ITALIC_STAR.sub(r'\1', text)
+        if '_' in text:
+            text = _BOLD_UNDERSCORE.sub(r'\1', text)
+            text = _ITALIC_UNDERSCORE.sub(r'\1', text)
 
         # Remove very long parenthetical content
         def shorten_parenthetical(match):
@@ -384,63 +475,186 @@ class ProsodyFormatter:
                 return ''
             return f'({content})'
 
-        text = re.sub(r'\(([^)]+)\)', shorten_parenthetical, text)
+        if '(' in text:
+            text = _PARENTHETICAL.sub(shorten_parenthetical, text)
 
         # Remove brackets entirely
-        text = re.sub(r'\[[^\]]*\]', '', text)
+        if '[' in text:
+            text = _BRACKETS.sub('', text)
 
         # Clean up multiple spaces
-        text = re.sub(r' +', ' ', text)
-
-        return text
+        return _MULTIPLE_SPACES.sub(' ', text)
 
     def _add_paragraph_pauses(self, text: str) -> str:
         """Add longer pauses between paragraphs and line breaks"""
-        # First, ensure all lines end with punctuation before line breaks
-        # This creates natural pauses at every line break
-
-        # For single line breaks: ensure line ends with period
-        def ensure_line_punctuation(match):
-            line_content = match.group(1).rstrip()
-            # Check if line already ends with punctuation
-            if line_content and not line_content[-1] in '.!?;:,':
-                return f"{line_content}...\n"  # Use ellipsis for pause effect
-            return match.group(0)
-
-        # Match lines followed by single newline (not paragraph break)
-        text = re.sub(r'^(.+?)(\n)(?!\n)', ensure_line_punctuation, text, flags=re.MULTILINE)
+        # Lines followed by a single newline get an ellipsis unless they already
+        # end with punctuation. This creates natural pauses at every line break.
+        text = _UNPUNCTUATED_LINE.sub(r'\1...\n', text)
 
         # For paragraph breaks (double newlines): add ellipsis for longer pause
-        text = re.sub(r'\n\n+', '...\n\n', text)
-
-        return text
+        return _PARAGRAPH_BREAK.sub('...\n\n', text)
 
     def _convert_pauses_to_ssml(self, text: str) -> str:
         """Remove pause placeholders - Edge TTS doesn't support SSML, relies on natural punctuation"""
+        if 'XPAUSE' not in text:
+            return text
         # Simply remove the placeholders since punctuation is already present
         # TTS engines naturally pause at periods, commas, etc.
-        text = text.replace(' XPAUSESHORTX ', ' ')
-        text = text.replace(' XPAUSEMEDIUMX ', ' ')
-        text = text.replace(' XPAUSELONGX ', ' ')
-        text = text.replace(' XPAUSEPARAGRAPHX ', '\n\n')  # Keep paragraph breaks
+        text = text.replace(self.PAUSE_SHORT, ' ')
+        text = text.replace(self.PAUSE_MEDIUM, ' ')
+        text = text.replace(self.PAUSE_LONG, ' ')
+        text = text.replace(self.PAUSE_PARAGRAPH, '\n\n')  # Keep paragraph breaks
         return text
 
-    def chunk_for_streaming(self, text: str, target_chars: int = 800) -> List[Tuple[int, str]]:
+    def chunk_for_streaming(
+        self, text: str, target_chars: Union[int, ChunkSchedule] = 800
+    ) -> List[Tuple[int, str]]:
         """
         Split text into chunks optimized for streaming TTS.
         Returns list of (chunk_index, chunk_text) tuples.
 
-        Aims for ~800 chars per chunk which is roughly 1-2 paragraphs,
-        about 30-45 seconds of audio at normal speed.
+        An int aims for that many chars per chunk; ~800 is roughly 1-2
+        paragraphs, about 30-45 seconds of audio at normal speed. A
+        ChunkSchedule ramps up from a small first chunk instead, so playback
+        can start after a sentence or two has been synthesized.
         """
-        # First format the text
+        return list(self._iter_document_chunks(text, target_chars))
+
+    def chunk_table(
+        self, text: str, target_chars: Union[int, ChunkSchedule] = 800
+    ) -> ChunkTable:
+        """
+        chunk_for_streaming's chunks as one buffer and offset table, built
+        without holding every chunk as a separate string
+        """
+        return ChunkTable.from_chunks(self._iter_document_chunks(text, target_chars))
+
+    def _iter_document_chunks(
+        self, text: str, target_chars: Union[int, ChunkSchedule]
+    ) -> Iterator[Tuple[int, str]]:
+        # First format the text, then split by paragraphs
         formatted = self.format(text)
+        return self._pack_chunks(_iter_split(_PARAGRAPH_SPLIT, formatted), target_chars)
+
+    def iter_chunks(
+        self,
+        source: Union[str, Iterable[str]],
+        target_chars: Union[int, ChunkSchedule] = 800,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Incremental version of chunk_for_streaming.
+        Yields (chunk_index, chunk_text) tuples as soon as each chunk is complete.
 
-        # Split by paragraphs first
-        paragraphs = re.split(r'\n+', formatted)
+        source is the full text or an iterable of text pieces (e.g. lines of a
+        file). The input is formatted a few paragraphs at a time, so memory is
+        bounded by the chunk size and the longest paragraph rather than the
+        document size. For an iterable, HTML is detected from the first piece.
 
-        chunks = []
-        current_chunk = ""
+        Chunks are the same as chunk_for_streaming's, except that emphasis or
+        code markers that only pair up across a blank line are left unpaired.
+        """
+        if isinstance(source, str):
+            # Feed long texts in slices so HTML conversion is incremental too
+            text = source
+            html = '<' in text and '>' in text
+            pieces: Iterable[str] = (text[i:i + 65536] for i in range(0, len(text), 65536))
+        else:
+            html = None
+            pieces = source
+        schedule = ChunkSchedule.of(target_chars)
+        paragraphs = self._iter_paragraphs(pieces, html, max(schedule.max_chars, 4096))
+        return self._pack_chunks(paragraphs, schedule)
+
+    def _iter_paragraphs(
+        self, pieces: Iterable[str], html: Union[bool, None], group_chars: int
+    ) -> Iterator[str]:
+        """
+        Formatted paragraphs of the text pieces, formatting blocks in groups of
+        about group_chars. html=None detects HTML from the first piece.
+        """
+        parser = None
+        html_checked = False
+        pending = ""
+        group: List[str] = []
+        size = 0
+        # Counts of `, * and _ in the group, and whether a ( or [ is open
+        counts = [0, 0, 0]
+        open_brackets = [False, False]
+
+        first_group = True
+
+        def flush() -> Iterator[str]:
+            nonlocal first_group
+            if not group:
+                return
+            formatted = self._format_text("".join(group))
+            group.clear()
+            # A group that formats to leading newlines (e.g. a header) gets a
+            # paragraph pause of its own; in the whole document it merges with
+            # the previous group's trailing pause
+            if not first_group and formatted.startswith("...\n"):
+                formatted = formatted[3:]
+            first_group = False
+            yield from _PARAGRAPH_SPLIT.split(formatted)
+
+        def safe_to_cut(block: str) -> bool:
+            return (
+                size >= group_chars
+                and not any(count % 2 for count in counts)
+                and not any(open_brackets)
+                and not _JOINS_NEXT.search(group[-1])
+                and not _JOINS_PREVIOUS.match(block)
+            )
+
+        for piece in pieces:
+            if not html_checked and piece:
+                html_checked = True
+                if html is None:
+                    html = '<' in piece and '>' in piece
+                if html:
+                    parser = HTMLToText()
+            if parser:
+                parser.feed(piece)
+                piece = parser.get_text()
+                parser.text.clear()
+
+            pending += piece
+            # Only cut at blank lines followed by text in this piece; a trailing
+            # run of newlines may continue in the next piece
+            limit = len(pending.rstrip("\r\n"))
+            start = 0
+            for match in _BLOCK_BREAK.finditer(pending, 0, limit):
+                block = pending[start:match.end()]
+                start = match.end()
+                if group and safe_to_cut(block):
+                    yield from flush()
+                    size = 0
+                    counts = [0, 0, 0]
+                    open_brackets = [False, False]
+                group.append(block)
+                size += len(block)
+                for i, marker in enumerate('`*_'):
+                    counts[i] += block.count(marker)
+                for i, (opening, closing) in enumerate(('()', '[]')):
+                    last_open = block.rfind(opening)
+                    if last_open >= 0 or closing in block:
+                        open_brackets[i] = last_open > block.rfind(closing)
+            pending = pending[start:]
+
+        # The parser is not closed: like format(), an unterminated tag or
+        # entity at the end of the input is dropped
+        group.append(pending)
+        yield from flush()
+
+    def _pack_chunks(
+        self, paragraphs: Iterable[str], target_chars: Union[int, ChunkSchedule]
+    ) -> Iterator[Tuple[int, str]]:
+        """Pack formatted paragraphs into chunks of about each chunk's target size"""
+        schedule = ChunkSchedule.of(target_chars)
+        target = schedule.target(0)
+        # The current chunk's pieces and total length, joined once per chunk
+        parts: List[str] = []
+        size = 0
         chunk_index = 0
 
         for para in paragraphs:
@@ -449,35 +663,41 @@ class ProsodyFormatter:
                 continue
 
             # If adding this paragraph exceeds target, save current and start new
-            if current_chunk and len(current_chunk) + len(para) > target_chars:
-                chunks.append((chunk_index, current_chunk.strip()))
+            if parts and size + len(para) > target:
+                yield (chunk_index, "".join(parts).strip())
                 chunk_index += 1
-                current_chunk = para + "\n\n"
+                target = schedule.target(chunk_index)
+                parts = [para, "\n\n"]
+                size = len(para) + 2
             # If single paragraph is too long, split by sentences
-            elif len(para) > target_chars:
-                if current_chunk:
-                    chunks.append((chunk_index, current_chunk.strip()))
+            elif len(para) > target:
+                if parts:
+                    yield (chunk_index, "".join(parts).strip())
                     chunk_index += 1
-                    current_chunk = ""
+                    target = schedule.target(chunk_index)
+                    parts = []
+                    size = 0
 
                 # Split long paragraph by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', para)
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) > target_chars:
-                        if current_chunk:
-                            chunks.append((chunk_index, current_chunk.strip()))
+                for sentence in _SENTENCE_SPLIT.split(para):
+                    if size + len(sentence) > target:
+                        if parts:
+                            yield (chunk_index, "".join(parts).strip())
                             chunk_index += 1
-                        current_chunk = sentence + " "
-                    else:
-                        current_chunk += sentence + " "
+                            target = schedule.target(chunk_index)
+                        parts = []
+                        size = 0
+                    parts.append(sentence)
+                    parts.append(" ")
+                    size += len(sentence) + 1
             else:
-                current_chunk += para + "\n\n"
+                parts.append(para)
+                parts.append("\n\n")
+                size += len(para) + 2
 
         # Don't forget the last chunk
-        if current_chunk.strip():
-            chunks.append((chunk_index, current_chunk.strip()))
-
-        return chunks
+        if parts:
+            yield (chunk_index, "".join(parts).strip())
 
     def get_first_chunks(self, text: str, num_chunks: int = 2) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
         """
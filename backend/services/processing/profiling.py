@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+
+@dataclass
+class PassTiming:
+    """Time and size change of one text pass, summed over its calls"""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    chars_in: int = 0
+    chars_out: int = 0
+
+    @property
+    def size_delta(self) -> int:
+        return self.chars_out - self.chars_in
+
+
+class PassProfile:
+    """
+    Per-pass wall time and output size, filled in by ProsodyFormatter.format
+    and ContentCleaner.clean when one is passed as profile=. Passes called
+    more than once (e.g. once per paragraph group) are summed; one profile
+    can be reused across documents to aggregate them.
+    """
+
+    def __init__(self):
+        self.passes: Dict[str, PassTiming] = {}
+
+    def run(self, name: str, fn: Callable[[str], str], text: str) -> str:
+        """fn(text), recording its time and size change under name"""
+        started = time.perf_counter()
+        result = fn(text)
+        elapsed = time.perf_counter() - started
+        timing = self.passes.get(name)
+        if timing is None:
+            timing = self.passes[name] = PassTiming(name)
+        timing.calls += 1
+        timing.seconds += elapsed
+        timing.chars_in += len(text)
+        timing.chars_out += len(result)
+        return result
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(timing.seconds for timing in self.passes.values())
+
+    def slowest(self) -> List[PassTiming]:
+        return sorted(self.passes.values(), key=lambda timing: timing.seconds, reverse=True)
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "name": timing.name,
+                "calls": timing.calls,
+                "ms": timing.seconds * 1000,
+                "chars_in": timing.chars_in,
+                "chars_out": timing.chars_out,
+                "size_delta": timing.size_delta,
+            }
+            for timing in self.passes.values()
+        ]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+# A replacement is either a constant string or a callable that receives the
+# rule's own groups: index 0 is the whole match, 1.. are the rule's groups.
+Replacement = Union[str, Callable[[Tuple[str, ...]], str]]
+
+
+class RuleTable:
+    """
+    Compile an ordered list of (pattern, replacement) rules into a single
+    alternation with a group-indexed dispatch table.
+
+    At any position the first listed rule that matches wins, so merging is only
+    equivalent to running the rules one after another when no rule's match can
+    start inside another rule's match. Rules that need it carry their own
+    lookaheads to keep that property.
+
+    ``guard`` is an optional zero-width pattern that every rule implies (e.g. a
+    lookahead on the possible first characters). It is checked once per
+    position before any alternative is tried, which keeps long tables cheap.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, Replacement]],
+        flags: int = 0,
+        guard: str = "",
+    ):
+        parts = []
+        self._dispatch: Dict[int, Tuple[Replacement, int, int]] = {}
+        group = 1
+        for pattern, replacement in rules:
+            inner_groups = re.compile(pattern, flags).groups
+            parts.append(f"({pattern})")
+            self._dispatch[group] = (replacement, group, inner_groups)
+            group += 1 + inner_groups
+
+        self.pattern = re.compile(f"{guard}(?:{'|'.join(parts)})", flags)
+
+    def sub(self, text: str) -> str:
+        """Apply every rule to text in one scan"""
+        return self.pattern.sub(self._replace, text)
+
+    def _replace(self, match: re.Match) -> str:
+        # The wrapping group closes last, so lastindex identifies the rule
+        replacement, base, inner_groups = self._dispatch[match.lastindex]
+        if isinstance(replacement, str):
+            return replacement
+        return replacement(tuple(match.group(g) for g in range(base, base + inner_groups + 1)))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+from services.processing.chunking import ChunkSchedule, ChunkTable
+
+# A chunker returns (chunk_index, chunk_text) pairs or a ChunkTable of them
+Chunks = Union[ChunkTable, Iterable[Tuple[int, str]]]
+
+
+class DocumentSession(ChunkTable):
+    """
+    A registered document's chunk plan: its chunk table (all chunk texts in
+    one buffer, with word counts computed once at registration) plus the
+    session's ID and last access time.
+    """
+
+    __slots__ = ("document_id", "last_access")
+
+    def __init__(self, document_id: str, chunks: Chunks):
+        table = ChunkTable.from_chunks(chunks)
+        super().__init__(table.buffer, table.offsets, table.word_counts)
+        self.document_id = document_id
+        self.last_access = time.monotonic()
+
+
+class DocumentStore:
+    """
+    In-memory store of chunked documents, so chunk requests can refer to a
+    document ID instead of re-sending and re-formatting the full text.
+
+    IDs are derived from the text and chunking parameters, so registering the
+    same document twice returns the existing session. Sessions expire after
+    ttl_seconds without access, and the least recently used sessions are
+    evicted when the total size exceeds memory_bytes. on_remove is called with
+    the ID of every session that is removed, expired or evicted.
+    """
+
+    def __init__(
+        self,
+        chunker: Callable[[str, Union[int, ChunkSchedule]], Chunks],
+        memory_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 1800,
+        on_remove: Optional[Callable[[str], None]] = None,
+    ):
+        self.chunker = chunker
+        self.on_remove = on_remove
+        self.memory_bytes = memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._sessions: OrderedDict[str, DocumentSession] = OrderedDict()
+        self._used = 0
+
+    @staticmethod
+    def make_id(text: str, target_chars: Union[int, ChunkSchedule]) -> str:
+        digest = hashlib.sha256(f"{target_chars}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def register(
+        self, text: str, target_chars: Union[int, ChunkSchedule] = 800
+    ) -> DocumentSession:
+        """Chunk and store a document, or return its existing session"""
+        session = self.lookup(text, target_chars)
+        if session is not None:
+            return session
+        return self.add(text, target_chars, self.chunker(text, target_chars))
+
+    def lookup(
+        self, text: str, target_chars: Union[int, ChunkSchedule] = 800
+    ) -> Optional[DocumentSession]:
+        """Existing session for a text, without chunking it"""
+        return self.get(self.make_id(text, target_chars))
+
+    def add(
+        self, text: str, target_chars: Union[int, ChunkSchedule], chunks: Chunks
+    ) -> DocumentSession:
+        """
+        Store a document chunked elsewhere (e.g. by chunker in a worker
+        process); returns the existing session if one was added meanwhile
+        """
+        document_id = self.make_id(text, target_chars)
+        session = self.get(document_id)
+        if session is not None:
+            return session
+
+        session = DocumentSession(document_id, chunks)
+        self._sessions[document_id] = session
+        self._used += session.size_bytes
+        self._evict()
+        return session
+
+    def get(self, document_id: str) -> Optional[DocumentSession]:
+        """Look up a live session and refresh its TTL"""
+        self._expire()
+        session = self._sessions.get(document_id)
+        if session is not None:
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(document_id)
+        return session
+
+    def remove(self, document_id: str) -> bool:
+        session = self._sessions.pop(document_id, None)
+        if session is None:
+            return False
+        self._used -= session.size_bytes
+        if self.on_remove:
+            self.on_remove(document_id)
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "documents": len(self._sessions),
+            "bytes": self._used,
+            "budget_bytes": self.memory_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _expire(self) -> None:
+        # Sessions are kept in access order, so expired ones are at the front
+        deadline = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_access > deadline:
+                break
+            self.remove(oldest.document_id)
+            self.evictions += 1
+
+    def _evict(self) -> None:
+        # Always keep the newest session, even if it alone exceeds the budget
+        while self._used > self.memory_bytes and len(self._sessions) > 1:
+            self.remove(next(iter(self._sessions)))
+            self.evictions += 1
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable, List, Literal, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class WorkerTimeout(Exception):
+    """A task ran past its time budget and was cancelled"""
+
+
+@dataclass
+class WorkerStats:
+    """Counters for CPU tasks since startup"""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    restarts: int = 0  # worker processes replaced after a timeout or crash
+    max_queued: int = 0
+    queue_wait_seconds: float = 0.0  # total time tasks waited for a worker
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker process loop: run (fn, args) messages until the pipe closes"""
+    # Tell the pool the interpreter is up and the worker can take tasks
+    conn.send(None)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        fn, args = message
+        try:
+            result = (True, fn(*args))
+        except Exception as e:
+            result = (False, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, context: Any):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self) -> None:
+        """Block until the process has started; EOFError if it died instead"""
+        self.conn.recv()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Runs CPU-bound functions (extraction, cleaning, formatting) off the event
+    loop.
+
+    In "process" mode each task runs in one of max_workers worker processes,
+    so it neither holds the event loop nor the GIL; a task that exceeds its
+    time budget has its process killed and replaced. Functions and arguments
+    must be picklable, which in practice means module-level functions or
+    methods of plain objects. "thread" mode runs tasks in a thread pool
+    instead: no pickling or process start-up, but a timed-out task cannot be
+    stopped, only abandoned, and pure-Python work still contends for the GIL.
+    """
+
+    def __init__(
+        self,
+        mode: Literal["process", "thread"] = "process",
+        max_workers: int | None = None,
+        task_timeout: float | None = 30.0,
+    ):
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.task_timeout = task_timeout
+        self.stats = WorkerStats()
+        self._queued = 0
+        self._running = 0
+        # Thread-mode workers update the queue counters from their own threads
+        self._lock = threading.Lock()
+        self._started = False
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._idle: Optional[asyncio.Queue[_Worker]] = None
+        self._workers: List[_Worker] = []
+        self._spawning: Set[asyncio.Task] = set()
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self) -> None:
+        """Start the workers; called by run() if needed"""
+        if self._started:
+            return
+        self._started = True
+        if self.mode == "thread":
+            self._threads = ThreadPoolExecutor(self.max_workers, thread_name_prefix="cpu-worker")
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.max_workers):
+            self._spawn()
+
+    async def close(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        if self._threads:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        # Workers still starting stop themselves once they are up
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        workers, self._workers = self._workers, []
+        await asyncio.to_thread(lambda: [worker.stop() for worker in workers])
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+    ) -> T:
+        """
+        Run fn(*args) in the pool and return its result. Raises whatever fn
+        raised, or WorkerTimeout if it took longer than its budget.
+        """
+        self.start()
+        budget = timeout if timeout is not None else self.task_timeout
+        self.stats.submitted += 1
+        with self._lock:
+            self._queued += 1
+            self.stats.max_queued = max(self.stats.max_queued, self._queued)
+        if self.mode == "thread":
+            return await self._run_thread(fn, args, budget)
+        return await self._run_process(fn, args, budget)
+
+    def _dequeue(self, queued_at: float) -> None:
+        # Called with self._lock held
+        self.stats.queue_wait_seconds += time.perf_counter() - queued_at
+        self._queued -= 1
+        self._running += 1
+
+    async def _run_thread(self, fn, args, budget) -> Any:
+        queued_at = time.perf_counter()
+        state = {"picked": False, "abandoned": False}
+
+        def call():
+            with self._lock:
+                if state["abandoned"]:
+                    return None
+                state["picked"] = True
+                self._dequeue(queued_at)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(loop.run_in_executor(self._threads, call), budget)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise WorkerTimeout(f"Task exceeded its {budget:g}s budget") from None
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            with self._lock:
+                if not state["picked"]:
+                    state["abandoned"] = True
+                    self._queued -= 1
+        self.stats.completed += 1
+        return result
+
+    async def _run_process(self, fn, args, budget) -> Any:
+        queued_at = time.perf_counter()
+        try:
+            worker = await self._idle.get()
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        with self._lock:
+            self._dequeue(queued_at)
+        healthy = False
+        try:
+            # Pickling a large task, and writing it while the pipe is full,
+            # both block
+            await asyncio.to_thread(worker.conn.send, (fn, args))
+            ok, value = await asyncio.wait_for(asyncio.to_thread(worker.conn.recv), budget)
+            healthy = True
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise WorkerTimeout(f"Task exceeded its {budget:g}s budget") from None
+        except (EOFError, OSError) as e:
+            self.stats.failed += 1
+            raise RuntimeError("Worker process died") from e
+        finally:
+            with self._lock:
+                self._running -= 1
+            if healthy:
+                self._idle.put_nowait(worker)
+            else:
+                # Timed out, cancelled or crashed: the worker may still be
+                # busy, so kill it and start a fresh one in its place
+                self._replace(worker)
+        if not ok:
+            self.stats.failed += 1
+            raise value
+        self.stats.completed += 1
+        return value
+
+    def _replace(self, worker: _Worker) -> None:
+        self.stats.restarts += 1
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self._spawn(dead=worker)
+
+    def _spawn(self, dead: Optional[_Worker] = None) -> None:
+        """Start a worker (after killing dead) without blocking the event loop"""
+        task = asyncio.get_running_loop().create_task(self._start_worker(dead))
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _start_worker(self, dead: Optional[_Worker]) -> None:
+        # Killing waits for the process to exit, and a new process is only
+        # useful once its interpreter is up, which takes a while in spawn
+        # mode: both happen in threads, and the worker goes to the idle
+        # queue once it is ready, so no task's budget is spent on start-up
+        if dead is not None:
+            await asyncio.to_thread(dead.kill)
+        while self._started:
+            worker = None
+            try:
+                worker = await asyncio.to_thread(_Worker, self._context)
+                await asyncio.to_thread(worker.wait_ready)
+            except (EOFError, OSError) as e:
+                print(f"Worker process failed to start, retrying: {e}")
+                if worker is not None:
+                    await asyncio.to_thread(worker.kill)
+                await asyncio.sleep(1)
+                continue
+            if not self._started:
+                await asyncio.to_thread(worker.stop)
+                return
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+            return
+
+    def snapshot(self) -> dict:
+        return {
+            **asdict(self.stats),
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "queued": self._queued,
+            "running": self._running,
+        }
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from api.routes import content, tts
+from services.audio import backends
+from services.processing.workers import WorkerPool
+
+
+class FakeCommunicate:
+    """Stands in for edge_tts.Communicate; records every synthesis request"""
+
+    calls = []
+
+    def __init__(self, text, voice, rate="+0%", **kwargs):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        FakeCommunicate.calls.append((text, voice, rate))
+
+    async def stream(self):
+        yield {"type": "WordBoundary", "offset": 0, "duration": 1, "text": self.text[:5]}
+        for i in range(3):
+            # Like a network stream, let other tasks run between chunks
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": f"{self.text}|{self.voice}|{self.rate}|{i};".encode()}
+
+
+@pytest.fixture
+def fake_communicate(monkeypatch):
+    FakeCommunicate.calls = []
+    monkeypatch.setattr(backends.edge_tts, "Communicate", FakeCommunicate)
+    return FakeCommunicate
+
+
+@pytest.fixture(autouse=True)
+async def worker_pool(monkeypatch):
+    """Run CPU work in threads: tests patch in unpicklable callables"""
+    pool = WorkerPool(mode="thread", max_workers=2)
+    monkeypatch.setattr(tts, "worker_pool", pool)
+    monkeypatch.setattr(content, "worker_pool", pool)
+    yield pool
+    await pool.close()
@@ -0,0 +1,120 @@
+import json
+import time
+
+from services.audio.cache import AudioCache
+from services.audio.edge_tts import EdgeTTSService
+
+
+async def test_memory_tier_evicts_least_recently_used_by_bytes():
+    cache = AudioCache(memory_bytes=10, cache_dir=None)
+
+    await cache.put("a", b"aaaa")
+    await cache.put("b", b"bbbb")
+    assert await cache.get("a") == b"aaaa"  # "a" is now most recent
+    await cache.put("c", b"cccc")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"aaaa"
+    assert cache.stats.memory_evictions == 1
+
+
+async def test_oversized_entries_skip_memory_tier():
+    cache = AudioCache(memory_bytes=4, cache_dir=None)
+
+    await cache.put("big", b"0123456789")
+
+    assert await cache.get("big") is None
+    assert cache.snapshot()["memory_entries"] == 0
+
+
+async def test_disk_tier_survives_restart(tmp_path):
+    cache = AudioCache(memory_bytes=1024, cache_dir=str(tmp_path), disk_bytes=1024)
+    await cache.put("k1", b"audio-1")
+    await cache.put("k2", b"audio-2")
+
+    restarted = AudioCache(memory_bytes=1024, cache_dir=str(tmp_path), disk_bytes=1024)
+
+    assert await restarted.get("k1") == b"audio-1"
+    assert restarted.stats.disk_hits == 1
+    assert await restarted.get("k1") == b"audio-1"
+    assert restarted.stats.memory_hits == 1
+
+
+async def test_disk_eviction_follows_persisted_access_order(tmp_path):
+    cache = AudioCache(memory_bytes=0, cache_dir=str(tmp_path), disk_bytes=20)
+    await cache.put("old", b"x" * 8)
+    await cache.put("new", b"y" * 8)
+    assert await cache.get("old") == b"x" * 8
+    cache.flush()
+
+    restarted = AudioCache(memory_bytes=0, cache_dir=str(tmp_path), disk_bytes=20)
+    await restarted.put("third", b"z" * 8)
+
+    assert await restarted.get("new") is None
+    assert await restarted.get("old") == b"x" * 8
+    assert restarted.stats.disk_evictions == 1
+    restarted.flush()
+    assert set(json.loads((tmp_path / AudioCache.INDEX_FILE).read_text())) == {"old", "third"}
+
+
+async def test_disk_writes_are_journaled_and_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(AudioCache, "MIN_JOURNAL_RECORDS", 4)
+    cache = AudioCache(memory_bytes=0, cache_dir=str(tmp_path), disk_bytes=1024)
+    index = tmp_path / AudioCache.INDEX_FILE
+    journal = tmp_path / AudioCache.JOURNAL_FILE
+
+    for key in "abc":
+        await cache.put(key, key.encode() * 8)
+    assert json.loads(index.read_text()) == {}
+    assert len(journal.read_text().splitlines()) == 3
+
+    # With four entries on disk, every put also evicts one
+    cache.disk_bytes = 32
+    for key in "defghij":
+        await cache.put(key, key.encode() * 8)
+    assert json.loads(index.read_text())
+    assert len(journal.read_text().splitlines()) <= 4
+
+    restarted = AudioCache(memory_bytes=0, cache_dir=str(tmp_path), disk_bytes=32)
+    assert list(restarted._index) == list(cache._index) == list("ghij")
+    assert not journal.exists()
+
+
+async def test_expired_entries_are_dropped(tmp_path):
+    cache = AudioCache(memory_bytes=1024, cache_dir=str(tmp_path), ttl_seconds=60)
+    await cache.put("k", b"audio")
+    cache._memory["k"] = (b"audio", time.time() - 120)
+    cache._index["k"]["created"] -= 120
+
+    assert await cache.get("k") is None
+    assert cache.stats.expired == 2
+    assert not list(tmp_path.glob("*/*.mp3"))
+
+
+async def test_generate_audio_uses_cache(fake_communicate):
+    service = EdgeTTSService(cache=AudioCache(cache_dir=None))
+
+    first = await service.generate_audio("Hello there.", speed=1.5)
+    second = await service.generate_audio("Hello there.", speed=1.5)
+    await service.generate_audio("Hello there.", speed=1.0)
+
+    assert first == second
+    assert len(fake_communicate.calls) == 2
+    assert service.cache.stats.hits == 1
+    assert service.cache.stats.misses == 2
+
+
+async def test_stream_audio_caches_only_complete_streams(fake_communicate):
+    service = EdgeTTSService(cache=AudioCache(cache_dir=None))
+
+    stream = service.stream_audio("Partial")
+    await stream.__anext__()
+    await stream.aclose()
+    assert service.cache.snapshot()["memory_entries"] == 0
+
+    streamed = b"".join([part async for part in service.stream_audio("Full")])
+    cached = [part async for part in service.stream_audio("Full")]
+
+    assert cached == [streamed]
+    assert await service.generate_audio("Full") == streamed
+    assert len(fake_communicate.calls) == 2
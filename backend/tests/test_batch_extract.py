@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import content
+from services.content.cache import ExtractionCache
+from services.content.fetcher import PageFetcher
+
+ARTICLE_HTML = (
+    "<html><head><title>Batch article</title></head><body><article>"
+    + "<p>This paragraph is long enough to count as readable article content.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+class Origins:
+    """fast.test answers at once, slow.test hangs, broken.test fails"""
+
+    def __init__(self):
+        self.in_flight = {}
+        self.max_in_flight = {}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+        try:
+            if host == "slow.test":
+                await asyncio.sleep(5)
+            await asyncio.sleep(0.01)
+            if host == "broken.test":
+                return httpx.Response(500)
+            return httpx.Response(200, html=ARTICLE_HTML)
+        finally:
+            self.in_flight[host] -= 1
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    origins = Origins()
+    fetcher = PageFetcher(max_per_host=2)
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(origins.handler))
+    monkeypatch.setattr(content, "fetcher", fetcher)
+    monkeypatch.setattr(content, "extraction_cache", ExtractionCache())
+    monkeypatch.setattr(content.settings, "extract_batch_concurrency", 4)
+    monkeypatch.setattr(content.settings, "extract_batch_url_timeout_seconds", 0.5)
+    app = FastAPI()
+    app.include_router(content.router, prefix="/v1/content")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        c.origins = origins
+        yield c
+
+
+async def test_batch_streams_results_as_they_complete(client):
+    urls = (
+        ["https://slow.test/a", "https://broken.test/a"]
+        + [f"https://fast.test/{i}" for i in range(10)]
+    )
+
+    response = await client.post("/v1/content/extract/batch", json={"urls": urls})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == list(range(len(urls)))
+    # The hanging host finishes last and does not hold up the others
+    assert lines[-1] == {
+        "index": 0,
+        "url": "https://slow.test/a",
+        "ok": False,
+        "status": 504,
+        "error": "Extraction timed out",
+    }
+    by_url = {line["url"]: line for line in lines}
+    assert by_url["https://broken.test/a"]["status"] == 400
+    fast = [line for line in lines if "fast.test" in line["url"]]
+    assert all(line["ok"] and line["title"] == "Batch article" for line in fast)
+    assert client.origins.max_in_flight["fast.test"] == 2
+
+
+async def test_batch_rejects_too_many_urls(client, monkeypatch):
+    monkeypatch.setattr(content.settings, "extract_batch_max_urls", 2)
+
+    response = await client.post(
+        "/v1/content/extract/batch",
+        json={"urls": [f"https://fast.test/{i}" for i in range(3)]},
+    )
+
+    assert response.status_code == 400
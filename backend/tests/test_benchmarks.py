@@ -0,0 +1,91 @@
+"""Smoke tests for the pipeline benchmark suite"""
+
+import pytest
+
+from benchmarks import adversarial, passes
+from benchmarks.corpus import KINDS, SIZES, build_document
+from benchmarks.pipeline import compare, run_case
+from services.content.cleaner import ContentCleaner
+from services.processing.formatter import ProsodyFormatter
+from services.processing.profiling import PassProfile
+
+
+@pytest.mark.parametrize("kind", list(KINDS))
+def test_documents_reach_target_size(kind):
+    doc = build_document(kind, "10KB")
+
+    assert SIZES["10KB"] <= doc.size_bytes < SIZES["10KB"] * 1.2
+
+
+def test_html_documents_stay_well_formed():
+    doc = build_document("article_html", "100KB")
+
+    assert doc.text.count("<html") == 1
+    assert doc.text.rstrip().endswith("</html>")
+
+
+def test_run_case_reports_timings_and_memory():
+    doc = build_document("plain", "1KB")
+
+    result = run_case("formatter.format", ProsodyFormatter().format, doc, min_rounds=3, min_time=0)
+
+    assert result["rounds"] >= 3
+    assert result["p50_ms"] <= result["p99_ms"]
+    assert result["throughput_mb_s"] > 0
+    assert result["peak_memory_bytes"] > 0
+
+
+def test_compare_flags_regressions():
+    def report(p50):
+        return {"meta": {}, "results": [
+            {"target": "formatter.format", "kind": "plain", "size": "1KB", "p50_ms": p50},
+        ]}
+
+    assert compare(report(1.5), report(1.0), threshold=0.1) == 1
+    assert compare(report(1.05), report(1.0), threshold=0.1) == 0
+
+
+def test_scaling_exponent():
+    sizes = [1_000, 10_000, 100_000]
+
+    assert adversarial.scaling_exponent(sizes, [s * 1e-6 for s in sizes]) == pytest.approx(1.0)
+    assert adversarial.scaling_exponent(sizes, [s * s * 1e-9 for s in sizes]) == pytest.approx(2.0)
+
+
+def test_promo_removal_scales_linearly_on_run_on_text():
+    report = adversarial.run(
+        [8 * 1024, 32 * 1024, 128 * 1024],
+        targets=["cleaner.remove_promo"],
+        kinds=["run_on"],
+        min_rounds=3,
+        min_time=0,
+    )
+
+    assert report["results"][0]["exponent"] < 1.5
+
+
+def test_profiling_records_every_pass_without_changing_output():
+    text = build_document("article_html", "10KB").text
+    formatter, cleaner = ProsodyFormatter(), ContentCleaner()
+    profile = PassProfile()
+
+    assert formatter.format(text, profile=profile) == formatter.format(text)
+    assert cleaner.clean(text, profile=profile) == cleaner.clean(text)
+
+    expected = {"_html_to_text", "_extract_html", *ProsodyFormatter.PASSES, *ContentCleaner.PASSES}
+    assert set(profile.passes) == expected
+    assert all(timing.calls == 1 for timing in profile.passes.values())
+    assert profile.passes["_html_to_text"].size_delta < 0
+
+
+def test_pass_profile_ranks_passes_and_documents(tmp_path):
+    (tmp_path / "short.txt").write_text("Hello world. " * 10)
+    (tmp_path / "long.md").write_text("# Title\n\n- item one\n- item two\n\n" * 200)
+
+    report = passes.profile_documents(passes.find_documents(tmp_path), repeat=1, root=tmp_path)
+
+    assert report["passes"][0]["ms"] >= report["passes"][-1]["ms"]
+    for target in ("formatter", "cleaner"):
+        shares = [p["share"] for p in report["passes"] if p["target"] == target]
+        assert sum(shares) == pytest.approx(1.0)
+    assert report["documents"][0]["path"] == "long.md"
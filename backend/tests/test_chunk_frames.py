@@ -0,0 +1,89 @@
+import base64
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.frames import MEDIA_TYPE, decode_frames, encode_frame
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+ARTICLE = "\n\n".join(f"Paragraph number {i} of the article." for i in range(6))
+
+
+def test_frames_round_trip():
+    data = encode_frame({"index": 0}, b"\x00\xffaudio") + encode_frame({"type": "summary"})
+
+    assert list(decode_frames(data)) == [
+        ({"index": 0}, b"\x00\xffaudio"),
+        ({"type": "summary"}, b""),
+    ]
+    with pytest.raises(ValueError):
+        list(decode_frames(data[:-3]))
+
+
+@pytest.fixture
+async def client(monkeypatch, fake_communicate):
+    monkeypatch.setattr(tts, "tts_service", EdgeTTSService())
+    monkeypatch.setattr(
+        tts, "document_store", DocumentStore(chunker=ProsodyFormatter().chunk_for_streaming)
+    )
+    monkeypatch.setattr(tts.settings, "prefetch_enabled", False)
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_frames_carry_same_audio_as_json(client):
+    plan = (
+        await client.post("/v1/tts/documents", json={"text": ARTICLE, "target_chars": 30})
+    ).json()
+    body = {"document_id": plan["document_id"], "chunk_indices": [2, 0, 1]}
+    as_json = (await client.post("/v1/tts/chunks/generate", json=body)).json()
+    response = await client.post(
+        "/v1/tts/chunks/generate", json={**body, "response_format": "frames"}
+    )
+
+    assert response.headers["content-type"] == MEDIA_TYPE
+    decoded = list(decode_frames(response.content))
+    chunks, (summary, _) = decoded[:-1], decoded[-1]
+
+    assert [h["index"] for h, _ in chunks] == [2, 0, 1]
+    for (header, audio), expected in zip(chunks, as_json["generated_chunks"]):
+        assert header["type"] == "chunk"
+        assert header["word_count"] == expected["word_count"]
+        assert audio == base64.b64decode(expected["audio_base64"])
+
+    assert summary["type"] == "summary"
+    for field in ("document_id", "total_chunks", "next_chunk_indices", "is_complete", "failed_chunks"):
+        assert summary[field] == as_json[field]
+
+
+async def test_failed_chunk_frame_has_error_and_no_audio(client, fake_communicate, monkeypatch):
+    original_stream = fake_communicate.stream
+
+    async def stream(self):
+        if "number 1 " in self.text:
+            raise RuntimeError("upstream rejected chunk")
+        async for event in original_stream(self):
+            yield event
+
+    monkeypatch.setattr(fake_communicate, "stream", stream)
+    plan = (
+        await client.post("/v1/tts/documents", json={"text": ARTICLE, "target_chars": 10})
+    ).json()
+    indices = [c["index"] for c in plan["chunks"]]
+    response = await client.post(
+        "/v1/tts/chunks/generate",
+        json={"document_id": plan["document_id"], "chunk_indices": indices, "response_format": "frames"},
+    )
+
+    decoded = list(decode_frames(response.content))
+    failed = [(h, a) for h, a in decoded[:-1] if "error" in h]
+    assert len(failed) == 1 and failed[0][1] == b""
+    assert decoded[-1][0]["failed_chunks"] == [failed[0][0]["index"]]
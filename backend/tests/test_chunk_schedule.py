@@ -0,0 +1,65 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.processing.chunking import ChunkSchedule
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+SENTENCE = "The committee met on Tuesday to review the budget for the coming year."
+ARTICLE = "\n\n".join(" ".join([SENTENCE] * 8) for _ in range(6))
+
+
+def test_targets_ramp_up_to_the_ceiling():
+    schedule = ChunkSchedule(first_chars=150, growth=2.0, max_chars=800)
+
+    assert [schedule.target(i) for i in range(6)] == [150, 300, 600, 800, 800, 800]
+    assert schedule.target(10 ** 6) == 800
+    assert ChunkSchedule.fixed(400).target(5) == 400
+    with pytest.raises(ValueError):
+        ChunkSchedule(growth=0.5)
+
+
+def test_first_chunk_is_about_a_sentence_and_chunks_grow():
+    formatter = ProsodyFormatter()
+    schedule = ChunkSchedule()
+    chunks = [text for _, text in formatter.chunk_for_streaming(ARTICLE, schedule)]
+    fixed = formatter.chunk_for_streaming(ARTICLE, 800)
+
+    assert len(chunks[0]) <= schedule.first_chars < len(fixed[0][1]) / 3
+    assert len(chunks[1]) > len(chunks[0])
+    assert all(len(text) <= schedule.target(i) for i, text in enumerate(chunks))
+    assert max(len(text) for text in chunks) > schedule.target(1)
+    # Cuts fall only at sentence ends, and no text is lost
+    assert all(text.endswith(".") for text in chunks)
+    assert " ".join(chunks).split() == " ".join(text for _, text in fixed).split()
+    assert list(formatter.iter_chunks(ARTICLE, schedule)) == list(enumerate(chunks))
+
+
+def test_fixed_schedule_matches_plain_target():
+    formatter = ProsodyFormatter()
+
+    assert formatter.chunk_for_streaming(ARTICLE, ChunkSchedule.fixed(300)) == (
+        formatter.chunk_for_streaming(ARTICLE, 300)
+    )
+
+
+async def test_schedule_is_tunable_per_request(monkeypatch):
+    monkeypatch.setattr(
+        tts, "document_store", DocumentStore(chunker=ProsodyFormatter().chunk_for_streaming)
+    )
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        ramped = (await client.post("/v1/tts/documents", json={"text": ARTICLE})).json()
+        flat = (await client.post(
+            "/v1/tts/documents", json={"text": ARTICLE, "first_chunk_chars": 800}
+        )).json()
+        invalid = await client.post("/v1/tts/documents", json={"text": ARTICLE, "chunk_growth": 0})
+
+    assert ramped["document_id"] != flat["document_id"]
+    assert ramped["chunks"][0]["char_count"] < flat["chunks"][0]["char_count"]
+    assert ramped["total_words"] == flat["total_words"]
+    assert invalid.status_code == 400
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio import backends
+from services.audio.edge_tts import EdgeTTSService
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+
+class SlowCommunicate:
+    """Fake upstream that tracks concurrency and fails on texts containing FAIL"""
+
+    active = 0
+    peak = 0
+    finished = []
+
+    def __init__(self, text, voice, rate="+0%", **kwargs):
+        self.text = text
+
+    async def stream(self):
+        cls = SlowCommunicate
+        cls.active += 1
+        cls.peak = max(cls.peak, cls.active)
+        try:
+            # Later texts finish first, so ordering has to be restored
+            await asyncio.sleep(0.05 / (len(cls.finished) + 1))
+            if "FAIL" in self.text:
+                raise RuntimeError("upstream rejected chunk")
+            yield {"type": "audio", "data": self.text.encode()}
+        finally:
+            cls.active -= 1
+            cls.finished.append(self.text)
+
+
+@pytest.fixture
+def slow_communicate(monkeypatch):
+    SlowCommunicate.active = SlowCommunicate.peak = 0
+    SlowCommunicate.finished = []
+    monkeypatch.setattr(backends.edge_tts, "Communicate", SlowCommunicate)
+    return SlowCommunicate
+
+
+async def test_batch_keeps_order_and_caps_concurrency(slow_communicate):
+    service = EdgeTTSService(max_concurrency=8)
+    texts = [f"chunk {i}" for i in range(6)]
+
+    results = await service.generate_batch(texts, max_concurrency=3)
+
+    assert results == [t.encode() for t in texts]
+    assert slow_communicate.peak == 3
+
+
+async def test_global_cap_applies_across_batches(slow_communicate):
+    service = EdgeTTSService(max_concurrency=2)
+
+    await asyncio.gather(
+        service.generate_batch(["a", "b", "c"], max_concurrency=3),
+        service.generate_batch(["d", "e", "f"], max_concurrency=3),
+    )
+
+    assert slow_communicate.peak == 2
+
+
+async def test_failed_chunk_is_reported_alone(slow_communicate, monkeypatch):
+    text = "\n\n".join(["First paragraph here.", "FAIL paragraph.", "Third one."])
+    store = DocumentStore(chunker=ProsodyFormatter().chunk_for_streaming)
+    session = store.register(text, 10)
+    indices = list(range(len(session)))
+    failing = [i for i in indices if "FAIL" in session.chunk(i)]
+    monkeypatch.setattr(tts, "document_store", store)
+    monkeypatch.setattr(tts, "tts_service", EdgeTTSService())
+    monkeypatch.setattr(tts.settings, "prefetch_enabled", False)
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/v1/tts/chunks/generate",
+            json={"document_id": session.document_id, "chunk_indices": indices},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["index"] for c in body["generated_chunks"]] == indices
+    assert len(failing) == 1 and body["failed_chunks"] == failing
+    for chunk in body["generated_chunks"]:
+        if chunk["index"] in failing:
+            assert "upstream rejected" in chunk["error"]
+        else:
+            assert "audio_base64" in chunk
@@ -0,0 +1,47 @@
+from services.content.extractor import ContentExtractor
+
+ARTICLE = (
+    '<html><head><meta property="og:title" content="Open Graph title">'
+    '<meta property="og:site_name" content="Example News"><title>Tab title</title></head>'
+    "<body><nav>Home | World | Sport</nav><article>"
+    + "<p>This paragraph is long enough to count as readable article content.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+def test_extracts_with_one_parse_per_document():
+    extractor = ContentExtractor()
+
+    result = extractor.extract_from_html(ARTICLE)
+
+    assert result["title"] == "Open Graph title"
+    assert result["site_name"] == "Example News"
+    assert "readable article content" in result["content"]
+    assert "Sport" not in result["content"]
+    stats = extractor.snapshot()
+    assert stats["parses"] == 1
+    assert stats["parse_ms_per_document"] > 0
+
+
+def test_fallback_reads_main_content_from_the_same_tree():
+    html = (
+        "<html><head><title> Fallback page </title></head><body>"
+        "<nav>Menu</nav><div class='post wide'>"
+        + "<span>line of text</span><br>" * 15
+        + "<script>track()</script></div></body></html>"
+    )
+    extractor = ContentExtractor()
+    tree = extractor._parse(html)
+
+    assert extractor._extract_title(tree) == "Fallback page"
+    assert extractor._extract_site_name(tree) is None
+    assert extractor._fallback_extract(tree).split("\n") == ["line of text"] * 15
+    assert extractor.stats.parses == 1
+
+
+def test_title_falls_back_to_h1():
+    extractor = ContentExtractor()
+
+    assert extractor.extract_from_html(
+        "<html><body><h1> Heading <b>text</b> </h1>" + "<p>word</p>" * 60 + "</body></html>"
+    )["title"] == "Heading text"
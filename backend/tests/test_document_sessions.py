@@ -0,0 +1,146 @@
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio.cache import AudioCache
+from services.audio.prefetch import Prefetcher
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+ARTICLE = "\n\n".join(
+    f"Paragraph {i} talks about topic {i}. It has a second sentence for length."
+    for i in range(40)
+)
+
+
+def counting_chunker():
+    formatter = ProsodyFormatter()
+    calls = []
+
+    def chunk(text, target_chars):
+        calls.append(text)
+        return formatter.chunk_for_streaming(text, target_chars)
+
+    return chunk, calls
+
+
+def test_session_chunks_match_chunker():
+    formatter = ProsodyFormatter()
+    store = DocumentStore(chunker=formatter.chunk_for_streaming)
+
+    session = store.register(ARTICLE, 200)
+    expected = formatter.chunk_for_streaming(ARTICLE, 200)
+
+    assert len(session) == len(expected) > 1
+    assert [session.chunk(i) for i in range(len(session))] == [t for _, t in expected]
+    assert list(session.word_counts) == [len(t.split()) for _, t in expected]
+
+
+def test_chunk_table_spans_one_buffer():
+    formatter = ProsodyFormatter()
+    expected = formatter.chunk_for_streaming(ARTICLE, 200)
+
+    table = formatter.chunk_table(ARTICLE, 200)
+    session = DocumentStore(chunker=formatter.chunk_table).register(ARTICLE, 200)
+
+    assert list(table) == expected
+    assert table.buffer == "".join(text for _, text in expected)
+    assert [table.char_count(i) for i in range(len(table))] == [len(t) for _, t in expected]
+    assert table.preview(1, 10) == expected[1][1][:10]
+    assert list(session) == expected
+
+
+def test_register_is_idempotent_and_formats_once():
+    chunker, calls = counting_chunker()
+    store = DocumentStore(chunker=chunker)
+
+    first = store.register(ARTICLE)
+    second = store.register(ARTICLE)
+
+    assert first is second
+    assert len(calls) == 1
+    assert store.register(ARTICLE, 300).document_id != first.document_id
+
+
+def test_store_evicts_least_recently_used_over_budget():
+    chunker, _ = counting_chunker()
+    probe = DocumentStore(chunker=chunker).register("a" * 1000)
+    store = DocumentStore(chunker=chunker, memory_bytes=probe.size_bytes * 2 + 100)
+
+    a = store.register("a" * 1000)
+    b = store.register("b" * 1000)
+    store.get(a.document_id)
+    store.register("c" * 1000)
+
+    assert store.get(b.document_id) is None
+    assert store.get(a.document_id) is a
+    assert store.evictions == 1
+
+
+def test_sessions_expire_after_ttl(monkeypatch):
+    chunker, _ = counting_chunker()
+    store = DocumentStore(chunker=chunker, ttl_seconds=60)
+    session = store.register(ARTICLE)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert store.get(session.document_id) is None
+    assert store.snapshot()["documents"] == 0
+
+
+@pytest.fixture
+async def client(monkeypatch, fake_communicate):
+    chunker, calls = counting_chunker()
+    monkeypatch.setattr(tts, "document_store", DocumentStore(chunker=chunker))
+    monkeypatch.setattr(tts.tts_service, "cache", AudioCache(cache_dir=None))
+    prefetcher = Prefetcher(tts.tts_service)
+    monkeypatch.setattr(tts, "prefetcher", prefetcher)
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        c.chunker_calls = calls
+        yield c
+    prefetcher.close()
+
+
+async def test_chunks_generate_by_document_id(client):
+    plan = (await client.post("/v1/tts/documents", json={"text": ARTICLE})).json()
+    assert plan["total_chunks"] > 2
+
+    for index in range(plan["total_chunks"]):
+        response = await client.post(
+            "/v1/tts/chunks/generate",
+            json={"document_id": plan["document_id"], "chunk_indices": [index]},
+        )
+        assert response.status_code == 200
+        generated = response.json()["generated_chunks"]
+        assert [c["index"] for c in generated] == [index]
+
+    assert len(client.chunker_calls) == 1
+
+
+async def test_inline_text_requests_reuse_session(client):
+    for indices in ([0, 1], [2, 3]):
+        response = await client.post(
+            "/v1/tts/chunks/generate", json={"text": ARTICLE, "chunk_indices": indices}
+        )
+        assert response.status_code == 200
+
+    assert len(client.chunker_calls) == 1
+
+
+async def test_unknown_document_returns_404(client):
+    response = await client.post(
+        "/v1/tts/chunks/generate", json={"document_id": "missing", "chunk_indices": [0]}
+    )
+    assert response.status_code == 404
+
+    plan = (await client.post("/v1/tts/documents", json={"text": ARTICLE})).json()
+    assert (await client.delete(f"/v1/tts/documents/{plan['document_id']}")).status_code == 200
+    assert (await client.get(f"/v1/tts/documents/{plan['document_id']}")).status_code == 404
@@ -0,0 +1,114 @@
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import content
+from services.content.cache import ExtractedArticle, ExtractionCache, normalize_url
+from services.content.fetcher import PageFetcher
+
+ARTICLE_HTML = (
+    "<html><head><title>Cached article</title></head><body><article>"
+    + "<p>This paragraph is long enough to count as readable article content.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1&utm_source=x#top") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    cache = ExtractionCache(memory_bytes=25)
+    for name in "abc":
+        cache.put(f"https://example.com/{name}", ExtractedArticle("t", "x" * 9, 1))
+        cache.get("https://example.com/a")
+
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/c") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_cache_expires_after_ttl(monkeypatch):
+    cache = ExtractionCache(fresh_seconds=60, ttl_seconds=3600)
+    cache.put("https://example.com/a", ExtractedArticle("t", "body", 1))
+    entry = cache.get("https://example.com/a")
+    now = time.monotonic()
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 120)
+    assert not cache.is_fresh(entry)
+    assert cache.get("https://example.com/a") is entry
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 3601)
+    assert cache.get("https://example.com/a") is None
+    assert cache.stats.expired == 1
+
+
+class Origin:
+    """Serves one article with an ETag and answers 304 when it matches"""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, html=ARTICLE_HTML, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    origin = Origin()
+    fetcher = PageFetcher()
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(origin.handler))
+    monkeypatch.setattr(content, "fetcher", fetcher)
+    monkeypatch.setattr(content, "extraction_cache", ExtractionCache(fresh_seconds=60))
+    return origin
+
+
+@pytest.fixture
+async def client(origin):
+    app = FastAPI()
+    app.include_router(content.router, prefix="/v1/content")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_extract_revalidates_stale_entries(client, origin, monkeypatch):
+    extractions = []
+    extract = content.extract_article
+    monkeypatch.setattr(
+        content,
+        "extract_article",
+        lambda html, url=None: extractions.append(url) or extract(html, url),
+    )
+    body = {"url": "https://example.com/post"}
+
+    first = (await client.post("/v1/content/extract", json=body)).json()
+    fresh = (await client.post("/v1/content/extract", json=body)).json()
+    assert first == fresh
+    assert len(origin.requests) == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    revalidated = (await client.post("/v1/content/extract", json=body)).json()
+    assert revalidated == first
+    assert origin.requests[-1].headers["If-None-Match"] == '"v1"'
+
+    origin.etag = '"v2"'
+    monkeypatch.setattr(time, "monotonic", lambda: now + 122)
+    await client.post("/v1/content/extract", json=body)
+
+    assert len(origin.requests) == 3
+    assert len(extractions) == 2
+    stats = (await client.get("/v1/content/cache/stats")).json()
+    assert (stats["misses"], stats["hits"], stats["revalidated"], stats["refetched"]) == (1, 1, 1, 1)
@@ -0,0 +1,88 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from benchmarks.loadtest import run_load
+from services.audio.backends import (
+    MP3_FRAME_BYTES,
+    MP3_FRAME_HEADER,
+    FakeBackend,
+    FakeBackendError,
+    SynthesisBackend,
+)
+from services.audio.edge_tts import EdgeTTSService
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+
+async def collect(backend, text, voice="en-US-AriaNeural", rate="+0%"):
+    events = []
+    async for event in backend.stream(text, voice, rate):
+        events.append(event)
+    return events
+
+
+async def test_fake_backend_emits_valid_frames_and_word_boundaries():
+    events = await collect(FakeBackend(), "one two three")
+
+    words = [e["text"] for e in events if e["type"] == "WordBoundary"]
+    assert words == ["one", "two", "three"]
+    audio = b"".join(e["data"] for e in events if e["type"] == "audio")
+    assert len(audio) % MP3_FRAME_BYTES == 0
+    for start in range(0, len(audio), MP3_FRAME_BYTES):
+        assert audio[start:start + 4] == MP3_FRAME_HEADER
+
+
+async def test_fake_backend_is_deterministic_and_rate_aware():
+    first = await collect(FakeBackend(), "hello world")
+    second = await collect(FakeBackend(), "hello world")
+    faster = await collect(FakeBackend(), "hello world", rate="+100%")
+    other = await collect(FakeBackend(), "hello there")
+
+    def audio(events):
+        return b"".join(e["data"] for e in events if e["type"] == "audio")
+
+    assert first == second
+    assert len(audio(faster)) < len(audio(first))
+    assert audio(other) != audio(first)
+
+
+async def test_fake_backend_injects_failures():
+    with pytest.raises(FakeBackendError):
+        await collect(FakeBackend(error_rate=1.0), "hello")
+
+
+def test_backends_must_implement_stream():
+    class Incomplete(SynthesisBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_service_runs_on_fake_backend():
+    service = EdgeTTSService(backend=FakeBackend())
+
+    audio = await service.generate_audio("hello world")
+
+    assert audio.startswith(MP3_FRAME_HEADER)
+
+
+async def test_run_load_against_fake_backend(monkeypatch):
+    monkeypatch.setattr(tts, "tts_service", EdgeTTSService(backend=FakeBackend()))
+    monkeypatch.setattr(
+        tts, "document_store", DocumentStore(chunker=ProsodyFormatter().chunk_for_streaming)
+    )
+    monkeypatch.setattr(tts.settings, "prefetch_enabled", False)
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for endpoint in ("generate", "stream", "chunks"):
+            result = await run_load(client, endpoint, concurrency=2, requests=4, words=20)
+
+            assert result["requests"] == 4
+            assert result["errors"] == 0
+            assert result["mb_received"] > 0
@@ -0,0 +1,84 @@
+"""Differential tests: the compiled ProsodyFormatter against the reference implementation"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from services.processing.formatter import ProsodyFormatter
+from tests.reference_formatter import ProsodyFormatter as ReferenceFormatter
+
+GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
+
+# Fragments chosen to exercise every rule table, including adjacent matches
+# with no whitespace between them and cross-rule overlaps
+FRAGMENTS = [
+    "word", "Word", "however", "Thus", "in fact", "on the other hand", "instead",
+    "insteadof", "e.g.", "i.e.", "i.e.g.", "E.G.", "etc.", "vs.", "Dr.", "Mr.", "Mrs.", "Ms.",
+    "Prof.", "St.", "w/", "w/o", "b/c", "min.", "sec.", "hr.", "hrs.", "approx.", "FYI",
+    "ASAP", "TBD", "TL;DR", "TLDR", "tl;dr.", "IMO", "IMHO", "AFAIK", "and/or", "AND / OR",
+    "cats/dogs", "50/50", "a/b/c", "http://x.io/a", "https://www.y.com/b", "www.z.org",
+    "www.https://q.com", "www.http://", "www.https:// x", "mail@host.com", "1,000", "12,345", "1,234,567", "1,234,567,890",
+    "2020-2025", "3 – 4", "5%", "4.5 %", "1.", "2)", "13.", "# Title", "## Sub",
+    "### Minor", "<h1>Head</h1>", "<h3>Small</h3>", "•", "- ", "* ", "→", "⇒", "➤", "&", "@",
+    "#", "+", "=", "<", ">", "←", "↔", "✓", "✗", "★", "©", "®", "™", "°", "×", "÷", "≈", "≠",
+    "≤", "≥", "—", "–", "--", "(", ")", "(aside)", "[ref]", "[", "]", "**bold**", "*it*",
+    "__under__", "_u_", "`code`", "```block```", "...", "....", ".", ",", ";", ":", "!", "?",
+    "!?", "'", '"', "XPAUSESHORTX", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "\r\n",
+    "\r", "\x0b", " ", " ",
+]
+
+
+def _random_document(rng: random.Random) -> str:
+    pieces = []
+    for _ in range(rng.randint(1, 40)):
+        pieces.append(rng.choice(FRAGMENTS))
+        if rng.random() < 0.6:
+            pieces.append(rng.choice([" ", " ", "\n", ""]))
+    return "".join(pieces)
+
+
+@pytest.fixture(scope="module")
+def formatters():
+    return ProsodyFormatter(), ReferenceFormatter()
+
+
+@pytest.mark.parametrize("path", sorted(GOLDEN_DIR.iterdir()), ids=lambda p: p.name)
+def test_golden_corpus_matches_reference(formatters, path):
+    formatter, reference = formatters
+    text = path.read_bytes().decode("utf-8")
+
+    assert formatter.format(text) == reference.format(text)
+    assert formatter.chunk_for_streaming(text, 200) == reference.chunk_for_streaming(text, 200)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_documents_match_reference(formatters, seed):
+    formatter, reference = formatters
+    rng = random.Random(seed)
+
+    for _ in range(100):
+        text = _random_document(rng)
+        assert formatter.format(text) == reference.format(text), repr(text)
+
+
+@pytest.mark.parametrize("method", [
+    "_normalize_whitespace",
+    "_format_headers",
+    "_convert_bullets_to_numbers",
+    "_handle_abbreviations",
+    "_add_punctuation_pauses",
+    "_handle_special_characters",
+    "_add_transition_pauses",
+    "_format_numbers",
+    "_clean_for_speech",
+    "_add_paragraph_pauses",
+    "_convert_pauses_to_ssml",
+])
+def test_each_pass_matches_reference(formatters, method):
+    formatter, reference = formatters
+    rng = random.Random(method)
+
+    for _ in range(500):
+        text = _random_document(rng)
+        assert getattr(formatter, method)(text) == getattr(reference, method)(text), repr(text)
@@ -0,0 +1,107 @@
+"""iter_chunks against chunk_for_streaming, and its incremental behaviour"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from services.processing.formatter import ProsodyFormatter
+
+GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
+
+# Prose with the markdown and punctuation found in real articles and emails
+SENTENCES = [
+    "The quick brown fox jumps over the lazy dog.", "However, it was late.",
+    "Is this right?", "Wow!", "See e.g. the docs.", "It costs 1,234,567 dollars.",
+    "Read **this** now.", "Use `code` here.", "Call Dr. Smith", "Visit https://x.io/a today.",
+    "Growth was 5% (approx.) this year.", "A — B", "The list:", "- item one", "• item two",
+    "1. first", "# Header", "## Subheader", "Plain header", "and/or cats/dogs", "snake_case_name",
+]
+SEPARATORS = ["\n\n", "\n\n\n", "\r\n\r\n", "\n \n", "\n"]
+# HTML, including stray and unterminated < and > and entities
+HTML = [
+    "<h1>Head</h1>", "<h3>Small</h3>", "<p>Para</p>", "<br>", "<li>item</li>", "<div>box</div>",
+    "<b>bold</b>", "<script>x()</script>", "a < b", "x > y", "<", ">", "(", "\u2028", "&amp;", "&",
+]
+
+
+def _random_article(rng: random.Random, choices=SENTENCES) -> str:
+    paragraphs = []
+    for _ in range(rng.randint(1, 30)):
+        sentences = (rng.choice(choices) for _ in range(rng.randint(1, 5)))
+        paragraphs.append(rng.choice([" ", "\n", ""]).join(sentences))
+    return "".join(p + rng.choice(SEPARATORS) for p in paragraphs)
+
+
+def _split(text: str, rng: random.Random, pieces: int = 5):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text), pieces)))
+    return [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.fixture(scope="module")
+def formatter():
+    return ProsodyFormatter()
+
+
+@pytest.mark.parametrize("path", sorted(GOLDEN_DIR.iterdir()), ids=lambda p: p.name)
+@pytest.mark.parametrize("target_chars", [50, 200, 800])
+def test_golden_corpus_matches_chunk_for_streaming(formatter, path, target_chars):
+    text = path.read_bytes().decode("utf-8")
+
+    assert list(formatter.iter_chunks(text, target_chars)) == formatter.chunk_for_streaming(
+        text, target_chars
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_articles_match_chunk_for_streaming(formatter, seed):
+    rng = random.Random(seed)
+
+    for _ in range(100):
+        text = _random_article(rng)
+        target_chars = rng.choice([30, 100, 300])
+        expected = formatter.chunk_for_streaming(text, target_chars)
+
+        assert list(formatter.iter_chunks(text, target_chars)) == expected, repr(text)
+        pieces = _split(text, rng)
+        assert list(formatter.iter_chunks(pieces, target_chars)) == expected, repr(pieces)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_html_matches_chunk_for_streaming(formatter, seed):
+    rng = random.Random(seed)
+
+    for _ in range(100):
+        text = "<p>" + _random_article(rng, SENTENCES + HTML)
+        target_chars = rng.choice([30, 100, 300])
+        expected = formatter.chunk_for_streaming(text, target_chars)
+
+        assert list(formatter.iter_chunks(text, target_chars)) == expected, repr(text)
+        # HTML is detected from the first piece
+        pieces = ["<p>"] + _split(text[3:], rng)
+        assert list(formatter.iter_chunks(pieces, target_chars)) == expected, repr(pieces)
+
+
+def test_first_chunk_needs_only_the_start_of_the_input(formatter):
+    paragraph = "This sentence is part of a long article about nothing much. " * 5
+    consumed = []
+
+    def lines():
+        for i in range(100_000):  # about 30 MB if read to the end
+            consumed.append(i)
+            yield paragraph + "\n\n"
+
+    chunks = formatter.iter_chunks(lines())
+    index, text = next(chunks)
+
+    assert index == 0 and text.startswith("This sentence")
+    assert len(consumed) < 100
+
+
+def test_html_stream_is_detected_from_first_piece(formatter):
+    html = "<html><body>" + "".join(
+        f"<p>Paragraph {i} has some text.</p>" for i in range(50)
+    ) + "</body></html>"
+    pieces = [html[i:i + 37] for i in range(0, len(html), 37)]
+
+    assert list(formatter.iter_chunks(pieces, 200)) == formatter.chunk_for_streaming(html, 200)
@@ -0,0 +1,165 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio.backends import MP3_FRAME_HEADER, FakeBackend, FakeBackendError
+from services.audio.cache import AudioCache
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.jobs import JobQueue, QueueFull
+
+CHUNKS = ["First part of the book.", "Second part of it.", "The third and last part."]
+
+
+def make_service(tmp_path, **backend):
+    return EdgeTTSService(
+        cache=AudioCache(cache_dir=str(tmp_path / "audio")),
+        backend=FakeBackend(**backend),
+    )
+
+
+async def wait_for(queue, job_id, state="done", timeout=5.0):
+    async def poll():
+        while queue.get(job_id).state != state:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def test_job_writes_every_chunk(tmp_path):
+    queue = JobQueue(make_service(tmp_path), str(tmp_path / "jobs"))
+    try:
+        job = await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        await wait_for(queue, job.job_id)
+
+        assert job.progress()["ready_chunks"] == [0, 1, 2]
+        for index in range(len(CHUNKS)):
+            assert queue.chunk_path(job, index).read_bytes().startswith(MP3_FRAME_HEADER)
+        assert queue.chunk_path(job, 3) is None
+        assert queue.snapshot()["completed"] == 1
+    finally:
+        await queue.close()
+
+
+async def test_full_queue_rejects_jobs(tmp_path):
+    service = make_service(tmp_path, ttfb_ms=1000)
+    queue = JobQueue(service, str(tmp_path / "jobs"), max_workers=1, max_pending=2)
+    try:
+        await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        with pytest.raises(QueueFull):
+            await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        assert queue.snapshot()["rejected"] == 1
+    finally:
+        await queue.close()
+
+
+async def test_unfinished_job_resumes_after_restart(tmp_path):
+    jobs_dir = str(tmp_path / "jobs")
+    queue = JobQueue(make_service(tmp_path, ttfb_ms=1000), jobs_dir)
+    job = await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+    # Pretend the first chunk finished before the process stopped
+    queue._write_chunk(job.job_id, 0, MP3_FRAME_HEADER + b"kept")
+    await queue.close()
+
+    restarted = JobQueue(make_service(tmp_path), jobs_dir)
+    restarted.start()
+    try:
+        await wait_for(restarted, job.job_id)
+        resumed = restarted.get(job.job_id)
+        assert restarted.snapshot()["resumed"] == 1
+        assert restarted.snapshot()["chunks_synthesized"] == 2
+        assert restarted.chunk_path(resumed, 0).read_bytes() == MP3_FRAME_HEADER + b"kept"
+    finally:
+        await restarted.close()
+
+
+async def test_job_failure_is_reported(tmp_path):
+    queue = JobQueue(
+        make_service(tmp_path, error_rate=1.0), str(tmp_path / "jobs"), retry_delay=0
+    )
+    try:
+        job = await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        await wait_for(queue, job.job_id, state="failed")
+        assert job.progress()["error"].startswith("Chunk 0")
+        assert queue.snapshot()["chunk_retries"] == 2
+    finally:
+        await queue.close()
+
+
+class FlakyBackend(FakeBackend):
+    """Fails its first few requests"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    async def stream(self, text, voice, rate):
+        if self.failures:
+            self.failures -= 1
+            raise FakeBackendError("Upstream hiccup")
+        async for event in super().stream(text, voice, rate):
+            yield event
+
+
+async def test_transient_chunk_errors_are_retried(tmp_path):
+    service = EdgeTTSService(backend=FlakyBackend(failures=2))
+    queue = JobQueue(service, str(tmp_path / "jobs"), chunk_retries=2, retry_delay=0)
+    try:
+        job = await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        await wait_for(queue, job.job_id)
+
+        assert job.error is None
+        assert queue.snapshot()["chunk_retries"] == 2
+    finally:
+        await queue.close()
+
+
+async def test_disk_errors_fail_the_job(tmp_path, monkeypatch):
+    queue = JobQueue(make_service(tmp_path), str(tmp_path / "jobs"))
+
+    def disk_full(job_id, index, audio):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(queue, "_write_chunk", disk_full)
+    try:
+        job = await queue.submit(CHUNKS, "en-US-JennyNeural", 1.0)
+        await wait_for(queue, job.job_id, state="failed")
+        assert "No space left" in job.error
+        assert job.finished is not None
+        assert queue.pending == 0
+    finally:
+        await queue.close()
+
+
+async def test_job_api(tmp_path, monkeypatch):
+    service = make_service(tmp_path)
+    queue = JobQueue(service, str(tmp_path / "jobs"))
+    monkeypatch.setattr(tts, "tts_service", service)
+    monkeypatch.setattr(tts, "job_queue", queue)
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            submitted = await client.post("/v1/tts/jobs", json={"text": " ".join(CHUNKS) * 40})
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+            await wait_for(queue, job_id)
+
+            status = (await client.get(f"/v1/tts/jobs/{job_id}")).json()
+            assert status["state"] == "done"
+            assert status["ready_chunks"] == list(range(status["total_chunks"]))
+
+            chunk = await client.get(f"/v1/tts/jobs/{job_id}/chunks/0")
+            assert chunk.content.startswith(MP3_FRAME_HEADER)
+            missing = await client.get(f"/v1/tts/jobs/{job_id}/chunks/{status['total_chunks']}")
+            assert missing.status_code == 404
+            assert (await client.get("/v1/tts/jobs/stats")).json()["submitted"] == 1
+
+            assert (await client.delete(f"/v1/tts/jobs/{job_id}")).status_code == 200
+            assert (await client.get(f"/v1/tts/jobs/{job_id}")).status_code == 404
+            assert not (tmp_path / "jobs" / job_id).exists()
+    finally:
+        await queue.close()
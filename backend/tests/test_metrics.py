@@ -0,0 +1,70 @@
+import httpx
+import pytest
+
+from api import main
+from api.routes import tts
+from services.audio.backends import FakeBackend
+from services.audio.edge_tts import EdgeTTSService
+from services.metrics import Registry, _Metric
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ["route"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    registry.gauge_callback("ratio", "A ratio", lambda: 0.5)
+
+    requests.labels('a"b').inc()
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="a\\"b"} 1' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_count 4" in lines
+    assert "ratio 0.5" in lines
+    with pytest.raises(ValueError):
+        latency.labels("unexpected")
+
+
+def test_metric_kinds_must_define_their_series():
+    class Incomplete(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Missing _child")
+
+
+def sample(text, name):
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[-1])
+    raise AssertionError(f"{name} not found")
+
+
+async def test_metrics_endpoint_covers_synthesis(monkeypatch):
+    monkeypatch.setattr(tts, "tts_service", EdgeTTSService(backend=FakeBackend()))
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        before = (await client.get("/metrics")).text
+        response = await client.post("/v1/tts/generate", json={"text": "Hello metrics."})
+        assert response.status_code == 200
+        after = await client.get("/metrics")
+
+    assert after.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = after.text
+    for name in (
+        'tts_synthesis_ttfb_seconds_count{backend="fake"}',
+        'tts_synthesis_seconds_count{backend="fake"}',
+        "tts_format_seconds_count",
+        'tts_response_bytes_count{route="generate"}',
+    ):
+        previous = sample(before, name) if name in before else 0
+        assert sample(text, name) == previous + 1
+    assert sample(text, 'tts_http_requests_in_flight{area="tts"}') == 0
+    # The scrape itself is in flight
+    assert sample(text, 'tts_http_requests_in_flight{area="other"}') == 1
+    assert "tts_audio_cache_hit_ratio" in text
@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.content.fetcher import PageFetcher
+
+PAGE = b"<html><body>hello</body></html>"
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 keep-alive server that counts connections"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+                status = b"404 Not Found" if b" /missing " in request else b"200 OK"
+                writer.write(
+                    b"HTTP/1.1 " + status + b"\r\nContent-Type: text/html\r\n"
+                    b"Content-Length: " + str(len(PAGE)).encode() + b"\r\n\r\n" + PAGE
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+async def test_fetches_reuse_one_connection():
+    fetcher = PageFetcher()
+    async with KeepAliveServer() as server:
+        for i in range(5):
+            assert await fetcher.fetch(f"{server.url}/page/{i}") == PAGE.decode()
+        await fetcher.close()
+
+    assert server.connections == 1
+    stats = fetcher.snapshot()
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 4
+    assert stats["latency_p50_ms"] > 0
+
+
+async def test_per_host_limit_caps_concurrent_requests():
+    fetcher = PageFetcher(max_per_host=2)
+    async with KeepAliveServer(delay=0.05) as server:
+        await asyncio.gather(*(fetcher.fetch(f"{server.url}/{i}") for i in range(6)))
+        await fetcher.close()
+
+    assert server.max_active == 2
+    assert server.connections == 2
+    assert fetcher.snapshot()["active_hosts"] == 0
+
+
+async def test_http_errors_are_raised_and_counted():
+    fetcher = PageFetcher()
+    async with KeepAliveServer() as server:
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.fetch(f"{server.url}/missing")
+        await fetcher.close()
+
+    assert fetcher.snapshot()["failures"] == 1
+
+
+async def test_close_allows_restart():
+    fetcher = PageFetcher()
+    async with KeepAliveServer() as server:
+        await fetcher.fetch(server.url)
+        await fetcher.close()
+        await fetcher.fetch(server.url)
+        await fetcher.close()
+
+    assert server.connections == 2
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio.cache import AudioCache
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.prefetch import Prefetcher
+from services.processing.formatter import ProsodyFormatter
+from services.processing.sessions import DocumentStore
+
+VOICE = "en-US-JennyNeural"
+
+
+async def test_take_returns_prefetched_audio(fake_communicate):
+    prefetcher = Prefetcher(EdgeTTSService())
+    prefetcher.schedule("doc", {1: "one", 2: "two"}, VOICE, 1.0)
+
+    # Claims wait for synthesis still in flight
+    assert await prefetcher.take("doc", 1, VOICE, 1.0) == b"".join(
+        f"one|{VOICE}|+0%|{i};".encode() for i in range(3)
+    )
+    assert await prefetcher.take("doc", 1, VOICE, 1.0) is None
+    assert prefetcher.stats.hits == 1
+
+
+async def test_take_ignores_prefetch_for_other_voice(fake_communicate):
+    prefetcher = Prefetcher(EdgeTTSService())
+    prefetcher.schedule("doc", {1: "one"}, VOICE, 1.0)
+
+    assert await prefetcher.take("doc", 1, VOICE, 1.5) is None
+    assert prefetcher.stats.hits == 0
+
+
+async def test_cancel_counts_waste_and_cancellations(fake_communicate):
+    prefetcher = Prefetcher(EdgeTTSService(), max_concurrency=1)
+    prefetcher.schedule("doc", {1: "one", 2: "two"}, VOICE, 1.0)
+    await asyncio.sleep(0.01)  # let both finish
+    prefetcher.schedule("other", {1: "three"}, VOICE, 1.0)
+
+    prefetcher.cancel("doc")
+    prefetcher.cancel("other")
+
+    assert prefetcher.stats.wasted == 2
+    assert prefetcher.stats.cancelled == 1
+    assert prefetcher.snapshot()["documents"] == 0
+
+
+async def test_reschedule_drops_skipped_chunks(fake_communicate):
+    prefetcher = Prefetcher(EdgeTTSService())
+    prefetcher.schedule("doc", {1: "one", 2: "two"}, VOICE, 1.0)
+    prefetcher.schedule("doc", {2: "two", 3: "three"}, VOICE, 1.0)
+
+    assert prefetcher.stats.scheduled == 3
+    assert prefetcher.stats.cancelled == 1
+    assert await prefetcher.take("doc", 2, VOICE, 1.0) is not None
+    prefetcher.close()
+
+
+@pytest.fixture
+async def client(monkeypatch, fake_communicate):
+    service = EdgeTTSService(cache=AudioCache(cache_dir=None))
+    prefetcher = Prefetcher(service)
+    store = DocumentStore(
+        chunker=ProsodyFormatter().chunk_for_streaming, on_remove=prefetcher.cancel
+    )
+    monkeypatch.setattr(tts, "tts_service", service)
+    monkeypatch.setattr(tts, "prefetcher", prefetcher)
+    monkeypatch.setattr(tts, "document_store", store)
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    prefetcher.close()
+
+
+ARTICLE = "\n\n".join(f"Paragraph number {i} of the article." for i in range(10))
+
+
+async def test_follow_up_request_uses_prefetched_chunks(client, fake_communicate):
+    plan = (
+        await client.post("/v1/tts/documents", json={"text": ARTICLE, "target_chars": 20})
+    ).json()
+    document_id = plan["document_id"]
+
+    first = await client.post(
+        "/v1/tts/chunks/generate", json={"document_id": document_id, "chunk_indices": [0]}
+    )
+    assert first.json()["next_chunk_indices"] == [1, 2]
+
+    second = await client.post(
+        "/v1/tts/chunks/generate", json={"document_id": document_id, "chunk_indices": [1, 2]}
+    )
+    assert second.status_code == 200
+
+    stats = (await client.get("/v1/tts/prefetch/stats")).json()
+    assert stats["hits"] == 2
+    # Chunks 0-4 synthesized exactly once each (3 and 4 by the second prefetch)
+    await asyncio.sleep(0.01)
+    assert sorted(t for t, _, _ in fake_communicate.calls) == sorted(
+        [tts.document_store.get(document_id).chunk(i) for i in range(5)]
+    )
+
+
+async def test_releasing_document_cancels_prefetch(client):
+    plan = (
+        await client.post("/v1/tts/documents", json={"text": ARTICLE, "target_chars": 20})
+    ).json()
+    await client.post(
+        "/v1/tts/chunks/generate",
+        json={"document_id": plan["document_id"], "chunk_indices": [0]},
+    )
+    await client.delete(f"/v1/tts/documents/{plan['document_id']}")
+
+    stats = (await client.get("/v1/tts/prefetch/stats")).json()
+    assert stats["documents"] == 0
+    assert stats["wasted"] + stats["cancelled"] == 2
@@ -0,0 +1,105 @@
+import asyncio
+
+from services.audio.backends import FakeBackend
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.scheduler import Priority, SynthesisScheduler
+
+
+async def grant_order(scheduler, requests, before_release=None):
+    """Queue requests (name, priority, key) behind one held slot; return grant order"""
+    order = []
+
+    async def worker(name, priority, key):
+        async with scheduler.slot(priority, key):
+            order.append(name)
+
+    async with scheduler.slot(Priority.INTERACTIVE):
+        tasks = []
+        for name, priority, key in requests:
+            tasks.append(asyncio.create_task(worker(name, priority, key)))
+            await asyncio.sleep(0)
+        if before_release:
+            before_release(tasks)
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return order
+
+
+async def test_higher_priority_is_granted_first():
+    scheduler = SynthesisScheduler(max_concurrency=1, aging_seconds=60)
+    order = await grant_order(scheduler, [
+        ("batch", Priority.BATCH, None),
+        ("prefetch", Priority.PREFETCH, None),
+        ("next", Priority.NEXT, None),
+        ("interactive", Priority.INTERACTIVE, None),
+    ])
+
+    assert order == ["interactive", "next", "prefetch", "batch"]
+    stats = scheduler.snapshot()["classes"]
+    assert stats["batch"]["granted"] == 1
+    assert stats["batch"]["max_wait_seconds"] >= stats["interactive"]["max_wait_seconds"]
+
+
+async def test_waiting_work_ages_past_newer_higher_priority():
+    scheduler = SynthesisScheduler(max_concurrency=1, aging_seconds=0.01)
+    order = []
+
+    async def worker(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    async with scheduler.slot(Priority.INTERACTIVE):
+        batch = asyncio.create_task(worker("batch", Priority.BATCH))
+        await asyncio.sleep(0.05)
+        interactive = asyncio.create_task(worker("interactive", Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+    await asyncio.gather(batch, interactive)
+
+    assert order == ["batch", "interactive"]
+
+
+async def test_promote_moves_queued_work_up():
+    scheduler = SynthesisScheduler(max_concurrency=1, aging_seconds=60)
+    order = await grant_order(
+        scheduler,
+        [("next", Priority.NEXT, "a"), ("prefetch", Priority.PREFETCH, "b")],
+        before_release=lambda tasks: scheduler.promote("b", Priority.INTERACTIVE),
+    )
+
+    assert order == ["prefetch", "next"]
+    assert scheduler.stats[Priority.INTERACTIVE].promoted == 1
+    assert not scheduler.promote("b", Priority.INTERACTIVE)
+
+
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = SynthesisScheduler(max_concurrency=1)
+    order = await grant_order(
+        scheduler,
+        [("cancelled", Priority.INTERACTIVE, None), ("kept", Priority.BATCH, None)],
+        before_release=lambda tasks: tasks[0].cancel(),
+    )
+
+    assert order == ["kept"]
+    assert scheduler.active == 0
+    assert scheduler.snapshot()["classes"]["interactive"]["waiting"] == 0
+
+
+async def test_service_serves_interactive_before_batch():
+    service = EdgeTTSService(backend=FakeBackend(ttfb_ms=20), max_concurrency=1)
+    finished = []
+
+    async def generate(text, priority):
+        await service.generate_audio(text, priority=priority)
+        finished.append(text)
+
+    first = asyncio.create_task(generate("Holding the only slot.", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    batch = [
+        asyncio.create_task(generate(f"Batch chunk {i}.", Priority.BATCH)) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    listener = asyncio.create_task(generate("A listener is waiting.", Priority.INTERACTIVE))
+    await asyncio.gather(first, listener, *batch)
+
+    assert finished[:2] == ["Holding the only slot.", "A listener is waiting."]
+    assert service.scheduler.snapshot()["classes"]["batch"]["granted"] == 3
@@ -0,0 +1,144 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routes import tts
+from services.audio import backends
+from services.audio.backends import MP3_FRAME_BYTES, MP3_FRAME_HEADER, EdgeBackend, FakeBackend
+from services.audio.cache import AudioCache
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.words import WordIndex, frame_table
+
+TEXT = "Seeking should start from any word without synthesizing again."
+
+
+class CountingBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def stream(self, text, voice, rate):
+        self.calls += 1
+        return super().stream(text, voice, rate)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    service = EdgeTTSService(
+        cache=AudioCache(cache_dir=str(tmp_path)),
+        backend=CountingBackend(),
+    )
+    monkeypatch.setattr(tts, "tts_service", service)
+    return service
+
+
+@pytest.fixture
+async def client(service):
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_word_index_maps_words_to_frame_starts():
+    events = [e async for e in FakeBackend().stream("one two three", "voice", "+0%")]
+    audio = b"".join(e["data"] for e in events if e["type"] == "audio")
+
+    index = WordIndex.build([e for e in events if e["type"] == "WordBoundary"], audio)
+    restored = WordIndex.from_bytes(index.to_bytes())
+
+    assert restored.words == ["one", "two", "three"]
+    assert list(restored.start_ms) == [0, 400, 800]
+    offsets, _, _ = frame_table(audio)
+    for byte in restored.byte_offsets:
+        assert byte in offsets
+        assert audio[byte:byte + 4] == MP3_FRAME_HEADER
+    assert restored.total_bytes == len(audio)
+    assert restored.locate(850) == 2
+
+
+class Communicate7:
+    """edge_tts.Communicate as of 7.x: sentence boundaries unless asked for words"""
+
+    def __init__(self, text, voice="en-US-EmmaMultilingualNeural", *, rate="+0%",
+                 volume="+0%", pitch="+0Hz", boundary="SentenceBoundary"):
+        self.text = text
+        self.boundary = boundary
+
+    async def stream(self):
+        events = [e async for e in FakeBackend().stream(self.text, "voice", "+0%")]
+        if self.boundary == "SentenceBoundary":
+            words = [e for e in events if e["type"] == "WordBoundary"]
+            yield {"type": "SentenceBoundary", "offset": 0,
+                   "duration": sum(e["duration"] for e in words), "text": self.text}
+            events = [e for e in events if e["type"] == "audio"]
+        for event in events:
+            yield event
+
+
+class Communicate6:
+    """edge_tts.Communicate before 7.0: word boundaries and no boundary argument"""
+
+    def __init__(self, text, voice="en-US-AriaNeural", *, rate="+0%", volume="+0%", pitch="+0Hz"):
+        self.text = text
+
+    async def stream(self):
+        async for event in FakeBackend().stream(self.text, "voice", "+0%"):
+            yield event
+
+
+@pytest.mark.parametrize("communicate", [Communicate7, Communicate6])
+async def test_edge_backend_indexes_words(tmp_path, monkeypatch, communicate):
+    monkeypatch.setattr(backends.edge_tts, "Communicate", communicate)
+    service = EdgeTTSService(cache=AudioCache(cache_dir=str(tmp_path)), backend=EdgeBackend())
+
+    await service.generate_audio(TEXT)
+
+    assert (await service.cache.get_words(service.audio_key(TEXT))).words == TEXT.split()
+
+
+async def test_seek_to_a_word_with_a_range_request(client, service):
+    generated = await client.post(
+        "/v1/tts/generate", json={"text": TEXT, "format_text": False}
+    )
+    key = generated.headers["X-Audio-Key"]
+    audio = generated.content
+
+    words = (await client.get(f"/v1/tts/audio/{key}/words")).json()
+    assert [w["text"] for w in words["words"]] == TEXT.split()
+    byte = words["words"][3]["byte"]
+
+    seek = await client.get(f"/v1/tts/audio/{key}", headers={"Range": f"bytes={byte}-"})
+    assert seek.status_code == 206
+    assert seek.headers["Content-Range"] == f"bytes {byte}-{len(audio) - 1}/{len(audio)}"
+    assert seek.content == audio[byte:]
+    assert seek.content.startswith(MP3_FRAME_HEADER)
+
+    tail = await client.get(f"/v1/tts/audio/{key}", headers={"Range": f"bytes=-{MP3_FRAME_BYTES}"})
+    assert tail.content == audio[-MP3_FRAME_BYTES:]
+    assert service.backend.calls == 1
+
+
+async def test_word_index_survives_a_restart(client, service, tmp_path):
+    await client.post("/v1/tts/generate", json={"text": TEXT, "format_text": False})
+    key = service.audio_key(TEXT)
+
+    reopened = AudioCache(cache_dir=str(tmp_path))
+
+    assert (await reopened.get_words(key)).words == TEXT.split()
+    assert reopened.snapshot()["disk_entries"] == 2
+
+
+async def test_range_errors(client):
+    generated = await client.post("/v1/tts/generate", json={"text": TEXT, "format_text": False})
+    key = generated.headers["X-Audio-Key"]
+    size = len(generated.content)
+
+    unsatisfiable = await client.get(f"/v1/tts/audio/{key}", headers={"Range": f"bytes={size}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["Content-Range"] == f"bytes */{size}"
+    whole = await client.get(f"/v1/tts/audio/{key}", headers={"Range": "bytes=0-1,5-9"})
+    assert (whole.status_code, len(whole.content)) == (200, size)
+    assert (await client.get("/v1/tts/audio/" + "0" * 64)).status_code == 404
+    assert (await client.get("/v1/tts/audio/../words")).status_code == 404
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from services.audio.backends import FakeBackend, FakeBackendError
+from services.audio.edge_tts import EdgeTTSService
+
+TEXT = "one two three four five six seven eight"
+
+
+class CountingBackend(FakeBackend):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def stream(self, text, voice, rate):
+        self.calls += 1
+        return super().stream(text, voice, rate)
+
+
+async def read(stream):
+    return b"".join([part async for part in stream])
+
+
+async def test_identical_requests_share_one_synthesis():
+    backend = CountingBackend(ttfb_ms=50, bytes_per_second=0)
+    service = EdgeTTSService(backend=backend)
+
+    results = await asyncio.gather(
+        service.generate_audio(TEXT),
+        service.generate_audio(TEXT),
+        read(service.stream_audio(TEXT)),
+        service.generate_audio(TEXT, speed=1.5),
+    )
+
+    assert results[0] == results[1] == results[2] != results[3]
+    assert backend.calls == 2
+    stats = service.flights.snapshot()
+    assert (stats["flights"], stats["coalesced"], stats["in_flight"]) == (2, 2, 0)
+
+
+async def test_late_joiner_replays_audio_already_streamed():
+    backend = CountingBackend(ttfb_ms=0, bytes_per_second=100000)
+    service = EdgeTTSService(backend=backend)
+    first = service.stream_audio(TEXT)
+    head = await first.__anext__()
+
+    late, rest = await asyncio.gather(read(service.stream_audio(TEXT)), read(first))
+
+    assert late == head + rest
+    assert backend.calls == 1
+    assert service.flights.stats.late_joiners == 1
+
+
+async def test_synthesis_is_cancelled_when_every_consumer_leaves():
+    backend = CountingBackend(ttfb_ms=0, bytes_per_second=2000)
+    service = EdgeTTSService(backend=backend)
+    streams = [service.stream_audio(TEXT) for _ in range(2)]
+    for stream in streams:
+        await stream.__anext__()
+
+    await streams[0].aclose()
+    assert service.flights.snapshot()["in_flight"] == 1
+    await streams[1].aclose()
+    assert service.flights.snapshot()["in_flight"] == 0
+    assert service.flights.stats.cancelled == 1
+
+    # A new request starts a fresh synthesis
+    backend.bytes_per_second = 0
+    await service.generate_audio(TEXT)
+    assert backend.calls == 2
+
+
+async def test_failure_reaches_every_consumer():
+    service = EdgeTTSService(backend=CountingBackend(ttfb_ms=20, error_rate=1.0))
+
+    results = await asyncio.gather(
+        service.generate_audio(TEXT),
+        service.generate_audio(TEXT),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, FakeBackendError) for r in results)
+    assert service.flights.stats.failed == 1
+    with pytest.raises(FakeBackendError):
+        await service.generate_audio(TEXT)
@@ -0,0 +1,70 @@
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+import api.workers
+from api import startup
+from api.routes import content
+from services.content.fetcher import PageFetcher
+from services.metrics import Registry
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_app_defers_heavy_dependencies():
+    code = (
+        "import json, sys; import api.main; "
+        "print(json.dumps({m: m in sys.modules for m in "
+        "('aiohttp', 'trafilatura', 'lxml', 'httpcore')}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert loaded == {"aiohttp": False, "trafilatura": False, "lxml": False, "httpcore": False}
+
+
+async def test_warm_up_loads_dependencies_and_starts_pools(monkeypatch, worker_pool):
+    monkeypatch.setattr(startup, "report", startup.StartupReport())
+    monkeypatch.setattr(api.workers, "worker_pool", worker_pool)
+    monkeypatch.setattr(content, "fetcher", PageFetcher())
+
+    await startup.warm_up()
+
+    assert startup.report.warmup_enabled and startup.report.warmup_seconds > 0
+    assert {"trafilatura", "lxml.html", "httpcore"} <= set(sys.modules)
+    assert content.fetcher._client is not None
+    await content.fetcher.close()
+
+
+async def test_first_request_is_timed_once(monkeypatch):
+    monkeypatch.setattr(startup, "report", startup.StartupReport())
+    app = FastAPI()
+    app.add_middleware(startup.FirstRequestMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/ping")
+        first = startup.snapshot()
+        await client.get("/other")
+
+    assert first["first_request_path"] == "/ping"
+    assert first["first_request_seconds"] >= first["first_request_duration_seconds"] > 0
+    assert startup.snapshot() == first
+
+
+def test_unset_gauges_render_as_nan():
+    registry = Registry()
+    registry.gauge_callback("startup_seconds", "Not reached yet", lambda: math.nan)
+
+    assert "startup_seconds NaN" in registry.render()
@@ -0,0 +1,150 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from api.config import Settings
+from api.routes import tts
+from services.audio import backends
+from services.audio.edge_tts import EdgeTTSService
+from services.audio.pipeline import stream_chunks
+
+
+class GatedCommunicate:
+    """Fake upstream whose chunks only finish when released by the test"""
+
+    started = []
+    gates = {}
+
+    def __init__(self, text, voice, rate="+0%", **kwargs):
+        self.text = text
+
+    async def stream(self):
+        GatedCommunicate.started.append(self.text)
+        gate = GatedCommunicate.gates.setdefault(self.text, asyncio.Event())
+        yield {"type": "audio", "data": f"{self.text}:head;".encode()}
+        await gate.wait()
+        if self.text == "boom":
+            raise RuntimeError("upstream failed")
+        yield {"type": "audio", "data": f"{self.text}:tail;".encode()}
+
+
+@pytest.fixture
+def gated(monkeypatch):
+    GatedCommunicate.started = []
+    GatedCommunicate.gates = {}
+    monkeypatch.setattr(backends.edge_tts, "Communicate", GatedCommunicate)
+    return GatedCommunicate
+
+
+def release(*texts):
+    for text in texts:
+        GatedCommunicate.gates.setdefault(text, asyncio.Event()).set()
+
+
+async def collect(stream):
+    return b"".join([data async for data in stream])
+
+
+async def test_audio_is_yielded_in_chunk_order(gated):
+    texts = ["c0", "c1", "c2", "c3"]
+    release("c3", "c2", "c1", "c0")  # later chunks finish first
+
+    audio = [data async for data in stream_chunks(EdgeTTSService(), texts)]
+
+    assert b"".join(audio) == b"".join(
+        f"{t}:head;{t}:tail;".encode() for t in texts
+    )
+
+
+async def test_lookahead_bounds_chunks_in_flight(gated):
+    texts = [f"c{i}" for i in range(6)]
+    stream = stream_chunks(EdgeTTSService(), texts, lookahead=2)
+
+    # First audio arrives before chunk 0 has finished synthesizing
+    assert await stream.__anext__() == b"c0:head;"
+    await asyncio.sleep(0.01)
+    # Chunk 0 is being written; chunks 1 and 2 synthesize ahead of it
+    assert gated.started == ["c0", "c1", "c2"]
+
+    release("c0")
+    assert await stream.__anext__() == b"c0:tail;"
+    assert await stream.__anext__() == b"c1:head;"
+    await asyncio.sleep(0.01)
+    assert gated.started == ["c0", "c1", "c2", "c3"]
+
+    await stream.aclose()
+
+
+@pytest.mark.parametrize("lookahead", [0, -1])
+async def test_lookahead_below_one_still_streams(gated, lookahead):
+    release("c0", "c1")
+    stream = stream_chunks(EdgeTTSService(), ["c0", "c1"], lookahead=lookahead)
+
+    audio = await asyncio.wait_for(collect(stream), 1)
+
+    assert audio == b"c0:head;c0:tail;c1:head;c1:tail;"
+
+
+def test_lookahead_setting_must_be_positive(monkeypatch):
+    monkeypatch.setenv("STREAM_LOOKAHEAD_CHUNKS", "0")
+
+    with pytest.raises(ValidationError):
+        Settings()
+
+
+async def test_failed_chunk_ends_stream(gated):
+    release("ok", "boom", "never")
+    stream = stream_chunks(EdgeTTSService(), ["ok", "boom", "never"], lookahead=1)
+
+    received = []
+    with pytest.raises(RuntimeError):
+        async for data in stream:
+            received.append(data)
+
+    assert b"".join(received) == b"ok:head;ok:tail;boom:head;"
+
+
+async def test_stream_endpoint_pipelines_chunks(fake_communicate, monkeypatch):
+    monkeypatch.setattr(tts, "tts_service", EdgeTTSService())
+    text = "\n\n".join(f"Paragraph {i} is here. " * 40 for i in range(5))
+    schedule = tts._chunk_schedule(tts.TTSRequest(text=text))
+    chunks = [t for _, t in tts.formatter.chunk_for_streaming(text, schedule)]
+    assert len(chunks) > 1
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/v1/tts/stream", json={"text": text})
+
+    assert response.status_code == 200
+    assert [call[0] for call in fake_communicate.calls] == chunks
+
+
+async def test_pipelined_stream_lists_chunk_keys(fake_communicate, monkeypatch):
+    service = EdgeTTSService()
+    monkeypatch.setattr(tts, "tts_service", service)
+    text = "\n\n".join(f"Paragraph {i} is here. " * 40 for i in range(3))
+    schedule = tts._chunk_schedule(tts.TTSRequest(text=text, speed=1.25))
+    chunks = [t for _, t in tts.formatter.chunk_for_streaming(text, schedule)]
+
+    app = FastAPI()
+    app.include_router(tts.router, prefix="/v1/tts")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/v1/tts/stream", json={"text": text, "speed": 1.25})
+        stream_id = response.headers["X-Stream-Id"]
+        listed = await client.get(f"/v1/tts/stream/{stream_id}/keys")
+        missing = await client.get("/v1/tts/stream/unknown/keys")
+
+    assert listed.json() == {
+        "stream_id": stream_id,
+        "audio_keys": [service.audio_key(chunk, None, 1.25) for chunk in chunks],
+        "complete": True,
+    }
+    assert missing.status_code == 404
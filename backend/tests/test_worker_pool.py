@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from services.processing.formatter import ProsodyFormatter
+from services.processing import workers
+from services.processing.workers import WorkerPool, WorkerTimeout
+
+
+@pytest.fixture
+async def process_pool():
+    pool = WorkerPool(mode="process", max_workers=1, task_timeout=10)
+    yield pool
+    await pool.close()
+
+
+async def test_process_pool_runs_tasks_and_raises_their_errors(process_pool):
+    formatter = ProsodyFormatter()
+
+    assert await process_pool.run(formatter.format, "Hello world") == formatter.format("Hello world")
+    with pytest.raises(ValueError):
+        await process_pool.run(int, "not a number")
+
+    stats = process_pool.snapshot()
+    assert (stats["submitted"], stats["completed"], stats["failed"]) == (2, 1, 1)
+
+
+async def test_process_pool_kills_runaway_tasks(process_pool):
+    started = time.perf_counter()
+    with pytest.raises(WorkerTimeout):
+        await process_pool.run(time.sleep, 30, timeout=0.5)
+    assert time.perf_counter() - started < 10
+
+    # The killed worker was replaced and the pool keeps working
+    assert await process_pool.run(len, "abc") == 3
+    stats = process_pool.snapshot()
+    assert (stats["timeouts"], stats["restarts"]) == (1, 1)
+
+
+async def test_process_pool_reports_queue_depth(process_pool):
+    # Wait for the worker process to start
+    await process_pool.run(abs, 0)
+    results = await asyncio.gather(*(process_pool.run(abs, -i) for i in range(4)))
+
+    assert results == [0, 1, 2, 3]
+    stats = process_pool.snapshot()
+    # The first task takes the idle worker at once; the other three wait
+    assert stats["max_queued"] == 3
+    assert (stats["queued"], stats["running"]) == (0, 0)
+
+
+async def test_workers_are_replaced_off_the_event_loop(process_pool, monkeypatch):
+    await process_pool.run(abs, 0)
+    # A replacement that takes a while to come up must not hold the loop
+    ready = workers._Worker.wait_ready
+    monkeypatch.setattr(workers._Worker, "wait_ready", lambda self: (time.sleep(0.5), ready(self)))
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    with pytest.raises(WorkerTimeout):
+        await process_pool.run(time.sleep, 30, timeout=0.2)
+    # Queued until the replacement is ready, so its budget is not spent waiting
+    assert await process_pool.run(len, "abc", timeout=0.3) == 3
+    ticker.cancel()
+
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+    assert process_pool.snapshot()["restarts"] == 1
+
+
+class SlowToPickle:
+    """An argument that takes a while to send, like a large document"""
+
+    def __reduce__(self):
+        time.sleep(0.5)
+        return bytes, (b"sent",)
+
+
+async def test_tasks_are_sent_off_the_event_loop(process_pool):
+    await process_pool.run(abs, 0)
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    assert await process_pool.run(len, SlowToPickle()) == 4
+    ticker.cancel()
+
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+
+
+async def test_close_stops_workers_that_are_still_starting():
+    pool = WorkerPool(mode="process", max_workers=2)
+    pool.start()
+    await pool.close()
+
+    assert not pool._workers
+    assert not multiprocessing.active_children()
+
+
+async def test_thread_pool_abandons_runaway_tasks():
+    pool = WorkerPool(mode="thread", max_workers=2, task_timeout=0.1)
+
+    with pytest.raises(WorkerTimeout):
+        await pool.run(time.sleep, 0.5)
+    assert await pool.run(sum, [1, 2]) == 3
+    assert pool.snapshot()["timeouts"] == 1
+    await pool.close()